@@ -3,6 +3,54 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     mongo_uri: str = "mongodb://mongodb:27017/etymology"
+    # TreeBuilder descendant expansion: "recursive" (one query per node) or
+    # "frontier" (one query per BFS level).
+    descendant_mode: str = "recursive"
+    # Parent links for descendant lookups: "templates" ($elemMatch over
+    # etymology_templates), "primary_ancestor" (requires
+    # `make precompute-ancestors`) or "kaikki" (curated descendants trees;
+    # requires `make precompute-descendants`).
+    descendant_source: str = "templates"
+    # Ancestor chains for /chain and TreeBuilder.expand_word: "templates"
+    # (parse the word doc) or "chains" (requires `make precompute-chains`).
+    chain_source: str = "templates"
+    # Tree engine: "builder" (TreeBuilder, per-parent or per-level descendant
+    # lookups) or "graphlookup" (one $graphLookup per descendant walk over
+    # `tree_edges`; requires `make precompute-tree-edges`) or "csr" (in-process
+    # arrays mapped from `csr_graph_dir` at startup; requires
+    # `make export-csr-graph`).
+    tree_engine: str = "builder"
+    # Directory written by `etl.export_csr_graph`, relative to backend/.
+    csr_graph_dir: str = "data/csr_graph"
+    # Cognate expansion (types=cog): "rounds" (each node's cog templates, one
+    # lookup per node per round) or "components" (whole precomputed cognate
+    # sets, one query per round; requires `make precompute-cognate-sets`).
+    cognate_mode: str = "rounds"
+    # /search rows: "mongo" (exact find plus anchored $regex prefix scan) or
+    # "index" (in-process prefix index mapped from `search_index_dir` at
+    # startup; requires `make export-search-index`).
+    search_source: str = "mongo"
+    # Directory written by `etl.export_search_index`, relative to backend/.
+    search_index_dir: str = "data/search_index"
+    # Byte budget of the process-wide word document LRU (app.services.word_cache).
+    word_cache_max_bytes: int = 64 * 1024 * 1024
+    # Byte budget of the in-process tier of the /tree result cache
+    # (app.services.tree_cache); the `trees` collection tier is unbounded.
+    tree_cache_max_bytes: int = 32 * 1024 * 1024
+    # Byte budget of the per-parent child-list cache used by descendant
+    # expansion (app.services.descendant_cache).
+    descendant_cache_max_bytes: int = 32 * 1024 * 1024
+    # Byte budget of the /search response and prefix-row caches
+    # (app.services.search_cache), split evenly between them.
+    search_cache_max_bytes: int = 16 * 1024 * 1024
+    # Server-wide /tree budgets, used when a request passes none. Unset means
+    # unbounded (and no `truncated` fields in the response).
+    tree_max_nodes: int | None = None
+    tree_time_budget_ms: int | None = None
+    # Resolve word lookups through the precomputed `word_links` table
+    # (requires `make precompute-links`): one round trip instead of a raw
+    # miss followed by a normalized retry.
+    link_resolution: bool = False
 
 
 settings = Settings()
@@ -4,13 +4,26 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.config import settings
 from app.database import create_mongo_client
 from app.routers import concept_map, etymology, layout, search, words
+from app.services import (
+    csr_graph,
+    descendant_cache,
+    search_cache,
+    search_index,
+    tree_cache,
+    word_cache,
+)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     app.state.mongo_client = create_mongo_client()
+    if settings.tree_engine == "csr":
+        csr_graph.load(settings.csr_graph_dir)
+    if settings.search_source == "index":
+        search_index.load(settings.search_index_dir)
     try:
         yield
     finally:
@@ -36,3 +49,14 @@ app.include_router(layout.router, prefix="/api")
 @app.get("/health")
 async def health():
     return {"status": "ok"}
+
+
+@app.get("/health/caches")
+async def cache_stats():
+    """Size and hit-ratio counters of the process-wide read caches."""
+    return {
+        "word_docs": word_cache.stats(),
+        "trees": tree_cache.stats(),
+        "descendants": descendant_cache.stats(),
+        "search": search_cache.stats(),
+    }
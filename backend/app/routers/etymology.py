@@ -1,8 +1,26 @@
-from fastapi import APIRouter, Depends, Query
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from motor.motor_asyncio import AsyncIOMotorCollection
 
+from app.config import settings
 from app.database import get_words_collection
-from app.services import lang_cache
+from app.services import (
+    ancestor_closure,
+    chains,
+    csr_graph,
+    lang_cache,
+    layout_cache,
+    path_search,
+    sse,
+    tree_cache,
+    word_cache,
+    word_links,
+)
 from app.services.template_parser import (
     ANCESTRY_TYPES,
     COGNATE_TYPE,
@@ -10,10 +28,16 @@ from app.services.template_parser import (
     node_id,
     normalize_word,
 )
-from app.services.tree_builder import TreeBuilder
+from app.services.tree_builder import TRUNCATED_TIME_BUDGET
+from app.services.tree_engines import tree_builder_class
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+_MAX_NODES_DESC = "Stop expanding once the tree has this many nodes (marks it truncated)"
+_TIME_BUDGET_DESC = "Stop expanding after this many milliseconds (marks it truncated)"
+
 
 @router.get("/etymology/{word}/chain")
 async def get_etymology_chain(
@@ -28,27 +52,20 @@ async def get_etymology_chain(
     nodes = {}
     edges = []
 
-    proj = {"_id": 0, "etymology_templates": 1}
-    query = {"word": word, "lang": lang}
-    if etym is not None:
-        query["etymology_number"] = etym
-    doc = await col.find_one(query, proj)
-    if not doc:
-        normalized = normalize_word(word)
-        if normalized != word:
-            nquery = {"word": normalized, "lang": lang}
-            if etym is not None:
-                nquery["etymology_number"] = etym
-            doc = await col.find_one(nquery, proj)
+    if settings.chain_source == "chains":
+        record = await word_cache.get_or_load(
+            col, ("chains", word, lang, etym), lambda: chains.find_chain(col, word, lang, etym)
+        )
+        ancestry = record["ancestry"] if record else None
+    else:
+        ancestry = await _parse_ancestry(col, word, lang, etym)
 
     root_id = node_id(word, lang)
     nodes[root_id] = {"id": root_id, "label": word, "language": lang, "level": 0}
 
-    if not doc:
+    if ancestry is None:
         return {"nodes": list(nodes.values()), "edges": edges}
 
-    ancestry = extract_ancestry(doc)
-
     prev_id = root_id
     for i, anc in enumerate(ancestry):
         if i >= max_depth:
@@ -67,6 +84,160 @@ async def get_etymology_chain(
     return {"nodes": list(nodes.values()), "edges": edges}
 
 
+@router.get("/etymology/common-ancestor")
+async def get_common_ancestor(
+    word1: str,
+    word2: str,
+    lang1: str = "English",
+    lang2: str = "English",
+    col: AsyncIOMotorCollection = Depends(get_words_collection),
+):
+    """Lowest common ancestor of two words, with each word's path up to it.
+
+    Intersects the precomputed ``ancestor_closure`` of both words (requires
+    ``make precompute-closures``): two indexed reads, no tree build. Each word
+    counts as a member of its own lineage, so a word that is the other's
+    ancestor is their common ancestor. When the lineages do not meet,
+    ``common_ancestor`` and ``depths`` are null and only the two words are
+    returned.
+    """
+    keys = [(word1, lang1), (word2, lang2)]
+    docs = await asyncio.gather(
+        *(
+            word_cache.get_or_load(
+                col,
+                ("closure", word, lang, None),
+                lambda word=word, lang=lang: ancestor_closure.find_closure(col, word, lang),
+            )
+            for word, lang in keys
+        )
+    )
+    lineages = []
+    for (word, lang), doc in zip(keys, docs, strict=True):
+        if not doc:
+            raise HTTPException(
+                status_code=404, detail=f"Word '{word}' not found for language '{lang}'"
+            )
+        lineages.append(
+            [{"word": word, "lang": lang, "depth": 0}, *doc.get(ancestor_closure.FIELD, [])]
+        )
+
+    depths = ancestor_closure.lowest_common_ancestor(*lineages)
+    ends = depths or (0, 0)
+    nodes: dict[str, dict] = {}
+    edges = []
+    for lineage, end in zip(lineages, ends, strict=True):
+        prev_id = None
+        for member in lineage[: end + 1]:
+            mid = node_id(member["word"], member["lang"])
+            if mid in nodes:
+                nodes[mid]["level"] = min(nodes[mid]["level"], -member["depth"])
+            else:
+                nodes[mid] = {
+                    "id": mid,
+                    "label": member["word"],
+                    "language": member["lang"],
+                    "level": -member["depth"],
+                }
+            if prev_id is not None:
+                edges.append({"from": mid, "to": prev_id, "label": member["type"]})
+            prev_id = mid
+
+    common = None
+    if depths is not None:
+        lca = lineages[0][depths[0]]
+        common = nodes[node_id(lca["word"], lca["lang"])]
+    return {
+        "common_ancestor": common,
+        "depths": list(depths) if depths is not None else None,
+        "nodes": list(nodes.values()),
+        "edges": edges,
+    }
+
+
+# A plain def: FastAPI runs it in its threadpool, so mapping the graph and the
+# CPU-bound search do not block the event loop.
+@router.get("/etymology/path")
+def get_etymology_path(
+    word1: str,
+    word2: str,
+    *,
+    lang1: str = "English",
+    lang2: str = "English",
+    types: str = Query(
+        ",".join(path_search.PATH_TYPES),
+        description="Comma-separated edge types to follow: inh,bor,der,cog,component",
+    ),
+    max_hops: int = Query(path_search.DEFAULT_MAX_HOPS, ge=1, le=12),
+    time_limit_ms: int = Query(500, ge=1, le=5000, description="Give up after this long"),
+):
+    """Shortest chain of etymological links between two words.
+
+    Bidirectional breadth-first search over the in-process CSR graph (requires
+    ``make export-csr-graph``), following edges of ``types`` in either
+    direction. Levels are relative to ``word1``: up to an ancestor is -1,
+    down to a descendant +1, across to a cognate 0. When no path of at most
+    ``max_hops`` edges exists, ``found`` is false and ``nodes`` / ``edges``
+    are empty; ``truncated_reason`` is set if the time limit ran out first.
+    """
+    try:
+        graph = csr_graph.ensure_loaded(settings.csr_graph_dir)
+    except FileNotFoundError:
+        raise HTTPException(status_code=503, detail="CSR graph export not available") from None
+    ends = []
+    for word, lang in ((word1, lang1), (word2, lang2)):
+        node = path_search.find_node(graph, word, lang)
+        if node is None:
+            raise HTTPException(
+                status_code=404, detail=f"Word '{word}' not found for language '{lang}'"
+            )
+        ends.append(node)
+
+    deadline = time.monotonic() + time_limit_ms / 1000
+    requested_types = {t for t in types.split(",") if t}
+    result = path_search.shortest_path(
+        graph, *ends, requested_types, max_hops=max_hops, deadline=deadline
+    )
+    found = result.nodes is not None
+    return {
+        "found": found,
+        "hops": len(result.edges) if found else None,
+        **path_search.path_graph(graph, result),
+        "visited": result.visited,
+        "truncated_reason": result.truncated_reason,
+    }
+
+
+async def _parse_ancestry(
+    col: AsyncIOMotorCollection, word: str, lang: str, etym: int | None
+) -> list[dict] | None:
+    """Ancestry of a word parsed from its doc's templates, or None if it has no doc."""
+
+    async def load() -> dict | None:
+        proj = {"_id": 0, "etymology_templates": 1}
+        if etym is None and settings.link_resolution:
+            resolved, doc = await word_links.find_word_doc(col, word, lang, proj)
+            if resolved:
+                return doc
+            # Unresolved: the raw form already missed in that round trip.
+        else:
+            query = {"word": word, "lang": lang}
+            if etym is not None:
+                query["etymology_number"] = etym
+            doc = await col.find_one(query, proj)
+        if not doc:
+            normalized = normalize_word(word)
+            if normalized != word:
+                nquery = {"word": normalized, "lang": lang}
+                if etym is not None:
+                    nquery["etymology_number"] = etym
+                doc = await col.find_one(nquery, proj)
+        return doc
+
+    doc = await word_cache.get_or_load(col, ("chain", word, lang, etym), load)
+    return extract_ancestry(doc) if doc else None
+
+
 async def build_tree(
     col: AsyncIOMotorCollection,
     word: str,
@@ -75,6 +246,11 @@ async def build_tree(
     max_descendant_depth: int,
     types: str,
     etym: int | None,
+    *,
+    include_meta: bool = False,
+    on_batch: Callable[[str, dict], None] | None = None,
+    max_nodes: int | None = None,
+    time_budget_ms: int | None = None,
 ) -> dict:
     """Build the etymology tree graph: trace up to the root, then find all
     descendants at each level.
@@ -82,7 +258,53 @@ async def build_tree(
     Extracted from the ``/tree`` endpoint so the SPC-00021 layout endpoints
     build identical, deterministic topology from the exact same code path (the
     ``/tree`` response stays byte-identical — this is a pure move).
+
+    ``include_meta`` adds the builder's ``meta`` block (doc memo hit/miss
+    counts) under a ``meta`` key; off by default so the response shape is
+    unchanged for existing clients and snapshots.
+
+    Built graphs are served from ``tree_cache`` when the same request was
+    built before under the current data version; ``meta.tree_cache`` then
+    reads ``"hit"`` and carries no builder statistics.
+
+    ``on_batch`` is handed to the builder for progressive output (see
+    ``TreeBuilder.drain``); it is not called on a cache hit.
+
+    ``max_nodes`` / ``time_budget_ms`` (defaulting to the server settings) bound
+    the build; with either set the result carries ``truncated`` and
+    ``truncated_reason``. Trees cut short by the clock are not cached, since
+    another run may get further.
     """
+    if max_nodes is None:
+        max_nodes = settings.tree_max_nodes
+    if time_budget_ms is None:
+        time_budget_ms = settings.tree_time_budget_ms
+    db = col.database
+    key = layout_cache.cache_key(
+        {
+            "kind": "tree",
+            "word": word,
+            "lang": lang,
+            "types": ",".join(sorted(t for t in types.split(",") if t)),
+            "max_ancestor_depth": max_ancestor_depth,
+            "max_descendant_depth": max_descendant_depth,
+            "etym": etym,
+            "descendant_mode": settings.descendant_mode,
+            "descendant_source": settings.descendant_source,
+            "chain_source": settings.chain_source,
+            "link_resolution": settings.link_resolution,
+            "tree_engine": settings.tree_engine,
+            "cognate_mode": settings.cognate_mode,
+            "max_nodes": max_nodes,
+            "time_budget_ms": time_budget_ms,
+        }
+    )
+    cached = await tree_cache.get_cached(db, key)
+    if cached is not None:
+        if include_meta:
+            cached["meta"] = {"tree_cache": "hit"}
+        return cached
+
     await lang_cache.ensure_loaded(col)
 
     requested_types = set(types.split(",")) if types.strip() else set()
@@ -93,13 +315,31 @@ async def build_tree(
     if not allowed_types and not include_cognates:
         allowed_types = {"inh"}
 
-    builder = TreeBuilder(col, allowed_types, max_ancestor_depth, max_descendant_depth)
+    builder = tree_builder_class(settings.tree_engine)(
+        col,
+        allowed_types,
+        max_ancestor_depth,
+        max_descendant_depth,
+        descendant_mode=settings.descendant_mode,
+        descendant_source=settings.descendant_source,
+        on_batch=on_batch,
+        max_nodes=max_nodes,
+        time_budget_ms=time_budget_ms,
+        link_resolution=settings.link_resolution,
+        chain_source=settings.chain_source,
+        cognate_mode=settings.cognate_mode,
+    )
     await builder.expand_word(word, lang, base_level=0, etym=etym)
 
     if include_cognates:
         await builder.expand_cognates()
 
-    return builder.result()
+    result = builder.result()
+    if builder.truncated_reason != TRUNCATED_TIME_BUDGET:
+        await tree_cache.put_cached(db, key, result)
+    if include_meta:
+        result = {**result, "meta": {**builder.meta(), "tree_cache": "miss"}}
+    return result
 
 
 @router.get("/etymology/{word}/tree")
@@ -110,9 +350,95 @@ async def get_etymology_tree(
     max_descendant_depth: int = Query(3, ge=1, le=5),
     types: str = Query("inh", description="Comma-separated connection types: inh,bor,der,cog"),
     etym: int | None = None,
+    meta: bool = Query(False, description="Include build statistics under 'meta'"),
+    max_nodes: int | None = Query(None, ge=1, description=_MAX_NODES_DESC),
+    time_budget_ms: int | None = Query(None, ge=1, description=_TIME_BUDGET_DESC),
     col: AsyncIOMotorCollection = Depends(get_words_collection),
 ):
     """Build a full tree: trace up to the root, then find all descendants at each level."""
     return await build_tree(
-        col, word, lang, max_ancestor_depth, max_descendant_depth, types, etym
+        col,
+        word,
+        lang,
+        max_ancestor_depth,
+        max_descendant_depth,
+        types,
+        etym,
+        include_meta=meta,
+        max_nodes=max_nodes,
+        time_budget_ms=time_budget_ms,
     )
+
+
+@router.get("/etymology/{word}/tree/stream")
+async def stream_etymology_tree(
+    word: str,
+    *,
+    lang: str = "English",
+    max_ancestor_depth: int = 10,
+    max_descendant_depth: int = Query(3, ge=1, le=5),
+    types: str = Query("inh", description="Comma-separated connection types: inh,bor,der,cog"),
+    etym: int | None = None,
+    max_nodes: int | None = Query(None, ge=1, description=_MAX_NODES_DESC),
+    time_budget_ms: int | None = Query(None, ge=1, description=_TIME_BUDGET_DESC),
+    col: AsyncIOMotorCollection = Depends(get_words_collection),
+) -> StreamingResponse:
+    """Stream the ``/tree`` graph as SSE ``batch`` events while it is built.
+
+    Each ``batch`` carries ``{phase, nodes, edges}`` discovered since the
+    previous one (phases: ``ancestors``, ``compounds``, ``descendants``,
+    ``cognates``; ``cache`` for a cached tree sent whole). Nodes are upserts by
+    id — a node whose uncertainty is learned later is sent again. The stream
+    ends with one ``final`` event carrying the node and edge counts (and the
+    ``truncated`` fields under a budget), or an ``error`` event.
+    """
+
+    async def event_stream():
+        queue: asyncio.Queue = asyncio.Queue()
+
+        def on_batch(phase: str, batch: dict) -> None:
+            # Serialize now: the builder keeps mutating its node dicts.
+            queue.put_nowait(sse.format_event("batch", {"phase": phase, **batch}))
+
+        task = asyncio.ensure_future(
+            build_tree(
+                col,
+                word,
+                lang,
+                max_ancestor_depth,
+                max_descendant_depth,
+                types,
+                etym,
+                on_batch=on_batch,
+                max_nodes=max_nodes,
+                time_budget_ms=time_budget_ms,
+            )
+        )
+        task.add_done_callback(lambda _task: queue.put_nowait(None))
+        streamed = False
+        try:
+            while (frame := await queue.get()) is not None:
+                streamed = True
+                yield frame
+            try:
+                tree = task.result()
+            except Exception:
+                logger.exception(
+                    "tree stream build failed for %s", word, extra={"event": "tree.stream.error"}
+                )
+                yield sse.format_event("error", {"message": "tree build failed"})
+                return
+            if not streamed:
+                yield sse.format_event(
+                    "batch", {"phase": "cache", "nodes": tree["nodes"], "edges": tree["edges"]}
+                )
+            final = {"node_count": len(tree["nodes"]), "edge_count": len(tree["edges"])}
+            if "truncated" in tree:
+                final["truncated"] = tree["truncated"]
+                final["truncated_reason"] = tree["truncated_reason"]
+            yield sse.format_event("final", final)
+        finally:
+            task.cancel()
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=headers)
@@ -3,7 +3,11 @@ import re
 from fastapi import APIRouter, Depends, Query
 from motor.motor_asyncio import AsyncIOMotorCollection
 
+from app.config import settings
 from app.database import get_words_collection
+from app.services import search_cache, search_index
+from app.services.lru import MISSING
+from app.services.template_parser import fold_word
 
 router = APIRouter()
 
@@ -11,10 +15,33 @@ router = APIRouter()
 async def _expand_polysemous(col, results: list[dict]) -> list[dict]:
     """Expand results that have multiple etymology_number values into separate entries.
 
-    For each unique (word, lang) in results, check if distinct etymology groups
-    exist. If 2+ groups found, replace single result with one per etymology,
-    annotated with first_gloss for disambiguation.
+    One aggregation groups the entries of every unique (word, lang) in results
+    by etymology_number. Each (word, lang) with 2+ groups has its single
+    result replaced with one per etymology, annotated with first_gloss for
+    disambiguation.
     """
+    keys = list(dict.fromkeys((r["word"], r["lang"]) for r in results))
+    pipeline = [
+        {"$match": {
+            "$or": [{"word": word, "lang": lang} for word, lang in keys],
+            "etymology_number": {"$exists": True},
+        }},
+        {"$sort": {"etymology_number": 1}},
+        {"$group": {
+            "_id": {"word": "$word", "lang": "$lang", "etymology_number": "$etymology_number"},
+            "pos_list": {"$addToSet": "$pos"},
+            "first_gloss": {
+                "$first": {"$arrayElemAt": [{"$arrayElemAt": ["$senses.glosses", 0]}, 0]},
+            },
+        }},
+        {"$sort": {"_id.etymology_number": 1}},
+    ]
+    groups_by_key: dict[tuple, list[dict]] = {key: [] for key in keys}
+    async for g in col.aggregate(pipeline):
+        groups = groups_by_key[(g["_id"]["word"], g["_id"]["lang"])]
+        if len(groups) < 20:
+            groups.append(g)
+
     expanded = []
     seen = set()
 
@@ -24,28 +51,14 @@ async def _expand_polysemous(col, results: list[dict]) -> list[dict]:
             continue
         seen.add(key)
 
-        # Check for multiple etymology groups
-        pipeline = [
-            {"$match": {"word": r["word"], "lang": r["lang"], "etymology_number": {"$exists": True}}},
-            {"$sort": {"etymology_number": 1}},
-            {"$group": {
-                "_id": "$etymology_number",
-                "pos_list": {"$addToSet": "$pos"},
-                "first_gloss": {
-                    "$first": {"$arrayElemAt": [{"$arrayElemAt": ["$senses.glosses", 0]}, 0]},
-                },
-            }},
-            {"$sort": {"_id": 1}},
-        ]
-        groups = await col.aggregate(pipeline).to_list(length=20)
-
+        groups = groups_by_key[key]
         if len(groups) >= 2:
             for g in groups:
                 expanded.append({
                     "word": r["word"],
                     "lang": r["lang"],
                     "pos": ", ".join(sorted(g["pos_list"])),
-                    "etymology_number": g["_id"],
+                    "etymology_number": g["_id"]["etymology_number"],
                     "first_gloss": g.get("first_gloss", ""),
                 })
         else:
@@ -54,25 +67,85 @@ async def _expand_polysemous(col, results: list[dict]) -> list[dict]:
     return expanded
 
 
+async def _folded_prefix_matches(col, q: str, limit: int, projection: dict) -> list[dict]:
+    """Case- and diacritic-insensitive prefix matches of q.
+
+    An index range scan over the precomputed ``word_folded`` key (requires
+    ``make precompute-folded-words``), never a regex. Words whose whole folded
+    form equals q's come first ("Rome" for "rome"), then those starting with q
+    as typed, then the rest, each in index order.
+    """
+    folded = fold_word(q)
+    end = search_index.prefix_end(folded)
+    key_range = {"$gte": folded, "$lt": end} if end is not None else {"$gte": folded}
+    cursor = col.find({"word_folded": key_range}, projection).sort([("word_folded", 1)])
+    cursor = cursor.limit(limit)
+    results = await cursor.to_list(length=limit)
+    results.sort(key=lambda r: (fold_word(r["word"]) != folded, not r["word"].startswith(q)))
+    return results
+
+
+async def _mongo_rows(col, q: str, limit: int, mode: str) -> tuple[list[dict], list[dict]]:
+    """Exact and prefix matches of q, read from the words collection."""
+    projection = {"_id": 0, "word": 1, "lang": 1, "pos": 1}
+
+    # First: exact word matches (case-sensitive) — these are highest priority
+    exact_cursor = col.find({"word": q}, projection).hint(search_index.WORD_INDEX).limit(limit)
+    exact_results = await exact_cursor.to_list(length=limit)
+
+    if mode == "folded":
+        # Second: folded-key prefix matches (any case, any diacritics)
+        prefix_results = await _folded_prefix_matches(col, q, limit * 3, projection)
+    else:
+        # Second: prefix matches (case-sensitive to use index) to fill remaining slots
+        prefix_cursor = col.find(
+            {"word": {"$regex": f"^{re.escape(q)}"}},
+            projection,
+        ).hint(search_index.WORD_INDEX).limit(limit * 3)
+        prefix_results = await prefix_cursor.to_list(length=limit * 3)
+        if len(prefix_results) < limit * 3:
+            # Every word starting with q was fetched: longer queries narrow from it
+            search_cache.store_prefix_rows(q, prefix_results)
+    return exact_results, prefix_results
+
+
 @router.get("/search")
 async def search_words(
     q: str = Query(..., min_length=1),
     limit: int = Query(20, ge=1, le=100),
+    mode: str = Query(
+        "prefix",
+        pattern="^(prefix|folded)$",
+        description="prefix: case-sensitive prefix; folded: case- and diacritic-insensitive",
+    ),
     col: AsyncIOMotorCollection = Depends(get_words_collection),
 ) -> dict:
-    """Search words by exact match then prefix, deduplicated and merged."""
-    projection = {"_id": 0, "word": 1, "lang": 1, "pos": 1}
+    """Search words by exact match then prefix, deduplicated and merged.
 
-    # First: exact word matches (case-sensitive) — these are highest priority
-    exact_cursor = col.find({"word": q}, projection).limit(limit)
-    exact_results = await exact_cursor.to_list(length=limit)
-
-    # Second: prefix matches (case-sensitive to use index) to fill remaining slots
-    prefix_cursor = col.find(
-        {"word": {"$regex": f"^{re.escape(q)}"}},
-        projection,
-    ).limit(limit * 3)
-    prefix_results = await prefix_cursor.to_list(length=limit * 3)
+    ``mode=folded`` matches the prefix on the case- and diacritic-folded key
+    instead ("rome" finds "Rome", "vinum" finds "vīnum"); exact-case matches
+    still rank first. Responses are cached, and a prefix query whose shorter
+    prefix's matches were all fetched is answered from those (search_cache).
+    """
+    await search_cache.sync_version(col)
+    cached = search_cache.lookup((q, limit, mode))
+    if cached is not MISSING:
+        return cached
+
+    index = None
+    if settings.search_source == "index" and mode == "prefix":
+        index = search_index.loaded()
+    narrowed = search_cache.narrow(q) if index is None and mode == "prefix" else None
+    if index is not None:
+        # Same two row sets, read from the in-process prefix index
+        exact_results = index.exact(q, limit)
+        prefix_results = index.prefix(q, limit * 3)
+    elif narrowed is not None:
+        # Same two row sets, filtered from every word starting with q
+        exact_results = [r for r in narrowed if r["word"] == q][:limit]
+        prefix_results = narrowed[: limit * 3]
+    else:
+        exact_results, prefix_results = await _mongo_rows(col, q, limit, mode)
 
     # Merge: exact first, then prefix, deduplicated by word+lang
     seen = set()
@@ -92,8 +165,13 @@ async def search_words(
             exact_end += 1
         else:
             break
-    if exact_end > 0:
+    if exact_end > 0 and (
+        index is None
+        or any(index.has_etymologies(r["word"], r["lang"]) for r in unique[:exact_end])
+    ):
         expanded = await _expand_polysemous(col, unique[:exact_end])
         unique = expanded + unique[exact_end:]
 
-    return {"results": unique, "total": len(unique)}
+    response = {"results": unique, "total": len(unique)}
+    search_cache.store((q, limit, mode), response)
+    return response
@@ -1,7 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from motor.motor_asyncio import AsyncIOMotorCollection
 
+from app.config import settings
 from app.database import get_words_collection
+from app.services import word_cache, word_links
 from app.services.etymology_classifier import classify_etymology, extract_word_mentions
 from app.services.template_parser import normalize_word
 
@@ -48,17 +50,28 @@ async def get_word(
     col: AsyncIOMotorCollection = Depends(get_words_collection),
 ) -> dict:
     """Fetch a word entry with definitions, pronunciation, and etymology details."""
-    query = {"word": word, "lang": lang}
-    if etym is not None:
-        query["etymology_number"] = etym
-    doc = await col.find_one(query, {"_id": 0})
-    if not doc:
-        normalized = normalize_word(word)
-        if normalized != word:
-            nquery = {"word": normalized, "lang": lang}
+
+    async def load() -> dict | None:
+        if etym is None and settings.link_resolution:
+            resolved, doc = await word_links.find_word_doc(col, word, lang, {"_id": 0})
+            if resolved:
+                return doc
+            # Unresolved: the raw form already missed in that round trip.
+        else:
+            query = {"word": word, "lang": lang}
             if etym is not None:
-                nquery["etymology_number"] = etym
-            doc = await col.find_one(nquery, {"_id": 0})
+                query["etymology_number"] = etym
+            doc = await col.find_one(query, {"_id": 0})
+        if not doc:
+            normalized = normalize_word(word)
+            if normalized != word:
+                nquery = {"word": normalized, "lang": lang}
+                if etym is not None:
+                    nquery["etymology_number"] = etym
+                doc = await col.find_one(nquery, {"_id": 0})
+        return doc
+
+    doc = await word_cache.get_or_load(col, ("detail", word, lang, etym), load)
     if not doc:
         raise HTTPException(
             status_code=404, detail=f"Word '{word}' not found for language '{lang}'"
@@ -0,0 +1,83 @@
+"""Precomputed transitive ancestor lists and lowest-common-ancestor lookup.
+
+``etl.precompute_closures`` stores on every words entry::
+
+    ancestor_closure: [{word, lang, lang_code, type, depth}]
+
+the entry's own ancestor chain followed by the chain of the deepest ancestor
+reached, repeatedly (see :func:`closure`). Whether two words share a root is
+then two indexed reads and an in-memory intersection
+(:func:`lowest_common_ancestor`) instead of two tree builds.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import TYPE_CHECKING
+
+from app.services.template_parser import normalize_word
+
+if TYPE_CHECKING:
+    from motor.motor_asyncio import AsyncIOMotorCollection
+
+FIELD = "ancestor_closure"
+MAX_CLOSURE_DEPTH = 30
+
+Key = tuple[str, str]
+
+_PROJECTION = {"_id": 0, "word": 1, "lang": 1, FIELD: 1}
+
+
+def closure(
+    word: str,
+    lang: str,
+    hops: list[dict],
+    default_hops: Mapping[Key, list[dict]],
+    max_depth: int = MAX_CLOSURE_DEPTH,
+) -> list[dict]:
+    """Transitive ancestors of (word, lang), nearest first, with their depth.
+
+    Starts from the entry's own ``hops`` (``extract_ancestry`` order), then
+    continues with ``default_hops`` of the deepest ancestor so far (raw form,
+    then normalized), until a chain ends, an ancestor repeats (a cycle) or
+    ``max_depth`` is reached.
+    """
+    result: list[dict] = []
+    seen = {(word, lang)}
+    while hops:
+        for hop in hops:
+            key = (hop["word"], hop["lang"])
+            if key in seen or len(result) >= max_depth:
+                return result
+            seen.add(key)
+            result.append({**hop, "depth": len(result) + 1})
+        last = result[-1]
+        hops = default_hops.get((last["word"], last["lang"])) or default_hops.get(
+            (normalize_word(last["word"]), last["lang"])
+        )
+    return result
+
+
+def lowest_common_ancestor(lineage_a: list[dict], lineage_b: list[dict]) -> tuple[int, int] | None:
+    """Positions in two lineages (the word itself at 0, then its closure) of
+    their common member with the smallest depth sum, preferring the one
+    nearer to the first word on a tie; None if they share none."""
+    position_b: dict[Key, int] = {}
+    for j, member in enumerate(lineage_b):
+        position_b.setdefault((member["word"], member["lang"]), j)
+    best = None
+    for i, member in enumerate(lineage_a):
+        j = position_b.get((member["word"], member["lang"]))
+        if j is not None and (best is None or i + j < sum(best)):
+            best = (i, j)
+    return best
+
+
+async def find_closure(col: AsyncIOMotorCollection, word: str, lang: str) -> dict | None:
+    """``{word, lang, ancestor_closure}`` of the entry a plain lookup of
+    (word, lang) returns, trying the raw form before the normalized one."""
+    doc = await col.find_one({"word": word, "lang": lang}, _PROJECTION)
+    normalized = normalize_word(word)
+    if not doc and normalized != word:
+        doc = await col.find_one({"word": normalized, "lang": lang}, _PROJECTION)
+    return doc
@@ -0,0 +1,77 @@
+"""Precomputed ancestor chains: one ``chains`` doc per word entry.
+
+An entry's ancestor chain (its inh/bor/der templates, in order, with language
+codes resolved to names) and its uncertainty classification are pure
+functions of static data, yet every chain request and every ``expand_word``
+re-read the doc, re-parsed its templates and re-mapped its codes.
+``etl.precompute_chains`` stores :func:`chain_record` for every entry::
+
+    {word, lang, etymology_number, default, ancestry: [{word, lang, lang_code, type}],
+     uncertainty}
+
+``default`` marks, per (word, lang), the entry a plain ``{word, lang}``
+lookup returns (the first in natural order); the ETL writes it as a separate
+doc next to the ``etymology_number`` one. :func:`find_chain` then answers a
+lookup, including the normalized-form retry, with one indexed read.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from app.services.etymology_classifier import classify_etymology
+from app.services.template_parser import extract_ancestry, normalize_word
+
+if TYPE_CHECKING:
+    from motor.motor_asyncio import AsyncIOMotorCollection
+
+COLLECTION = "chains"
+
+_PROJECTION = {"_id": 0, "word": 1, "lang": 1, "default": 1, "ancestry": 1, "uncertainty": 1}
+
+
+def chain_record(doc: dict, lang_lookup: dict[str, str]) -> dict:
+    """Build the ``chains`` doc of a words entry (``default`` is set by the ETL)."""
+    ancestry = [
+        {**anc, "lang": lang_lookup.get(anc["lang_code"], anc["lang_code"])}
+        for anc in extract_ancestry(doc)
+    ]
+    uncertainty = classify_etymology(doc)
+    return {
+        "word": doc["word"],
+        "lang": doc["lang"],
+        "etymology_number": doc.get("etymology_number"),
+        "ancestry": ancestry,
+        "uncertainty": uncertainty.to_dict() if uncertainty.is_uncertain else None,
+    }
+
+
+async def find_chain(
+    col: AsyncIOMotorCollection,
+    word: str,
+    lang: str,
+    etym: int | None = None,
+    *,
+    etym_fallback: bool = False,
+) -> dict | None:
+    """Return the chain doc for ``(word, lang)``, trying the raw form before the
+    normalized one, in a single read of the ``chains`` collection.
+
+    With ``etym``, only that etymology's entry matches, unless
+    ``etym_fallback`` also accepts the plain (default) entry, as
+    ``TreeBuilder`` does.
+    """
+    forms = list(dict.fromkeys([word, normalize_word(word)]))
+    if etym is None:
+        match: dict = {"default": True}
+        preference = [(form, True) for form in forms]
+    elif etym_fallback:
+        match = {"$or": [{"default": True}, {"default": False, "etymology_number": etym}]}
+        preference = [(word, False), *((form, True) for form in forms)]
+    else:
+        match = {"default": False, "etymology_number": etym}
+        preference = [(form, False) for form in forms]
+    query = {"word": {"$in": forms}, "lang": lang, **match}
+    docs = await col.database[COLLECTION].find(query, _PROJECTION).to_list(length=None)
+    by_key = {(doc["word"], doc["default"]): doc for doc in docs}
+    return next((by_key[key] for key in preference if key in by_key), None)
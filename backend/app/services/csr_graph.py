@@ -0,0 +1,464 @@
+"""In-process CSR etymology graph: tree traversals without Mongo round trips.
+
+``etl.export_csr_graph`` writes the whole relation graph as compressed sparse
+row (CSR) arrays into a directory of ``.npy`` files, and the API maps them
+read-only at startup (``TREE_ENGINE=csr``)::
+
+    strings.*           sorted string table (words, language names and codes)
+    nodes.key.npy       int64, word id << 32 | lang id, sorted: node id = rank
+    nodes.code.npy      int32, string id of the node's language code
+    nodes.flags.npy     uint8, HAS_DOC | UNCERTAIN
+    {rel}.offsets.npy   int64, node count + 1; node i's edges are [off[i], off[i+1])
+    {rel}.targets.npy   int32, target node ids
+    {rel}.types.npy     uint8, index into meta.json ``edge_types``
+    meta.json           node count, edge types, edge count per relation
+
+with one CSR per relation in :data:`RELATIONS`:
+
+- ``anc``: the ancestor chain of the node's default entry (the first in
+  natural order, which a plain ``{word, lang}`` lookup returns), in
+  template order, as ``chains.chain_record`` resolves it
+- ``desc``: one edge per entry whose ``primary_ancestor`` is the node, in
+  ``_DESCENDANT_SORT`` order (several entries of one child are kept, so the
+  per-parent cap counts entries as the Mongo lookup does)
+- ``cog``: the cognate mentions of the default entry
+- ``comp``: ``etymology_edges`` components of the node (``from_exists`` only)
+- ``up`` / ``down``: every distinct edge the relations above draw in a tree
+  (ancestor -> child along each chain and ``primary_ancestor`` link, citing
+  word -> cognate, component -> compound), stored on its target and on its
+  source respectively, for path search (``app.services.path_search``)
+
+:class:`CsrTreeBuilder` answers ancestor chains, descendants, compounds and
+cognate rounds from these arrays. Mongo still serves what the arrays do not
+hold: etymology-specific chains, uncertainty classifications, mention edges
+of words without ancestry, and words missing from the export. ``desc`` holds
+the ``primary_ancestor`` link, the first over all of inh/bor/der, so under a
+type filter selecting only some of them the base class's Mongo lookup (which
+matches on ``first_ancestors``) answers descendants instead.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+
+from app.services import lang_cache
+from app.services.chains import chain_record
+from app.services.string_table import MappedStringTable, write_string_table
+from app.services.template_parser import (
+    ANCESTRY_TYPES,
+    COGNATE_TYPE,
+    extract_cognates,
+    normalize_word,
+)
+from app.services.tree_builder import MAX_DESCENDANTS_PER_NODE, TreeBuilder
+
+RELATIONS = ("anc", "desc", "cog", "comp", "up", "down")
+
+# nodes.flags bits.
+HAS_DOC = 1
+UNCERTAIN = 2
+
+# Packing shift for (word id, lang id) node keys.
+_SHIFT = 32
+
+_state: dict[str, CsrGraph | None] = {"graph": None}
+
+
+class CsrGraphExport:
+    """Accumulates nodes and relation edges from words / edge docs, then
+    writes them with :meth:`write`."""
+
+    def __init__(self, lang_lookup: dict[str, str]):
+        self._lang_lookup = lang_lookup
+        # (word, lang) -> [lang_code, flags]
+        self._nodes: dict[tuple[str, str], list] = {}
+        self._adjacency: dict[str, defaultdict[tuple[str, str], list]] = {
+            rel: defaultdict(list) for rel in RELATIONS
+        }
+        self._links: set[tuple] = set()
+
+    def _node(self, word: str, lang_code: str, lang: str | None = None) -> tuple[str, str]:
+        node = (word, lang or self._lang_lookup.get(lang_code, lang_code))
+        self._nodes.setdefault(node, [lang_code, 0])
+        return node
+
+    def _link(self, source: tuple[str, str], target: tuple[str, str], edge_type: str) -> None:
+        """Record the tree edge source -> target in ``up`` / ``down`` once."""
+        if (source, target, edge_type) in self._links:
+            return
+        self._links.add((source, target, edge_type))
+        self._adjacency["up"][target].append((source, edge_type))
+        self._adjacency["down"][source].append((target, edge_type))
+
+    def add_entry(self, doc: dict) -> bool:
+        """Record a words entry's chain and cognates, if it is the first entry of
+        its (word, lang) seen; feed entries in natural order. Returns whether
+        it was."""
+        node = self._node(doc["word"], doc.get("lang_code", ""), doc["lang"])
+        state = self._nodes[node]
+        if state[1] & HAS_DOC:
+            return False
+        record = chain_record(doc, self._lang_lookup)
+        state[0] = doc.get("lang_code", "")
+        state[1] |= HAS_DOC | (UNCERTAIN if record["uncertainty"] else 0)
+        child = node
+        for anc in record["ancestry"]:
+            target = self._node(anc["word"], anc["lang_code"], anc["lang"])
+            self._adjacency["anc"][node].append((target, anc["type"]))
+            self._link(target, child, anc["type"])
+            child = target
+        for cog in extract_cognates(doc):
+            target = self._node(cog["word"], cog["lang_code"])
+            self._adjacency["cog"][node].append((target, COGNATE_TYPE))
+            self._link(node, target, COGNATE_TYPE)
+        return True
+
+    def add_child(self, doc: dict) -> None:
+        """Record an entry under its ``primary_ancestor``; feed entries in
+        ``_DESCENDANT_SORT`` order."""
+        parent = doc["primary_ancestor"]
+        source = self._node(parent["word"], parent["lang_code"])
+        child = self._node(doc["word"], doc.get("lang_code", ""), doc["lang"])
+        self._adjacency["desc"][source].append((child, parent["type"]))
+        self._link(source, child, parent["type"])
+
+    def add_component(self, edge_doc: dict) -> None:
+        """Record an ``etymology_edges`` doc as a component of its target."""
+        target = self._node(
+            edge_doc["to_word"], edge_doc.get("to_lang_code", ""), edge_doc["to_lang"]
+        )
+        component = self._node(
+            edge_doc["from_word"], edge_doc.get("from_lang_code", ""), edge_doc["from_lang"]
+        )
+        self._adjacency["comp"][target].append((component, edge_doc["edge_type"]))
+        self._link(component, target, edge_doc["edge_type"])
+
+    def write(self, directory: Path) -> dict:
+        """Write the graph files into ``directory``; return the ``meta.json`` content."""
+        directory.mkdir(parents=True, exist_ok=True)
+        ids = write_string_table(
+            directory,
+            "strings",
+            itertools.chain.from_iterable(
+                (word, lang, lang_code) for (word, lang), (lang_code, _f) in self._nodes.items()
+            ),
+        )
+        packed = {node: ids[node[0]] << _SHIFT | ids[node[1]] for node in self._nodes}
+        order = sorted(self._nodes, key=packed.__getitem__)
+        index = {node: i for i, node in enumerate(order)}
+        np.save(directory / "nodes.key.npy", np.array([packed[n] for n in order], dtype=np.int64))
+        np.save(
+            directory / "nodes.code.npy",
+            np.array([ids[self._nodes[n][0]] for n in order], dtype=np.int32),
+        )
+        np.save(
+            directory / "nodes.flags.npy", np.array([self._nodes[n][1] for n in order], np.uint8)
+        )
+
+        edge_types = sorted(
+            {
+                edge_type
+                for adjacency in self._adjacency.values()
+                for edges in adjacency.values()
+                for _target, edge_type in edges
+            }
+        )
+        if len(edge_types) > np.iinfo(np.uint8).max:
+            msg = f"{len(edge_types)} edge types do not fit the uint8 type codes"
+            raise ValueError(msg)
+        type_codes = {edge_type: code for code, edge_type in enumerate(edge_types)}
+        edge_counts = {}
+        for rel, adjacency in self._adjacency.items():
+            offsets = np.zeros(len(order) + 1, dtype=np.int64)
+            targets: list[int] = []
+            types: list[int] = []
+            for i, node in enumerate(order):
+                for target, edge_type in adjacency.get(node, ()):
+                    targets.append(index[target])
+                    types.append(type_codes[edge_type])
+                offsets[i + 1] = len(targets)
+            np.save(directory / f"{rel}.offsets.npy", offsets)
+            np.save(directory / f"{rel}.targets.npy", np.array(targets, dtype=np.int32))
+            np.save(directory / f"{rel}.types.npy", np.array(types, dtype=np.uint8))
+            edge_counts[rel] = len(targets)
+
+        meta = {"nodes": len(order), "edge_types": edge_types, "edges": edge_counts}
+        (directory / "meta.json").write_text(json.dumps(meta, indent=2))
+        return meta
+
+
+class CsrGraph:
+    """Read-only view of an exported graph directory, memory-mapped."""
+
+    def __init__(self, directory: Path):
+        self.strings = MappedStringTable.open(directory, "strings")
+        self._keys = np.load(directory / "nodes.key.npy", mmap_mode="r")
+        self._codes = np.load(directory / "nodes.code.npy", mmap_mode="r")
+        self._flags = np.load(directory / "nodes.flags.npy", mmap_mode="r")
+        self._relations = {
+            rel: tuple(
+                np.load(directory / f"{rel}.{part}.npy", mmap_mode="r")
+                for part in ("offsets", "targets", "types")
+            )
+            for rel in RELATIONS
+        }
+        meta = json.loads((directory / "meta.json").read_text())
+        self.edge_types: tuple[str, ...] = tuple(meta["edge_types"])
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def node(self, word: str, lang: str) -> int | None:
+        """Return the node id of ``(word, lang)``, or None if it is not in the graph."""
+        word_sid = self.strings.find(word)
+        lang_sid = self.strings.find(lang)
+        if word_sid is None or lang_sid is None:
+            return None
+        packed = word_sid << _SHIFT | lang_sid
+        node = int(np.searchsorted(self._keys, packed))
+        return node if node < len(self._keys) and self._keys[node] == packed else None
+
+    def word(self, node: int) -> str:
+        return self.strings[int(self._keys[node]) >> _SHIFT]
+
+    def lang(self, node: int) -> str:
+        return self.strings[int(self._keys[node]) & ((1 << _SHIFT) - 1)]
+
+    def lang_code(self, node: int) -> str:
+        return self.strings[int(self._codes[node])]
+
+    def has_doc(self, node: int) -> bool:
+        return bool(self._flags[node] & HAS_DOC)
+
+    def uncertain(self, node: int) -> bool:
+        return bool(self._flags[node] & UNCERTAIN)
+
+    def neighbors(self, rel: str, node: int) -> list[tuple[int, str]]:
+        """(target node, edge type) of ``node``'s ``rel`` edges, in stored order."""
+        offsets, targets, types = self._relations[rel]
+        start, end = int(offsets[node]), int(offsets[node + 1])
+        return [
+            (target, self.edge_types[code])
+            for target, code in zip(
+                targets[start:end].tolist(), types[start:end].tolist(), strict=True
+            )
+        ]
+
+    def record(self, node: int, edge_type: str) -> dict:
+        """``{word, lang, lang_code, type}``, as ``extract_ancestry`` returns a hop."""
+        return {
+            "word": self.word(node),
+            "lang": self.lang(node),
+            "lang_code": self.lang_code(node),
+            "type": edge_type,
+        }
+
+
+def load(directory: str | Path) -> CsrGraph:
+    """Map the graph exported into ``directory`` and make it the process-wide one."""
+    graph = _state["graph"] = CsrGraph(Path(directory))
+    return graph
+
+
+def ensure_loaded(directory: str | Path) -> CsrGraph:
+    """The process-wide graph, mapping ``directory`` first if none is loaded."""
+    return _state["graph"] or load(directory)
+
+
+def reset() -> None:
+    """Forget the process-wide graph."""
+    _state["graph"] = None
+
+
+def loaded() -> CsrGraph:
+    """The process-wide graph mapped by :func:`load`."""
+    graph = _state["graph"]
+    if graph is None:
+        msg = "CSR graph is not loaded; run `make export-csr-graph` and set TREE_ENGINE=csr"
+        raise RuntimeError(msg)
+    return graph
+
+
+class CsrTreeBuilder(TreeBuilder):
+    """TreeBuilder whose chain, descendant, compound and cognate lookups read
+    the in-process :class:`CsrGraph` instead of Mongo.
+
+    Descendants follow ``primary_ancestor`` links whatever
+    ``descendant_source`` is set to, except under a type filter selecting only
+    some ancestry types, where they come from Mongo as in the base class.
+    """
+
+    def __init__(self, *args, graph: CsrGraph | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.csr = graph or loaded()
+
+    def _doc_node(self, word: str, lang: str) -> tuple[bool, int | None]:
+        """(known, node) of the entry a doc lookup of (word, lang) resolves to:
+        raw form first, then normalized. ``known`` is False when neither form
+        is in the graph at all, so only Mongo can tell."""
+        known = False
+        for form in dict.fromkeys([word, normalize_word(word)]):
+            node = self.csr.node(form, lang)
+            if node is None:
+                continue
+            known = True
+            if self.csr.has_doc(node):
+                return True, node
+        return known, None
+
+    def _hops(self, node: int) -> list[dict]:
+        """The allowed-type ancestor hops of a node, depth-capped (``_ancestor_hops``)."""
+        types = self.allowed_types or ANCESTRY_TYPES
+        hops = [
+            self.csr.record(target, edge_type)
+            for target, edge_type in self.csr.neighbors("anc", node)
+            if edge_type in types
+        ]
+        return hops[: self.max_ancestor_depth]
+
+    def _csr_chain(
+        self, word: str, lang: str, etym: int | None
+    ) -> tuple[bool, list[dict], dict | None] | None:
+        """The chain of (word, lang) from the graph, or None where Mongo must answer."""
+        if etym is not None:
+            return None
+        known, node = self._doc_node(word, lang)
+        if node is None:
+            return (False, [], None) if known else None
+        if self.csr.uncertain(node):
+            return None
+        return True, self._hops(node), None
+
+    async def _parse_chain(
+        self, word: str, lang: str, etym: int | None
+    ) -> tuple[bool, list[dict], dict | None]:
+        return self._csr_chain(word, lang, etym) or await super()._parse_chain(word, lang, etym)
+
+    async def _read_chain(
+        self, word: str, lang: str, etym: int | None
+    ) -> tuple[bool, list[dict], dict | None]:
+        return self._csr_chain(word, lang, etym) or await super()._read_chain(word, lang, etym)
+
+    async def _prefetch_compound_edges(
+        self, chain: list[tuple], max_compound_depth: int
+    ) -> tuple[dict[tuple[str, str], list[dict]], dict[tuple[str, str], list[dict] | None]]:
+        """The base class's level-by-level prefetch over the graph; targets and
+        components missing from the export are read from Mongo."""
+        edges_by_target: dict[tuple[str, str], list[dict]] = {}
+        comp_hops: dict[tuple[str, str], list[dict] | None] = {}
+        targets = [(word, lang) for word, lang, _lang_code, _level in chain]
+
+        for remaining in range(max_compound_depth, -1, -1):
+            new_targets = [t for t in dict.fromkeys(targets) if t not in edges_by_target]
+            if not new_targets:
+                break
+            unknown_targets = []
+            for word, lang in new_targets:
+                node = self.csr.node(word, lang)
+                if node is None:
+                    unknown_targets.append((word, lang))
+                    continue
+                edges_by_target[(word, lang)] = [
+                    {
+                        "from_word": self.csr.word(component),
+                        "from_lang": self.csr.lang(component),
+                        "edge_type": edge_type,
+                    }
+                    for component, edge_type in self.csr.neighbors("comp", node)
+                ]
+            if unknown_targets:
+                await self._fetch_compound_edges(unknown_targets, edges_by_target)
+            if remaining == 0:
+                break
+
+            components = list(
+                dict.fromkeys(
+                    (edge["from_word"], edge["from_lang"])
+                    for target in new_targets
+                    for edge in edges_by_target[target]
+                )
+            )
+            await self._component_hops(components, comp_hops)
+            targets = []
+            for component in components:
+                hops = comp_hops[component]
+                if hops is None:
+                    continue
+                targets.append(component)
+                targets.extend((anc["word"], anc["lang"]) for anc in hops)
+
+        return edges_by_target, comp_hops
+
+    async def _component_hops(
+        self,
+        components: list[tuple[str, str]],
+        comp_hops: dict[tuple[str, str], list[dict] | None],
+    ) -> None:
+        """Record each component's ancestor hops (None without a doc), from the
+        graph or, for components missing from it, from their Mongo docs."""
+        unknown = []
+        for component in components:
+            known, node = self._doc_node(*component)
+            if not known:
+                unknown.append(component)
+                continue
+            comp_hops[component] = None if node is None else self._hops(node)
+        if not unknown:
+            return
+        await self._prefetch_word_docs(unknown)
+        docs = await self._find_word_docs(unknown)
+        for component, doc in zip(unknown, docs, strict=True):
+            comp_hops[component] = self._ancestor_hops(doc) if doc else None
+
+    def _children(self, word: str, lc: str) -> list[tuple]:
+        """``_select_children`` over the parent's first MAX_DESCENDANTS_PER_NODE
+        allowed-type ``desc`` edges."""
+        parent = self.csr.node(word, lang_cache.code_to_name(lc))
+        if parent is None:
+            return []
+        matched = (
+            (target, edge_type)
+            for target, edge_type in self.csr.neighbors("desc", parent)
+            if edge_type in self.allowed_types
+        )
+        children = []
+        seen = set()
+        for target, edge_type in itertools.islice(matched, MAX_DESCENDANTS_PER_NODE):
+            dw, dl = self.csr.word(target), self.csr.lang(target)
+            if (dw, dl) in seen:
+                continue
+            seen.add((dw, dl))
+            children.append((dw, dl, self.csr.lang_code(target), edge_type))
+        return children
+
+    async def _fetch_children(self, word: str, lc: str) -> list[tuple]:
+        if self._first_ancestor_types() is not None:
+            return await super()._fetch_children(word, lc)
+        return self._children(word, lc)
+
+    async def _fetch_children_batch(
+        self, parents: list[tuple[str, str]]
+    ) -> dict[tuple[str, str], list[tuple]]:
+        if self._first_ancestor_types() is not None:
+            return await super()._fetch_children_batch(parents)
+        return {(lc, word): self._children(word, lc) for lc, word in dict.fromkeys(parents)}
+
+    async def _cognates_of(self, keys: list[tuple[str, str]]) -> list[list[dict]]:
+        cognates: list[list[dict]] = []
+        unknown: list[int] = []
+        for word, lang in keys:
+            known, node = self._doc_node(word, lang)
+            if not known:
+                unknown.append(len(cognates))
+            neighbors = self.csr.neighbors("cog", node) if node is not None else []
+            cognates.append([self.csr.record(target, edge_type) for target, edge_type in neighbors])
+        if unknown:
+            from_docs = await super()._cognates_of([keys[i] for i in unknown])
+            for i, node_cognates in zip(unknown, from_docs, strict=True):
+                cognates[i] = node_cognates
+        return cognates
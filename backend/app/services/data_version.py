@@ -0,0 +1,54 @@
+"""Data version stamp for invalidating process-wide caches after a reload.
+
+The ETL writes a fresh version into ``meta/{_id: "data_version"}`` whenever it
+changes the words collection or a derived collection (``etl.load`` and the
+precompute stages call :func:`stamp`). Request-path caches compare the version
+they were filled under with :func:`current` and drop their entries when it
+moves. ``current`` re-reads the stamp at most every ``RECHECK_SECONDS`` so the
+check costs nothing per request; a reload is therefore picked up within that
+window.
+"""
+
+from __future__ import annotations
+
+import time
+import uuid
+from datetime import UTC, datetime
+from typing import Any
+
+COLLECTION = "meta"
+DOC_ID = "data_version"
+RECHECK_SECONDS = 30.0
+
+# Reported when no ETL stage has stamped the database yet.
+UNVERSIONED = "unversioned"
+
+_state: dict[str, Any] = {"version": None, "checked_at": 0.0}
+
+
+async def current(db: Any) -> str:
+    """Return the current data version, re-reading the stamp when it is stale."""
+    now = time.monotonic()
+    if _state["version"] is not None and now - _state["checked_at"] < RECHECK_SECONDS:
+        return _state["version"]
+    doc = await db[COLLECTION].find_one({"_id": DOC_ID})
+    _state["version"] = (doc or {}).get("version", UNVERSIONED)
+    _state["checked_at"] = now
+    return _state["version"]
+
+
+def reset() -> None:
+    """Forget the remembered version so the next ``current`` re-reads it."""
+    _state["version"] = None
+    _state["checked_at"] = 0.0
+
+
+def stamp(db: Any) -> str:
+    """Write a new data version (sync pymongo, for ETL scripts) and return it."""
+    version = uuid.uuid4().hex
+    db[COLLECTION].replace_one(
+        {"_id": DOC_ID},
+        {"_id": DOC_ID, "version": version, "stamped_at": datetime.now(tz=UTC)},
+        upsert=True,
+    )
+    return version
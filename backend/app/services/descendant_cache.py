@@ -0,0 +1,61 @@
+"""Process-wide LRU of immediate-children lists for descendant expansion.
+
+Searches that climb to a shared ancestor (wine, vine and vinegar all reach
+Latin vinum) re-expand the same descendant subtree. A subtree is the
+transitive closure of one pure step — a parent's capped, sorted reverse lookup
+reduced to its immediate children — so that step is what is cached, keyed by
+``(descendant_source, allowed_types, lang_code, word)``. With every child list
+below a node cached, re-expanding its subtree issues no queries, at whatever
+depth or in whichever descendant mode it is reached.
+
+What the builder *does* with a child list (edge dedup, levels,
+``skip_descendant_ids``) depends on the request, so it is not cached. Entries
+are bounded by ``settings.descendant_cache_max_bytes`` and dropped when the
+data version changes.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from app.config import settings
+from app.services import data_version
+from app.services.lru import LRUCache
+
+if TYPE_CHECKING:
+    from motor.motor_asyncio import AsyncIOMotorCollection
+
+# (descendant_source, sorted allowed types, parent lang_code, parent word)
+CacheKey = tuple[str, tuple[str, ...], str, str]
+
+_cache = LRUCache(settings.descendant_cache_max_bytes)
+_state: dict[str, Any] = {"version": None}
+
+
+async def sync_version(col: AsyncIOMotorCollection) -> None:
+    """Empty the cache if the data version moved since it was filled."""
+    version = await data_version.current(col.database)
+    if version != _state["version"]:
+        _cache.clear()
+        _state["version"] = version
+
+
+def lookup(key: CacheKey) -> Any:
+    """Return the cached child list for ``key`` or ``lru.MISSING``."""
+    return _cache.get(key)
+
+
+def store(key: CacheKey, children: list[tuple]) -> None:
+    """Cache a parent's (word, lang, lang_code, edge_type) child tuples."""
+    _cache.put(key, children)
+
+
+def stats() -> dict:
+    """Return size and hit-ratio counters."""
+    return {**_cache.stats(), "data_version": _state["version"]}
+
+
+def reset() -> None:
+    """Drop all entries and counters (tests)."""
+    _cache.reset()
+    _state["version"] = None
@@ -0,0 +1,196 @@
+"""Compact, integer-interned graph storage behind TreeBuilder.
+
+A built tree used to hold one dict per node, an f-string ``"word:lang"`` id per
+node and edge endpoint, one dict per edge and a set of ``(from_id, to_id)``
+tuples for dedup. For multi-thousand-node cognate graphs that is several
+Python objects per element, all of which are rebuilt again at the response
+boundary anyway.
+
+Here every string (word, language, edge label) is interned once in a
+:class:`StringTable`, and a graph *key* is a ``(word, lang)`` pair of string ids
+packed into one int. Per-key data lives in parallel ``array`` columns, edges in
+three more columns, and edge dedup is a set of packed ``(src, dst)`` key ints.
+The ``{id, label, language, level, uncertainty}`` / ``{from, to, label}`` dicts
+are only materialized by :meth:`GraphCore.node_dict` / :meth:`GraphCore.edge_dict`.
+
+Keys exist independently of nodes: an edge may be recorded before (or
+without) its endpoint being added as a node, as ``TreeBuilder.add_edge`` always
+allowed.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterator
+
+# Packing shift for two 32-bit ids in one int (word/lang, or src/dst key).
+_SHIFT = 32
+
+
+class StringTable:
+    """Bidirectional str <-> dense int id interning."""
+
+    __slots__ = ("_ids", "_strings")
+
+    def __init__(self):
+        self._ids: dict[str, int] = {}
+        self._strings: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def intern(self, value: str) -> int:
+        """Return the id of ``value``, assigning the next one if it is new."""
+        sid = self._ids.get(value)
+        if sid is None:
+            sid = len(self._strings)
+            self._ids[value] = sid
+            self._strings.append(value)
+        return sid
+
+    def get(self, value: str) -> int | None:
+        """Return the id of ``value`` without interning it."""
+        return self._ids.get(value)
+
+    def __getitem__(self, sid: int) -> str:
+        return self._strings[sid]
+
+
+class GraphCore:
+    """Interned node/edge store. Node order is first-``add_node`` order."""
+
+    __slots__ = (
+        "_edge_dst",
+        "_edge_label",
+        "_edge_seen",
+        "_edge_src",
+        "_is_node",
+        "_key_index",
+        "_key_lang",
+        "_key_level",
+        "_key_word",
+        "_node_order",
+        "_uncertainty",
+        "strings",
+    )
+
+    def __init__(self):
+        self.strings = StringTable()
+        self._key_index: dict[int, int] = {}
+        self._key_word = array("L")
+        self._key_lang = array("L")
+        self._key_level = array("l")
+        self._is_node = bytearray()
+        self._node_order = array("L")
+        # Sparse: only uncertain words carry a classification.
+        self._uncertainty: dict[int, dict] = {}
+        self._edge_src = array("L")
+        self._edge_dst = array("L")
+        self._edge_label = array("L")
+        self._edge_seen: set[int] = set()
+
+    # --- keys ---
+
+    def key(self, word: str, lang: str) -> int:
+        """Return the key of ``(word, lang)``, creating it if needed."""
+        packed = self.strings.intern(word) << _SHIFT | self.strings.intern(lang)
+        key = self._key_index.get(packed)
+        if key is None:
+            key = len(self._key_word)
+            self._key_index[packed] = key
+            self._key_word.append(packed >> _SHIFT)
+            self._key_lang.append(packed & ((1 << _SHIFT) - 1))
+            self._key_level.append(0)
+            self._is_node.append(0)
+        return key
+
+    def find_key(self, word: str, lang: str) -> int | None:
+        """Return the key of ``(word, lang)`` if it exists, without creating it."""
+        word_sid = self.strings.get(word)
+        lang_sid = self.strings.get(lang)
+        if word_sid is None or lang_sid is None:
+            return None
+        return self._key_index.get(word_sid << _SHIFT | lang_sid)
+
+    def word(self, key: int) -> str:
+        return self.strings[self._key_word[key]]
+
+    def lang(self, key: int) -> str:
+        return self.strings[self._key_lang[key]]
+
+    def node_id(self, key: int) -> str:
+        """The public ``"word:lang"`` id (``template_parser.node_id``) of ``key``."""
+        return f"{self.word(key)}:{self.lang(key)}"
+
+    # --- nodes ---
+
+    @property
+    def node_count(self) -> int:
+        return len(self._node_order)
+
+    def is_node(self, key: int) -> bool:
+        return bool(self._is_node[key])
+
+    def add_node(self, key: int, level: int, uncertainty: dict | None = None) -> bool:
+        """Make ``key`` a node at ``level``; returns False if it already was one."""
+        if self._is_node[key]:
+            return False
+        self._is_node[key] = 1
+        self._key_level[key] = level
+        self._node_order.append(key)
+        if uncertainty is not None:
+            self._uncertainty[key] = uncertainty
+        return True
+
+    def level(self, key: int) -> int:
+        return self._key_level[key]
+
+    def uncertainty(self, key: int) -> dict | None:
+        return self._uncertainty.get(key)
+
+    def set_uncertainty(self, key: int, uncertainty: dict) -> None:
+        self._uncertainty[key] = uncertainty
+
+    def node_keys(self, start: int = 0) -> Iterator[int]:
+        """Node keys in insertion order, from the ``start``-th node on."""
+        return iter(self._node_order[start:])
+
+    def node_dict(self, key: int) -> dict:
+        """Materialize the response shape of node ``key``."""
+        word = self.word(key)
+        lang = self.lang(key)
+        return {
+            "id": f"{word}:{lang}",
+            "label": word,
+            "language": lang,
+            "level": self._key_level[key],
+            "uncertainty": self._uncertainty.get(key),
+        }
+
+    # --- edges ---
+
+    @property
+    def edge_count(self) -> int:
+        return len(self._edge_src)
+
+    def add_edge(self, src: int, dst: int, label: str) -> bool:
+        """Record ``src -> dst`` unless that pair was seen; returns True if added."""
+        packed = src << _SHIFT | dst
+        if packed in self._edge_seen:
+            return False
+        self._edge_seen.add(packed)
+        self._edge_src.append(src)
+        self._edge_dst.append(dst)
+        self._edge_label.append(self.strings.intern(label))
+        return True
+
+    def edge_dict(self, index: int) -> dict:
+        """Materialize the response shape of the ``index``-th edge."""
+        return {
+            "from": self.node_id(self._edge_src[index]),
+            "to": self.node_id(self._edge_dst[index]),
+            "label": self.strings[self._edge_label[index]],
+        }
+
+    def edge_dicts(self, start: int = 0) -> list[dict]:
+        return [self.edge_dict(i) for i in range(start, self.edge_count)]
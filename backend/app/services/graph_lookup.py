@@ -0,0 +1,108 @@
+"""``$graphLookup`` tree engine: each descendant walk in one aggregation.
+
+``TreeBuilder`` asks Mongo for children parent by parent (recursive mode) or
+level by level (frontier mode). :class:`GraphLookupTreeBuilder` instead sends
+the roots of a descendant phase to Mongo once: a ``$graphLookup`` over the
+``tree_edges`` collection (built by ``etl.precompute_tree_edges`` from
+``primary_ancestor``) returns every edge reachable within
+``max_descendant_depth``. The builder then runs the usual recursive, frontier
+or best-first expansion against that in-memory subgraph, so levels, the
+per-parent cap, ``skip_descendant_ids``, budgets and progressive batches
+behave exactly as in the base class.
+
+Edge docs::
+
+    {parent: "lang_code:word", child: "lang_code:word", word, lang, lang_code,
+     type, subtree_size}
+
+with one doc per (parent, word, lang). Parents match the raw template word,
+so the engine reproduces ``DESCENDANT_SOURCE=primary_ancestor`` with all of
+inh/bor/der selected (a narrower filter drops the edges of other types rather
+than following ``first_ancestors``), with one more difference: the cap counts
+distinct children, not matched entries.
+``$graphLookup`` has no per-parent limit, so it also walks below children that
+the cap later drops. Its 100 MB stage memory limit bounds one walk.
+"""
+
+from __future__ import annotations
+
+from app.services.tree_builder import MAX_DESCENDANTS_PER_NODE, TreeBuilder
+
+COLLECTION = "tree_edges"
+
+
+def edge_key(lang_code: str, word: str) -> str:
+    """The ``parent`` / ``child`` key of a ``tree_edges`` doc."""
+    return f"{lang_code}:{word}"
+
+
+def _children_order(edge: dict) -> tuple:
+    # Mirrors _DESCENDANT_SORT: most prolific first, then alphabetical.
+    return (-(edge.get("subtree_size") or 0), edge["word"], edge["lang"])
+
+
+class GraphLookupTreeBuilder(TreeBuilder):
+    """TreeBuilder whose descendant lookups are served by one ``$graphLookup``
+    per descendant phase."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._subtree_children: dict[tuple[str, str], list[tuple]] = {}
+        self.graph_lookups = 0
+
+    async def _expand_descendants_from_chain(self, chain: list[tuple]):
+        roots = [
+            edge_key(anc_lc, anc_word)
+            for anc_word, anc_lang, anc_lc, _level in chain
+            if not self._skips_descendants(self.graph.key(anc_word, anc_lang))
+        ]
+        if roots and self.max_descendant_depth > 0:
+            await self._load_subtrees(roots)
+        await super()._expand_descendants_from_chain(chain)
+
+    async def _load_subtrees(self, roots: list[str]) -> None:
+        """Fetch every edge within ``max_descendant_depth`` of ``roots`` in one
+        aggregation and index the children per (lang_code, word) parent."""
+        edges_col = self.col.database[COLLECTION]
+        pipeline = [
+            {"$limit": 1},
+            {
+                "$graphLookup": {
+                    "from": COLLECTION,
+                    "startWith": roots,
+                    "connectFromField": "child",
+                    "connectToField": "parent",
+                    "as": "edges",
+                    "maxDepth": self.max_descendant_depth - 1,
+                    "restrictSearchWithMatch": {"type": {"$in": sorted(self.allowed_types)}},
+                }
+            },
+            {"$project": {"_id": 0, "edges": 1}},
+        ]
+        self.graph_lookups += 1
+        results = await edges_col.aggregate(pipeline).to_list(length=1)
+        edges = results[0]["edges"] if results else []
+
+        by_parent: dict[str, list[dict]] = {}
+        for edge in edges:
+            by_parent.setdefault(edge["parent"], []).append(edge)
+        for parent, parent_edges in by_parent.items():
+            lc, _, word = parent.partition(":")
+            if (lc, word) in self._subtree_children:
+                continue
+            parent_edges.sort(key=_children_order)
+            self._subtree_children[(lc, word)] = [
+                (edge["word"], edge["lang"], edge["lang_code"], edge["type"])
+                for edge in parent_edges[:MAX_DESCENDANTS_PER_NODE]
+            ]
+
+    async def _fetch_children(self, word: str, lc: str) -> list[tuple]:
+        return self._subtree_children.get((lc, word), [])
+
+    async def _fetch_children_batch(
+        self, parents: list[tuple[str, str]]
+    ) -> dict[tuple[str, str], list[tuple]]:
+        return {parent: self._subtree_children.get(parent, []) for parent in parents}
+
+    def meta(self) -> dict:
+        return {**super().meta(), "graph_lookups": self.graph_lookups}
@@ -0,0 +1,107 @@
+"""Byte-bounded LRU map shared by the process-wide read caches.
+
+The dataset is static between reloads, so the caches in front of Mongo never
+expire by time: entries leave only by size-based eviction (least recently used
+first) or by an explicit ``clear()`` when the data version changes. Sizes are a
+cheap structural estimate, not ``sys.getsizeof`` accounting — the budget is a
+guard against unbounded growth, not an exact RSS cap.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+# Returned by ``get`` on a miss, so a cached ``None`` (a known-missing word) is
+# distinguishable from "not cached".
+MISSING: Any = object()
+
+# Per-entry bookkeeping overhead (key tuple, OrderedDict node, size slot).
+_ENTRY_OVERHEAD = 64
+
+
+def approx_size(value: Any) -> int:
+    """Estimate the in-memory footprint of a JSON-shaped value in bytes."""
+    if isinstance(value, str):
+        return 49 + len(value)
+    if isinstance(value, bytes):
+        return 33 + len(value)
+    if isinstance(value, dict):
+        return 64 + sum(approx_size(k) + approx_size(v) for k, v in value.items())
+    if isinstance(value, list | tuple):
+        return 56 + sum(approx_size(v) for v in value)
+    return 28
+
+
+class LRUCache:
+    """An ``OrderedDict``-backed LRU bounded by the summed size of its entries.
+
+    Args:
+        max_bytes: Eviction threshold for the summed entry sizes. A single entry
+            larger than this is not cached at all.
+        sizeof: Size estimator applied to each stored value.
+    """
+
+    def __init__(self, max_bytes: int, sizeof: Callable[[Any], int] = approx_size):
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value (marking it most recently used) or ``MISSING``."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return MISSING
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Insert or replace ``key``, evicting least recently used entries to fit."""
+        size = self._sizeof(value) + _ENTRY_OVERHEAD
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.bytes -= old[1]
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (value, size)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _key, (_value, evicted_size) = self._entries.popitem(last=False)
+            self.bytes -= evicted_size
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept; they describe the process lifetime)."""
+        self._entries.clear()
+        self.bytes = 0
+
+    def reset(self) -> None:
+        """Drop every entry and zero the counters."""
+        self.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        """Return size and hit-ratio counters for the stats endpoint."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+        }
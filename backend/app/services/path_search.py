@@ -0,0 +1,146 @@
+"""Shortest etymological path between two words over the in-process CSR graph.
+
+Answering "how are X and Y connected" with ``TreeBuilder`` would take chains
+of expansions at one Mongo query per hop. Here the ``up`` / ``down``
+relations of :class:`app.services.csr_graph.CsrGraph` serve as an undirected
+adjacency over inh/bor/der/cog/component edges, and
+:func:`shortest_path` runs a bidirectional breadth-first search: it expands
+whichever side has the smaller frontier, one whole level at a time, and stops
+at the first level where the two searches meet, within a hop limit and a
+deadline.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+
+from app.services.csr_graph import CsrGraph
+from app.services.template_parser import COGNATE_TYPE, node_id, normalize_word
+from app.services.tree_builder import TRUNCATED_TIME_BUDGET
+
+PATH_TYPES = ("inh", "bor", "der", "cog", "component")
+DEFAULT_MAX_HOPS = 6
+
+# (source node, target node, edge type) of a graph edge, as drawn in a tree.
+Edge = tuple[int, int, str]
+
+
+@dataclass
+class PathResult:
+    """Outcome of :func:`shortest_path`."""
+
+    nodes: list[int] | None  # source ... target, None if no path was found
+    edges: list[Edge] = field(default_factory=list)  # edges[i] joins nodes[i], nodes[i + 1]
+    visited: int = 0
+    truncated_reason: str | None = None
+
+
+def find_node(graph: CsrGraph, word: str, lang: str) -> int | None:
+    """Node of (word, lang), trying the raw form before the normalized one."""
+    node = graph.node(word, lang)
+    normalized = normalize_word(word)
+    if node is None and normalized != word:
+        node = graph.node(normalized, lang)
+    return node
+
+
+def _neighbors(graph: CsrGraph, node: int, types: set[str]) -> Iterator[tuple[int, Edge]]:
+    for other, edge_type in graph.neighbors("up", node):
+        if edge_type in types:
+            yield other, (other, node, edge_type)
+    for other, edge_type in graph.neighbors("down", node):
+        if edge_type in types:
+            yield other, (node, other, edge_type)
+
+
+def shortest_path(
+    graph: CsrGraph,
+    source: int,
+    target: int,
+    types: set[str],
+    *,
+    max_hops: int = DEFAULT_MAX_HOPS,
+    deadline: float | None = None,
+) -> PathResult:
+    """Shortest path from ``source`` to ``target`` over edges of ``types``,
+    ignoring edge direction, of at most ``max_hops`` edges.
+
+    ``deadline`` (a ``time.monotonic()`` value) stops the search with
+    ``truncated_reason`` set and no path.
+    """
+    if source == target:
+        return PathResult([source], visited=1)
+    # Per side: node -> (previous node, edge to it, distance from that side's root).
+    reached: tuple[dict[int, tuple], dict[int, tuple]] = (
+        {source: (None, None, 0)},
+        {target: (None, None, 0)},
+    )
+    frontiers = ([source], [target])
+    depths = [0, 0]
+    while frontiers[0] and frontiers[1] and sum(depths) < max_hops:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        seen, other = reached[side], reached[1 - side]
+        next_frontier = []
+        meet = None
+        for node in frontiers[side]:
+            if deadline is not None and time.monotonic() >= deadline:
+                return PathResult(
+                    None, visited=len(seen) + len(other), truncated_reason=TRUNCATED_TIME_BUDGET
+                )
+            for neighbor, edge in _neighbors(graph, node, types):
+                if neighbor in seen:
+                    continue
+                seen[neighbor] = (node, edge, depths[side] + 1)
+                next_frontier.append(neighbor)
+                if neighbor in other and (meet is None or other[neighbor][2] < other[meet][2]):
+                    meet = neighbor
+        depths[side] += 1
+        frontiers[side][:] = next_frontier
+        if meet is not None:
+            return _join(reached, meet)
+    return PathResult(None, visited=len(reached[0]) + len(reached[1]))
+
+
+def _join(reached: tuple[dict[int, tuple], dict[int, tuple]], meet: int) -> PathResult:
+    """Path through ``meet`` from both sides' back-pointers."""
+    nodes = [meet]
+    edges: list[Edge] = []
+    node = meet
+    while (step := reached[0][node])[0] is not None:
+        node = step[0]
+        nodes.append(node)
+        edges.append(step[1])
+    nodes.reverse()
+    edges.reverse()
+    node = meet
+    while (step := reached[1][node])[0] is not None:
+        node = step[0]
+        nodes.append(node)
+        edges.append(step[1])
+    return PathResult(nodes, edges, visited=len(reached[0]) + len(reached[1]))
+
+
+def path_graph(graph: CsrGraph, result: PathResult) -> dict:
+    """``{nodes, edges}`` of a found path in the tree response shape. The
+    source is level 0; following an edge to a child goes one level down,
+    against it one level up, and cognates stay on the same level."""
+    nodes = []
+    level = 0
+    for i, node in enumerate(result.nodes or []):
+        if i:
+            source, _target, edge_type = result.edges[i - 1]
+            if edge_type != COGNATE_TYPE:
+                level += 1 if source == result.nodes[i - 1] else -1
+        word, lang = graph.word(node), graph.lang(node)
+        nodes.append({"id": node_id(word, lang), "label": word, "language": lang, "level": level})
+    edges = [
+        {
+            "from": node_id(graph.word(source), graph.lang(source)),
+            "to": node_id(graph.word(target), graph.lang(target)),
+            "label": edge_type,
+        }
+        for source, target, edge_type in result.edges
+    ]
+    return {"nodes": nodes, "edges": edges}
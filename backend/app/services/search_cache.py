@@ -0,0 +1,97 @@
+"""Process-wide LRU of ``/search`` responses, with prefix narrowing.
+
+Autocomplete sends "w", "wi", "win", "wine" in quick succession. Two caches
+sit in front of the ``words`` collection:
+
+- responses, keyed by ``(q, limit, mode)``: a repeated query is answered
+  whole, with no queries at all
+- complete prefix matches, keyed by the prefix: when the case-sensitive
+  prefix scan for ``q`` returns fewer rows than it asked for, it fetched
+  every entry whose word starts with ``q``. Any longer query is then answered
+  by filtering those rows in memory (:func:`narrow`); they are already in
+  index order, so the exact and prefix row sets come out as Mongo would
+  return them.
+
+Each cache is bounded by half of ``settings.search_cache_max_bytes``, and both
+are emptied when the data version changes. Cached responses are shared
+between requests and must be treated as read-only.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from app.config import settings
+from app.services import data_version
+from app.services.lru import LRUCache
+
+if TYPE_CHECKING:
+    from motor.motor_asyncio import AsyncIOMotorCollection
+
+# (q, limit, mode)
+CacheKey = tuple[str, int, str]
+
+_responses = LRUCache(settings.search_cache_max_bytes // 2)
+_prefix_rows = LRUCache(settings.search_cache_max_bytes // 2)
+_state: dict[str, Any] = {"version": None, "narrowed": 0}
+
+
+async def sync_version(col: AsyncIOMotorCollection) -> None:
+    """Empty both caches if the data version moved since they were filled."""
+    version = await data_version.current(col.database)
+    if version != _state["version"]:
+        _responses.clear()
+        _prefix_rows.clear()
+        _state["version"] = version
+
+
+def lookup(key: CacheKey) -> Any:
+    """Return the cached response for ``key`` or ``lru.MISSING``."""
+    return _responses.get(key)
+
+
+def store(key: CacheKey, response: dict) -> None:
+    """Cache a ``/search`` response."""
+    _responses.put(key, response)
+
+
+def store_prefix_rows(prefix: str, rows: list[dict]) -> None:
+    """Cache the ``{word, lang, pos}`` rows of *every* entry whose word starts
+    with ``prefix``, in index order."""
+    _prefix_rows.put(prefix, rows)
+
+
+def narrow(q: str) -> list[dict] | None:
+    """Rows of every entry whose word starts with ``q``, filtered from the
+    cached complete rows of the longest prefix of ``q`` that has them; None if
+    no prefix does."""
+    for end in range(len(q), 0, -1):
+        prefix = q[:end]
+        if prefix not in _prefix_rows:
+            continue
+        rows = _prefix_rows.get(prefix)
+        if end < len(q):
+            rows = [r for r in rows if r["word"].startswith(q)]
+            _prefix_rows.put(q, rows)
+        _state["narrowed"] += 1
+        return rows
+    return None
+
+
+def stats() -> dict:
+    """Return response hit-ratio counters and how many misses were narrowed."""
+    return {
+        **_responses.stats(),
+        "narrowed": _state["narrowed"],
+        "prefix_sets": len(_prefix_rows),
+        "prefix_bytes": _prefix_rows.bytes,
+        "data_version": _state["version"],
+    }
+
+
+def reset() -> None:
+    """Drop all entries and counters (tests)."""
+    _responses.reset()
+    _prefix_rows.reset()
+    _state["version"] = None
+    _state["narrowed"] = 0
@@ -0,0 +1,141 @@
+"""In-process prefix index for ``/search`` autocomplete (``SEARCH_SOURCE=index``).
+
+``/search`` answers each keystroke with an exact ``find`` and an anchored
+``$regex`` prefix scan over the ``word`` index. ``etl.export_search_index``
+writes the same rows once into a directory::
+
+    strings.blob.npy / strings.offsets.npy  sorted table of words, langs, pos
+    rows.word.npy / rows.lang.npy           int32 string ids
+    rows.pos.npy                            int32 string id, -1 when missing
+    rows.etym.npy                           int32 etymology_number, -1 when missing
+
+one row per words entry, ordered by word with ties in natural order: the
+order the ``word`` index returns them in (both queries hint it). String ids
+are ranks in code point order (:mod:`app.services.string_table`), so the rows
+matching a word or a prefix are one contiguous slice found by binary search, and
+:meth:`SearchIndex.exact` / :meth:`SearchIndex.prefix` return what the two
+Mongo queries would, without a round trip.
+"""
+
+from __future__ import annotations
+
+import bisect
+import sys
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+
+from app.services.string_table import MappedStringTable, write_string_table
+
+# Index both /search queries hint. The (word, lang) index would also serve
+# them, but orders one word's entries by language rather than natural order.
+WORD_INDEX = [("word", 1)]
+
+_MISSING = -1
+_LAST_CODE_POINT = sys.maxunicode
+
+_state: dict[str, SearchIndex | None] = {"index": None}
+
+
+def prefix_end(prefix: str) -> str | None:
+    """Smallest string greater than every string starting with ``prefix``
+    (None if there is none)."""
+    stripped = prefix.rstrip(chr(_LAST_CODE_POINT))
+    if not stripped:
+        return None
+    return stripped[:-1] + chr(ord(stripped[-1]) + 1)
+
+
+def write_search_index(directory: Path, entries: Iterable[dict]) -> int:
+    """Write the index of ``entries`` (``{word, lang, pos?, etymology_number?}``
+    in natural order) into ``directory``; return the row count."""
+    directory.mkdir(parents=True, exist_ok=True)
+    rows = sorted(
+        ((e["word"], e["lang"], e.get("pos"), e.get("etymology_number")) for e in entries),
+        key=lambda row: row[0],
+    )
+    ids = write_string_table(
+        directory,
+        "strings",
+        (value for row in rows for value in row[:3] if value is not None),
+    )
+    columns = {
+        "word": [ids[row[0]] for row in rows],
+        "lang": [ids[row[1]] for row in rows],
+        "pos": [_MISSING if row[2] is None else ids[row[2]] for row in rows],
+        "etym": [_MISSING if row[3] is None else row[3] for row in rows],
+    }
+    for name, values in columns.items():
+        np.save(directory / f"rows.{name}.npy", np.array(values, dtype=np.int32))
+    return len(rows)
+
+
+class SearchIndex:
+    """Read-only view of an index written by :func:`write_search_index`."""
+
+    def __init__(self, directory: Path):
+        self._strings = MappedStringTable.open(directory, "strings")
+        self._word, self._lang, self._pos, self._etym = (
+            np.load(directory / f"rows.{name}.npy", mmap_mode="r")
+            for name in ("word", "lang", "pos", "etym")
+        )
+
+    def _row(self, i: int) -> dict:
+        row = {"word": self._strings[self._word[i]], "lang": self._strings[self._lang[i]]}
+        if (pos := int(self._pos[i])) != _MISSING:
+            row["pos"] = self._strings[pos]
+        return row
+
+    def _rows(self, lo_sid: int, hi_sid: int) -> range:
+        """Row positions whose word id is in [lo_sid, hi_sid)."""
+        return range(
+            int(np.searchsorted(self._word, lo_sid, "left")),
+            int(np.searchsorted(self._word, hi_sid, "left")),
+        )
+
+    def exact(self, word: str, limit: int) -> list[dict]:
+        """``{word, lang, pos}`` of the first ``limit`` entries of ``word``."""
+        sid = self._strings.find(word)
+        if sid is None:
+            return []
+        return [self._row(i) for i in self._rows(sid, sid + 1)[:limit]]
+
+    def prefix(self, prefix: str, limit: int) -> list[dict]:
+        """``{word, lang, pos}`` of the first ``limit`` entries whose word
+        starts with ``prefix``, in word order."""
+        end = prefix_end(prefix)
+        lo = bisect.bisect_left(self._strings, prefix)
+        hi = len(self._strings) if end is None else bisect.bisect_left(self._strings, end)
+        return [self._row(i) for i in self._rows(lo, hi)[:limit]]
+
+    def has_etymologies(self, word: str, lang: str) -> bool:
+        """Whether (word, lang) has entries with two or more distinct
+        ``etymology_number`` values."""
+        sid, lang_sid = self._strings.find(word), self._strings.find(lang)
+        if sid is None or lang_sid is None:
+            return False
+        rows = self._rows(sid, sid + 1)
+        langs = self._lang[rows.start : rows.stop]
+        etyms = self._etym[rows.start : rows.stop][langs == lang_sid]
+        return len(set(etyms[etyms != _MISSING].tolist())) >= 2
+
+
+def load(directory: str | Path) -> SearchIndex:
+    """Map the index exported into ``directory`` and make it the process-wide one."""
+    index = _state["index"] = SearchIndex(Path(directory))
+    return index
+
+
+def reset() -> None:
+    """Forget the process-wide index."""
+    _state["index"] = None
+
+
+def loaded() -> SearchIndex:
+    """The process-wide index mapped by :func:`load`."""
+    index = _state["index"]
+    if index is None:
+        msg = "Search index is not loaded; run `make export-search-index`, SEARCH_SOURCE=index"
+        raise RuntimeError(msg)
+    return index
@@ -0,0 +1,65 @@
+"""Sorted, memory-mapped string table for ETL-built in-process indexes.
+
+:class:`app.services.graph_core.StringTable` interns strings per request in
+insertion order. The offline exports (``etl.export_csr_graph``) instead
+write every string once, sorted in code point order, as two ``.npy`` files
+in a directory::
+
+    {name}.blob.npy     uint8, the UTF-8 encoded strings back to back
+    {name}.offsets.npy  int64, len + 1 byte offsets into the blob
+
+A string's id is its rank, so comparing ids compares strings and
+:meth:`MappedStringTable.find` is a binary search. Both files are opened
+with ``mmap_mode="r"``: loading costs no parsing, and worker processes
+share the pages.
+"""
+
+from __future__ import annotations
+
+import bisect
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+
+import numpy as np
+
+
+class MappedStringTable(Sequence[str]):
+    """Read-only sorted string table; ``table[sid]`` decodes one string."""
+
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray):
+        self._blob = blob
+        self._offsets = offsets
+
+    @classmethod
+    def open(cls, directory: Path, name: str) -> MappedStringTable:
+        """Map the table ``name`` written by :func:`write_string_table`."""
+        return cls(
+            np.load(directory / f"{name}.blob.npy", mmap_mode="r"),
+            np.load(directory / f"{name}.offsets.npy", mmap_mode="r"),
+        )
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, sid):
+        if isinstance(sid, slice):
+            return [self[i] for i in range(*sid.indices(len(self)))]
+        start, end = int(self._offsets[sid]), int(self._offsets[sid + 1])
+        return self._blob[start:end].tobytes().decode()
+
+    def find(self, value: str) -> int | None:
+        """Return the id of ``value``, or None if the table does not hold it."""
+        sid = bisect.bisect_left(self, value)
+        return sid if sid < len(self) and self[sid] == value else None
+
+
+def write_string_table(directory: Path, name: str, strings: Iterable[str]) -> dict[str, int]:
+    """Write the distinct ``strings`` as table ``name``; return their ids."""
+    ordered = sorted(set(strings))
+    encoded = [value.encode() for value in ordered]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(data) for data in encoded], out=offsets[1:])
+    blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    np.save(directory / f"{name}.blob.npy", blob)
+    np.save(directory / f"{name}.offsets.npy", offsets)
+    return {value: sid for sid, value in enumerate(ordered)}
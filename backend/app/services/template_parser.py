@@ -14,6 +14,20 @@ COGNATE_TYPE = "cog"
 # etymology_classifier.AFFIX_TEMPLATES's suf/suffix, pre/prefix aliasing.
 ANCESTRY_TYPE_ALIASES = {"derived": "der"}
 
+# Templates naming a word inside a Kaikki ``descendants`` entry (1=lang, 2=word).
+DESCENDANT_TEMPLATES = {"desc", "desctree", "l"}
+# ``desc`` flags that mark a non-inherited link; an unflagged entry is inherited.
+DESCENDANT_LINK_FLAGS = {
+    "bor": "bor",
+    "lbor": "bor",
+    "slb": "bor",
+    "der": "der",
+    "clq": "der",
+    "calque": "der",
+    "pclq": "der",
+    "sml": "der",
+}
+
 
 def expand_ancestry_types(types: set[str]) -> set[str]:
     """Expand canonical ancestry types to include their raw Kaikki template aliases."""
@@ -35,6 +49,12 @@ def normalize_word(word: str) -> str:
     return "".join(c for c in decomposed if unicodedata.category(c) != "Mn")
 
 
+def fold_word(word: str) -> str:
+    """Case- and diacritic-insensitive search key: casefold, then
+    :func:`normalize_word` (Rome, rome → rome; vīnum → vinum)."""
+    return normalize_word(word.casefold())
+
+
 def node_id(word: str, lang: str) -> str:
     return f"{word}:{lang}"
 
@@ -64,6 +84,48 @@ def extract_ancestry(doc: dict, allowed_types: set[str] | None = None) -> list[d
     return ancestry
 
 
+def primary_ancestor(doc: dict) -> dict | None:
+    """Return the document's first ancestry template as a compact lookup record.
+
+    This is the denormalized ``primary_ancestor`` field the ETL stores per word
+    (see ``etl.precompute_ancestors``): the immediate parent over *all* ancestry
+    types, so descendant lookups become an indexed equality match instead of an
+    ``$elemMatch`` over the whole templates array plus a Python re-check.
+    """
+    ancestry = extract_ancestry(doc)
+    if not ancestry:
+        return None
+    first = ancestry[0]
+    return {
+        "type": first["type"],
+        "lang_code": first["lang_code"],
+        "word": first["word"],
+        "word_normalized": normalize_word(first["word"]),
+    }
+
+
+def first_ancestors(doc: dict) -> dict[str, dict]:
+    """Return the document's first ancestry template of each type, keyed by type.
+
+    This is the denormalized ``first_ancestors`` field stored next to
+    ``primary_ancestor``. ``rank`` is the template's position in the document's
+    ancestry, so the immediate parent under a type filter is the lowest-ranked
+    record among the selected types, as :func:`extract_ancestry` would give.
+    """
+    firsts: dict[str, dict] = {}
+    for rank, ancestor in enumerate(extract_ancestry(doc)):
+        firsts.setdefault(
+            ancestor["type"],
+            {
+                "lang_code": ancestor["lang_code"],
+                "word": ancestor["word"],
+                "word_normalized": normalize_word(ancestor["word"]),
+                "rank": rank,
+            },
+        )
+    return firsts
+
+
 def extract_cognates(doc: dict) -> list[dict]:
     """Extract cognate relationships from a document."""
     cognates = []
@@ -83,3 +145,62 @@ def extract_cognates(doc: dict) -> list[dict]:
             }
         )
     return cognates
+
+
+def _descendant_entry_words(entry: dict) -> list[dict]:
+    """The (lang_code, word, type) records named by one ``descendants`` entry."""
+    records = []
+    for tmpl in entry.get("templates", []):
+        if tmpl.get("name") not in DESCENDANT_TEMPLATES:
+            continue
+        args = tmpl.get("args", {})
+        lang_code = args.get("1", "")
+        word = args.get("2", "")
+        if not word or not lang_code or word == "-":
+            continue
+        edge_type = next(
+            (kind for flag, kind in DESCENDANT_LINK_FLAGS.items() if args.get(flag)), "inh"
+        )
+        records.append({"lang_code": lang_code, "word": word, "type": edge_type})
+    return records
+
+
+def descendant_edges(doc: dict) -> list[dict]:
+    """Flatten a Kaikki entry's ``descendants`` list into parent -> child edges.
+
+    Entries are a pre-order walk of the Wiktionary descendants tree, nested by
+    ``depth``: an entry's parent is the nearest earlier entry of smaller depth
+    that names a word, or the entry itself at the top. Entries naming no word
+    (language group headings) pass their parent through to their children.
+
+    Returns ``{parent_lang_code, parent_word, lang_code, word, type}`` records,
+    with ``parent_word`` normalized (``normalize_word``) since ancestors are
+    looked up in template form. Duplicate (parent, child) pairs are dropped.
+    """
+    root = (doc.get("lang_code", ""), doc.get("word", ""))
+    if not all(root):
+        return []
+    stack: list[tuple[int, tuple[str, str]]] = []
+    edges = []
+    seen = set()
+    for entry in doc.get("descendants", []):
+        depth = entry.get("depth", 1)
+        while stack and stack[-1][0] >= depth:
+            stack.pop()
+        parent = stack[-1][1] if stack else root
+        words = _descendant_entry_words(entry)
+        for record in words:
+            key = (parent, record["lang_code"], record["word"])
+            if key in seen:
+                continue
+            seen.add(key)
+            edges.append(
+                {
+                    "parent_lang_code": parent[0],
+                    "parent_word": normalize_word(parent[1]),
+                    **record,
+                }
+            )
+        first = (words[0]["lang_code"], words[0]["word"]) if words else parent
+        stack.append((depth, first))
+    return edges
@@ -1,8 +1,18 @@
 """TreeBuilder: holds shared graph state and exposes methods for building etymology trees."""
 
-from app.services import lang_cache
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from collections.abc import Callable, Iterator, Mapping
+
+from app.services import chains, descendant_cache, lang_cache, word_cache, word_links
 from app.services.etymology_classifier import classify_etymology, extract_word_mentions
+from app.services.graph_core import GraphCore
+from app.services.lru import MISSING
 from app.services.template_parser import (
+    ANCESTRY_TYPES,
     expand_ancestry_types,
     extract_ancestry,
     extract_cognates,
@@ -11,81 +21,410 @@ from app.services.template_parser import (
 )
 
 MAX_DESCENDANTS_PER_NODE = 50
+# Parents per batched reverse-lookup aggregation: each is one capped
+# ``$unionWith`` sub-pipeline, well under Mongo's pipeline length limit.
+MAX_BATCH_PARENTS = 200
 DEFAULT_MAX_COGNATE_ROUNDS = 2
+# Per-request cap on in-flight word lookups issued by one fan-out, so a wide
+# cognate round overlaps its round trips without flooding the Motor pool.
+MAX_CONCURRENT_LOOKUPS = 8
+
+# "recursive" issues one reverse lookup per node, depth-first; "frontier" issues
+# one lookup per BFS level for every parent on that level at once.
+DESCENDANT_MODES = ("recursive", "frontier")
+
+# Values of TreeBuilder.truncated_reason, by the budget that stopped expansion.
+TRUNCATED_MAX_NODES = "max_nodes"
+TRUNCATED_TIME_BUDGET = "time_budget"
+
+# Where reverse lookups read parent links from: "templates" scans
+# etymology_templates via $elemMatch and re-checks the immediate parent in
+# Python; "primary_ancestor" is an indexed equality match on the field
+# precomputed by `etl.precompute_ancestors`; "kaikki" reads the curated
+# Wiktionary descendants trees, flattened by `etl.precompute_descendants` into
+# the DESCENDANT_EDGES collection, matching parents by normalized word.
+DESCENDANT_SOURCES = ("templates", "primary_ancestor", "kaikki")
+DESCENDANT_EDGES = "descendant_edges"
+
+# Where expand_word reads a word's ancestor chain from: "templates" parses the
+# word doc; "chains" is one indexed read of the doc precomputed by
+# `etl.precompute_chains` (ancestry resolved, uncertainty classified).
+CHAIN_SOURCES = ("templates", "chains")
+
+# How expand_cognates discovers cognates: "rounds" reads the cog templates of
+# every node, one doc lookup per node per round; "components" reads whole
+# cognate components union-found by `etl.precompute_cognate_sets` (the
+# `cognate_set` id on word docs and the COGNATE_LINKS collection), one links
+# query per round however many nodes there are.
+COGNATE_MODES = ("rounds", "components")
+COGNATE_LINKS = "cognate_links"
+# Links read per components round; a round that hits it is cut short.
+MAX_COGNATE_SET_LINKS = 2000
+_COGNATE_LINK_SORT = [("cognate_set", 1), ("seq", 1)]
+_COGNATE_LINK_PROJECTION = {"_id": 0, "from_word": 1, "from_lang": 1, "to_word": 1, "to_lang": 1}
+
+# word_cache projection class for docs fetched with _WORD_DOC_PROJECTION.
+_WORD_CACHE_CLASS = "tree"
+# word_cache class of chain docs found with find_chain(..., etym_fallback=True).
+_CHAIN_CACHE_CLASS = "tree_chain"
+# Union of every projection TreeBuilder reads a word doc with (expand_word,
+# compound tracing, cognate rounds, mention existence checks), so the doc memo
+# fetches each (word, lang) once and serves all of them.
+_WORD_DOC_PROJECTION = {
+    "_id": 0,
+    "word": 1,
+    "lang": 1,
+    "etymology_templates": 1,
+    "etymology_text": 1,
+    "cognate_set": 1,
+}
+
+_DESCENDANT_PROJECTIONS = {
+    "templates": {"_id": 0, "word": 1, "lang": 1, "lang_code": 1, "etymology_templates": 1},
+    "primary_ancestor": {
+        "_id": 0,
+        "word": 1,
+        "lang": 1,
+        "lang_code": 1,
+        "primary_ancestor": 1,
+        "first_ancestors": 1,
+    },
+    "kaikki": {
+        "_id": 0,
+        "word": 1,
+        "lang": 1,
+        "lang_code": 1,
+        "parent_lang_code": 1,
+        "parent_word": 1,
+        "type": 1,
+    },
+}
+# Sort operates on the full doc pre-projection, so word/lang dedup order and which
+# docs survive the cap are both deterministic across runs (content-based tie-break,
+# never _id — that changes across data reloads). SPC-00021 R1. The cap keeps the
+# most prolific children first: subtree_size is precomputed by
+# `etl.precompute_subtree_sizes` (until then it is absent everywhere and the
+# order is alphabetical).
+_DESCENDANT_SORT = [
+    ("subtree_size", -1),
+    ("word", 1),
+    ("lang", 1),
+    ("pos", 1),
+    ("etymology_number", 1),
+]
+# Edge docs are unique per (parent, word, lang), so that prefix is a total order.
+_DESCENDANT_EDGE_SORT = [("word", 1), ("lang", 1)]
+
+
+class NodeView(Mapping):
+    """``{node_id: node dict}`` over a :class:`GraphCore`, in insertion order.
+
+    Dicts are built per access, so mutating one does not change the graph.
+    """
+
+    def __init__(self, graph: GraphCore):
+        self._graph = graph
+
+    def _key(self, nid: str) -> int | None:
+        word, _, lang = nid.rpartition(":")
+        key = self._graph.find_key(word, lang)
+        return key if key is not None and self._graph.is_node(key) else None
+
+    def __getitem__(self, nid: str) -> dict:
+        key = self._key(nid)
+        if key is None:
+            raise KeyError(nid)
+        return self._graph.node_dict(key)
+
+    def __contains__(self, nid: object) -> bool:
+        return isinstance(nid, str) and self._key(nid) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return (self._graph.node_id(key) for key in self._graph.node_keys())
+
+    def __len__(self) -> int:
+        return self._graph.node_count
 
 
 class TreeBuilder:
     def __init__(
-        self, col, allowed_types: set[str], max_ancestor_depth: int, max_descendant_depth: int
+        self,
+        col,
+        allowed_types: set[str],
+        max_ancestor_depth: int,
+        max_descendant_depth: int,
+        *,
+        descendant_mode: str = "recursive",
+        descendant_source: str = "templates",
+        on_batch: Callable[[str, dict], None] | None = None,
+        max_nodes: int | None = None,
+        time_budget_ms: float | None = None,
+        link_resolution: bool = False,
+        chain_source: str = "templates",
+        cognate_mode: str = "rounds",
     ):
+        if descendant_mode not in DESCENDANT_MODES:
+            msg = f"descendant_mode must be one of {DESCENDANT_MODES}, got {descendant_mode!r}"
+            raise ValueError(msg)
+        if descendant_source not in DESCENDANT_SOURCES:
+            msg = (
+                f"descendant_source must be one of {DESCENDANT_SOURCES}, got {descendant_source!r}"
+            )
+            raise ValueError(msg)
+        if chain_source not in CHAIN_SOURCES:
+            msg = f"chain_source must be one of {CHAIN_SOURCES}, got {chain_source!r}"
+            raise ValueError(msg)
+        if cognate_mode not in COGNATE_MODES:
+            msg = f"cognate_mode must be one of {COGNATE_MODES}, got {cognate_mode!r}"
+            raise ValueError(msg)
         self.col = col
         self.allowed_types = allowed_types
         self.max_ancestor_depth = max_ancestor_depth
         self.max_descendant_depth = max_descendant_depth
-        self.nodes: dict[str, dict] = {}
-        self.edges: list[dict] = []
-        self.visited_edges: set[tuple] = set()
+        self.descendant_mode = descendant_mode
+        self.descendant_source = descendant_source
+        # Single-lookup path through the precomputed word_links table.
+        self.link_resolution = link_resolution
+        self.chain_source = chain_source
+        self.cognate_mode = cognate_mode
+        # Interned storage; `nodes` / `edges` materialize the response shape.
+        self.graph = GraphCore()
         self.skip_descendant_ids: set[str] = set()
+        self._lookup_slots = asyncio.Semaphore(MAX_CONCURRENT_LOOKUPS)
+        # Request-scoped word doc memo keyed by (word, lang, etym). Values are
+        # tasks so concurrent lookups of one key share a single fetch; misses
+        # (None, after the normalized fallback) are memoized too.
+        self._doc_memo: dict[tuple[str, str, int | None], asyncio.Future] = {}
+        self.memo_hits = 0
+        self.memo_misses = 0
+        # Progressive output: on_batch(phase, batch) is called at phase
+        # boundaries with the nodes/edges added (or updated) since the last call.
+        self.on_batch = on_batch
+        self._drained_nodes = 0
+        self._drained_edges = 0
+        self._updated_keys: set[int] = set()
+        # Budgets: once either is hit, all further expansion stops and the
+        # result is marked truncated. The searched word's ancestor chain is
+        # always included. With a budget set, descendants expand best-first.
+        self.max_nodes = max_nodes
+        self.time_budget_ms = time_budget_ms
+        self._deadline = (
+            time.monotonic() + time_budget_ms / 1000 if time_budget_ms is not None else None
+        )
+        self.truncated_reason: str | None = None
+
+    @property
+    def nodes(self) -> NodeView:
+        """Read-only ``{node_id: node dict}`` view, materialized on access."""
+        return NodeView(self.graph)
+
+    @property
+    def edges(self) -> list[dict]:
+        """The edge dicts, materialized on access."""
+        return self.graph.edge_dicts()
 
     def add_node(self, word: str, lang: str, level: int, uncertainty: dict | None = None) -> str:
         """Add or update a node in the graph, returning its ID."""
-        nid = node_id(word, lang)
-        if nid not in self.nodes:
-            self.nodes[nid] = {
-                "id": nid,
-                "label": word,
-                "language": lang,
-                "level": level,
-                "uncertainty": uncertainty,
-            }
-        elif uncertainty and self.nodes[nid].get("uncertainty") is None:
+        self._add_node(word, lang, level, uncertainty)
+        return node_id(word, lang)
+
+    def _add_node(self, word: str, lang: str, level: int, uncertainty: dict | None = None) -> int:
+        """``add_node`` on graph keys: add or update a node, returning its key."""
+        key = self.graph.key(word, lang)
+        if self.graph.add_node(key, level, uncertainty):
+            return key
+        if uncertainty and self.graph.uncertainty(key) is None:
             # Update uncertainty if we have it now but didn't before
-            self.nodes[nid]["uncertainty"] = uncertainty
-        return nid
+            self.graph.set_uncertainty(key, uncertainty)
+            self._updated_keys.add(key)
+        return key
 
     def add_edge(self, from_id: str, to_id: str, label: str) -> bool:
         """Add an edge if not already visited. Returns True if added."""
-        edge_key = (from_id, to_id)
-        if edge_key in self.visited_edges:
-            return False
-        self.visited_edges.add(edge_key)
-        self.edges.append({"from": from_id, "to": to_id, "label": label})
-        return True
+        src_word, _, src_lang = from_id.rpartition(":")
+        dst_word, _, dst_lang = to_id.rpartition(":")
+        return self.graph.add_edge(
+            self.graph.key(src_word, src_lang), self.graph.key(dst_word, dst_lang), label
+        )
+
+    def _skips_descendants(self, key: int) -> bool:
+        return (
+            bool(self.skip_descendant_ids) and self.graph.node_id(key) in self.skip_descendant_ids
+        )
+
+    @property
+    def has_budget(self) -> bool:
+        return self.max_nodes is not None or self.time_budget_ms is not None
+
+    def budget_exhausted(self) -> bool:
+        """True once a node or time budget has been hit (recording which)."""
+        if self.truncated_reason is not None:
+            return True
+        if self.max_nodes is not None and self.graph.node_count >= self.max_nodes:
+            self.truncated_reason = TRUNCATED_MAX_NODES
+        elif self._deadline is not None and time.monotonic() >= self._deadline:
+            self.truncated_reason = TRUNCATED_TIME_BUDGET
+        return self.truncated_reason is not None
 
     def result(self) -> dict:
-        """Return the built graph as {nodes: [...], edges: [...]}."""
-        return {"nodes": list(self.nodes.values()), "edges": self.edges}
-
-    async def _find_word_doc(self, word: str, lang: str, projection: dict) -> dict | None:
-        """Look up a word document, falling back to normalized form on miss."""
-        doc = await self.col.find_one({"word": word, "lang": lang}, projection)
-        if doc:
-            return doc
+        """Return the built graph as {nodes: [...], edges: [...]}.
+
+        With a budget set, ``truncated`` and ``truncated_reason`` are added.
+        """
+        graph = self.graph
+        result = {
+            "nodes": [graph.node_dict(key) for key in graph.node_keys()],
+            "edges": graph.edge_dicts(),
+        }
+        if self.has_budget:
+            result["truncated"] = self.truncated_reason is not None
+            result["truncated_reason"] = self.truncated_reason
+        return result
+
+    def drain(self) -> dict:
+        """Return the nodes and edges added since the previous drain.
+
+        ``nodes`` also re-lists already-drained nodes whose uncertainty was
+        filled in since, so a consumer should upsert nodes by id.
+        """
+        graph = self.graph
+        fresh = list(graph.node_keys(self._drained_nodes))
+        updated = sorted(self._updated_keys.difference(fresh))
+        self._updated_keys.clear()
+        self._drained_nodes = graph.node_count
+        edges = graph.edge_dicts(self._drained_edges)
+        self._drained_edges = graph.edge_count
+        return {"nodes": [graph.node_dict(key) for key in updated + fresh], "edges": edges}
+
+    def _checkpoint(self, phase: str) -> None:
+        """Hand everything discovered since the last checkpoint to ``on_batch``."""
+        if self.on_batch is None:
+            return
+        batch = self.drain()
+        if batch["nodes"] or batch["edges"]:
+            self.on_batch(phase, batch)
+
+    def meta(self) -> dict:
+        """Return build statistics: doc memo hits (lookups served from memory)
+        and misses (lookups that went to Mongo)."""
+        return {"doc_memo": {"hits": self.memo_hits, "misses": self.memo_misses}}
+
+    async def _find_word_doc(self, word: str, lang: str, etym: int | None = None) -> dict | None:
+        """Look up a word document through the request-scoped memo, backed by
+        the process-wide ``word_cache``.
+
+        With ``etym``, the etymology-specific doc is preferred, falling back to
+        the plain (word, lang) lookup; without it, the raw form falls back to the
+        normalized form on miss. With ``link_resolution``, a key known to
+        ``word_links`` is answered by that single lookup instead.
+        """
+        key = (word, lang, etym)
+        task = self._doc_memo.get(key)
+        if task is None:
+            self.memo_misses += 1
+            task = asyncio.ensure_future(
+                word_cache.get_or_load(
+                    self.col,
+                    (_WORD_CACHE_CLASS, word, lang, etym),
+                    lambda: self._fetch_word_doc(word, lang, etym),
+                )
+            )
+            self._doc_memo[key] = task
+        else:
+            self.memo_hits += 1
+        return await task
+
+    async def _fetch_word_doc(self, word: str, lang: str, etym: int | None) -> dict | None:
+        if etym is not None:
+            doc = await self.col.find_one(
+                {"word": word, "lang": lang, "etymology_number": etym}, _WORD_DOC_PROJECTION
+            )
+            return doc or await self._find_word_doc(word, lang)
+        if self.link_resolution:
+            resolved, doc = await word_links.find_word_doc(
+                self.col, word, lang, _WORD_DOC_PROJECTION
+            )
+            if resolved:
+                return doc
+            # Unresolved: the raw form already missed in that round trip.
+        else:
+            doc = await self.col.find_one({"word": word, "lang": lang}, _WORD_DOC_PROJECTION)
+            if doc:
+                return doc
         normalized = normalize_word(word)
         if normalized != word:
-            return await self.col.find_one({"word": normalized, "lang": lang}, projection)
+            return await self.col.find_one({"word": normalized, "lang": lang}, _WORD_DOC_PROJECTION)
         return None
 
+    async def _prefetch_word_docs(self, keys: list[tuple[str, str]]) -> None:
+        """Resolve many (word, lang) keys into the doc memo with one ``$or`` query.
+
+        The query carries each key's raw form and, where it differs, its
+        normalized form; the raw-then-normalized preference of
+        ``_fetch_word_doc`` is then applied in memory. Keys already memoized
+        (or in flight) are skipped, so this never refetches, and keys held in
+        ``word_cache`` are memoized straight from it.
+        """
+        pending = [key for key in dict.fromkeys(keys) if (*key, None) not in self._doc_memo]
+        if not pending:
+            return
+        await word_cache.sync_version(self.col)
+        uncached = []
+        for word, lang in pending:
+            doc = word_cache.lookup((_WORD_CACHE_CLASS, word, lang, None))
+            if doc is MISSING:
+                uncached.append((word, lang))
+                continue
+            self._memoize(word, lang, doc)
+        pending = uncached
+        if not pending:
+            return
+        forms = {}
+        for word, lang in pending:
+            forms[(word, lang)] = None
+            forms[(normalize_word(word), lang)] = None
+        cursor = self.col.find(
+            {"$or": [{"word": word, "lang": lang} for word, lang in forms]}, _WORD_DOC_PROJECTION
+        )
+        found: dict[tuple[str, str], dict] = {}
+        async for doc in cursor:
+            found.setdefault((doc["word"], doc["lang"]), doc)
+
+        for word, lang in pending:
+            doc = found.get((word, lang)) or found.get((normalize_word(word), lang))
+            word_cache.store((_WORD_CACHE_CLASS, word, lang, None), doc)
+            self._memoize(word, lang, doc)
+
+    def _memoize(self, word: str, lang: str, doc: dict | None) -> None:
+        """Record an already-resolved (word, lang) lookup in the doc memo."""
+        resolved = asyncio.get_running_loop().create_future()
+        resolved.set_result(doc)
+        self._doc_memo[(word, lang, None)] = resolved
+        self.memo_misses += 1
+
+    async def _find_word_docs(self, keys: list[tuple[str, str]]) -> list[dict | None]:
+        """Look up many (word, lang) docs concurrently, at most
+        MAX_CONCURRENT_LOOKUPS at a time.
+
+        Results come back in ``keys`` order (``asyncio.gather`` preserves it), and
+        callers only mutate the graph after all lookups finish, so node/edge order
+        is the same as awaiting each lookup in turn.
+        """
+
+        async def bounded(word: str, lang: str) -> dict | None:
+            async with self._lookup_slots:
+                return await self._find_word_doc(word, lang)
+
+        return list(await asyncio.gather(*(bounded(word, lang) for word, lang in keys)))
+
     async def expand_word(self, word: str, lang: str, base_level: int, etym: int | None = None):
         """Trace ancestry upward and find descendants for a word."""
-        proj = {"_id": 0, "etymology_templates": 1, "etymology_text": 1}
-        if etym is not None:
-            doc = await self.col.find_one(
-                {"word": word, "lang": lang, "etymology_number": etym}, proj
-            )
-            if not doc:
-                doc = await self._find_word_doc(word, lang, proj)
+        if self.chain_source == "chains":
+            found, hops, uncertainty = await self._read_chain(word, lang, etym)
         else:
-            doc = await self._find_word_doc(word, lang, proj)
+            found, hops, uncertainty = await self._parse_chain(word, lang, etym)
 
-        # Classify uncertainty for the word
-        uncertainty = None
-        if doc:
-            result = classify_etymology(doc)
-            if result.is_uncertain:
-                uncertainty = result.to_dict()
-
-        self.add_node(word, lang, base_level, uncertainty)
+        self._add_node(word, lang, base_level, uncertainty)
 
         # When a specific etymology is selected, skip descendant expansion for
         # the searched word — templates don't carry etymology_number, so
@@ -93,38 +432,71 @@ class TreeBuilder:
         if etym is not None:
             self.skip_descendant_ids.add(node_id(word, lang))
 
-        if not doc:
+        if not found:
+            self._checkpoint("ancestors")
             return
 
-        chain = self._build_ancestor_chain(doc, word, lang, base_level)
+        chain = self._build_ancestor_chain(hops, word, lang, base_level)
 
         # If no ancestry found, add edges for related mentions
         if len(chain) == 1:
-            await self._add_mention_edges(doc, word, lang, base_level)
+            doc = await self._find_word_doc(word, lang, etym)
+            if doc:
+                await self._add_mention_edges(doc, word, lang, base_level)
+        self._checkpoint("ancestors")
 
         # Expand precomputed compound/affix edges for all nodes in the chain
         await self._expand_compound_edges(chain)
+        self._checkpoint("compounds")
 
         await self._expand_descendants_from_chain(chain)
 
+    async def _parse_chain(
+        self, word: str, lang: str, etym: int | None
+    ) -> tuple[bool, list[dict], dict | None]:
+        """(found, ancestor hops, uncertainty) of a word, parsed from its doc."""
+        doc = await self._find_word_doc(word, lang, etym)
+        if not doc:
+            return False, [], None
+        result = classify_etymology(doc)
+        return True, self._ancestor_hops(doc), result.to_dict() if result.is_uncertain else None
+
+    async def _read_chain(
+        self, word: str, lang: str, etym: int | None
+    ) -> tuple[bool, list[dict], dict | None]:
+        """(found, ancestor hops, uncertainty) of a word, from its precomputed chain doc."""
+        record = await word_cache.get_or_load(
+            self.col,
+            (_CHAIN_CACHE_CLASS, word, lang, etym),
+            lambda: chains.find_chain(self.col, word, lang, etym, etym_fallback=True),
+        )
+        if not record:
+            return False, [], None
+        # Same fallback as extract_ancestry: no ancestry type (types=cog) means all.
+        types = self.allowed_types or ANCESTRY_TYPES
+        hops = [anc for anc in record["ancestry"] if anc["type"] in types]
+        return True, hops[: self.max_ancestor_depth], record["uncertainty"]
+
     def _build_ancestor_chain(
-        self, doc: dict, word: str, lang: str, base_level: int
+        self, hops: list[dict], word: str, lang: str, base_level: int
     ) -> list[tuple]:
-        """Trace ancestry upward, adding nodes/edges. Returns chain of (word, lang, lang_code, level)."""
-        ancestry = extract_ancestry(doc, self.allowed_types)
+        """Add ancestor ``hops`` upward from a word as nodes/edges. Returns the
+        chain of (word, lang, lang_code, level)."""
         chain = [(word, lang, lang_cache.name_to_code(lang), base_level)]
 
-        prev_id = node_id(word, lang)
-        for i, anc in enumerate(ancestry):
-            if i >= self.max_ancestor_depth:
-                break
-            aid = self.add_node(anc["word"], anc["lang"], base_level - (i + 1))
-            self.add_edge(aid, prev_id, anc["type"])
+        prev = self.graph.key(word, lang)
+        for i, anc in enumerate(hops):
+            ancestor = self._add_node(anc["word"], anc["lang"], base_level - (i + 1))
+            self.graph.add_edge(ancestor, prev, anc["type"])
             chain.append((anc["word"], anc["lang"], anc["lang_code"], base_level - (i + 1)))
-            prev_id = aid
+            prev = ancestor
 
         return chain
 
+    def _ancestor_hops(self, doc: dict) -> list[dict]:
+        """The allowed-type ancestry entries _build_ancestor_chain walks, depth-capped."""
+        return extract_ancestry(doc, self.allowed_types)[: self.max_ancestor_depth]
+
     async def _add_mention_edges(self, doc: dict, word: str, lang: str, level: int):
         """Add edges for word mentions when no ancestry is available.
 
@@ -133,154 +505,552 @@ class TreeBuilder:
         templates, giving users insight into possible word relationships.
         """
         mentions = extract_word_mentions(doc)
-        word_id = node_id(word, lang)
+        word_key = self.graph.key(word, lang)
 
-        for mention in mentions:
-            # Check if the mentioned word exists in DB
-            mention_doc = await self._find_word_doc(
-                mention.word, mention.lang, {"_id": 0, "word": 1}
-            )
+        # Check which mentioned words exist in DB: one batched query, then the
+        # existence map is read back from the memo.
+        mention_keys = [(mention.word, mention.lang) for mention in mentions]
+        await self._prefetch_word_docs(mention_keys)
+        mention_docs = await self._find_word_docs(mention_keys)
+        for mention, mention_doc in zip(mentions, mention_docs, strict=True):
+            if self.budget_exhausted():
+                return
             if not mention_doc:
                 continue
 
-            mention_id = self.add_node(mention.word, mention.lang, level - 1)
+            mention_key = self._add_node(mention.word, mention.lang, level - 1)
             # Edge goes from mention → word (mention is a component/source)
-            self.add_edge(mention_id, word_id, mention.role)
+            self.graph.add_edge(mention_key, word_key, mention.role)
 
-    async def _expand_compound_edges(
-        self, chain: list[tuple], max_compound_depth: int = 2
-    ):
+    async def _expand_compound_edges(self, chain: list[tuple], max_compound_depth: int = 2):
         """Expand precomputed compound/affix edges for each node in the ancestor chain.
 
         For each node, queries the etymology_edges collection for compound components.
         When a component is found, also traces its ancestry chain upward so the graph
         shows the full lineage through compound parts (e.g., vindauga → vindr → *windaz → PIE).
+
+        Runs in two phases: a batched prefetch (one edges query per recursion
+        level, one doc query per level's new components) followed by an in-memory
+        replay of the depth-first expansion, so the graph and its insertion order
+        are exactly what per-node queries would have produced.
+        """
+        edges_by_target, comp_hops = await self._prefetch_compound_edges(chain, max_compound_depth)
+        self._apply_compound_edges(chain, max_compound_depth, edges_by_target, comp_hops)
+
+    async def _prefetch_compound_edges(
+        self, chain: list[tuple], max_compound_depth: int
+    ) -> tuple[dict[tuple[str, str], list[dict]], dict[tuple[str, str], list[dict] | None]]:
+        """Fetch every compound edge and component ancestor chain the replay can reach.
+
+        Level by level: one ``$or`` query for the edges of all targets on the
+        level, one batched doc lookup for all components they name, and the
+        components' ancestor chains become the next level's targets. Components
+        without a doc map to ``None`` instead of a hop list. This may
+        fetch a little more than the replay uses (components whose edge turns
+        out to be a duplicate), never less.
         """
-        edges_col = self.col.database["etymology_edges"]
+        edges_by_target: dict[tuple[str, str], list[dict]] = {}
+        comp_hops: dict[tuple[str, str], list[dict] | None] = {}
+        targets = [(word, lang) for word, lang, _lang_code, _level in chain]
+
+        for remaining in range(max_compound_depth, -1, -1):
+            new_targets = [t for t in dict.fromkeys(targets) if t not in edges_by_target]
+            if not new_targets:
+                break
+            await self._fetch_compound_edges(new_targets, edges_by_target)
+            if remaining == 0:
+                break
+
+            components = list(
+                dict.fromkeys(
+                    (edge_doc["from_word"], edge_doc["from_lang"])
+                    for target in new_targets
+                    for edge_doc in edges_by_target[target]
+                )
+            )
+            await self._prefetch_word_docs(components)
+            docs = await self._find_word_docs(components)
+
+            targets = []
+            for component, doc in zip(components, docs, strict=True):
+                if not doc:
+                    comp_hops[component] = None
+                    continue
+                hops = comp_hops[component] = self._ancestor_hops(doc)
+                targets.append(component)
+                targets.extend((anc["word"], anc["lang"]) for anc in hops)
+
+        return edges_by_target, comp_hops
+
+    async def _fetch_compound_edges(
+        self, targets: list[tuple[str, str]], edges_by_target: dict[tuple[str, str], list[dict]]
+    ) -> None:
+        """One etymology_edges query for many (word, lang) targets, grouped per
+        target in cursor order (the order a per-target query would return)."""
+        for target in targets:
+            edges_by_target[target] = []
+        cursor = self.col.database["etymology_edges"].find(
+            {
+                "$or": [{"to_word": word, "to_lang": lang} for word, lang in targets],
+                "from_exists": True,
+            }
+        )
+        async for edge_doc in cursor:
+            key = (edge_doc["to_word"], edge_doc["to_lang"])
+            if key in edges_by_target:
+                edges_by_target[key].append(edge_doc)
+
+    def _apply_compound_edges(
+        self,
+        chain: list[tuple],
+        max_compound_depth: int,
+        edges_by_target: dict[tuple[str, str], list[dict]],
+        comp_hops: dict[tuple[str, str], list[dict] | None],
+    ) -> None:
+        """Depth-first replay of compound expansion over prefetched data."""
         components_to_trace: list[tuple[str, str, int]] = []
 
         for word, lang, _lang_code, level in chain:
-            cursor = edges_col.find(
-                {"to_word": word, "to_lang": lang, "from_exists": True}
-            )
-            async for edge_doc in cursor:
+            for edge_doc in edges_by_target.get((word, lang), []):
+                if self.budget_exhausted():
+                    return
                 comp_word = edge_doc["from_word"]
                 comp_lang = edge_doc["from_lang"]
-                comp_id = self.add_node(comp_word, comp_lang, level - 1)
-                word_id = node_id(word, lang)
-                if self.add_edge(comp_id, word_id, edge_doc["edge_type"]):
+                comp_key = self._add_node(comp_word, comp_lang, level - 1)
+                word_key = self.graph.key(word, lang)
+                if self.graph.add_edge(comp_key, word_key, edge_doc["edge_type"]):
                     # Only trace ancestry for newly added components
                     components_to_trace.append((comp_word, comp_lang, level - 1))
 
         # Trace ancestry upward for each component (depth-limited)
         if max_compound_depth > 0:
             for comp_word, comp_lang, comp_level in components_to_trace:
-                doc = await self._find_word_doc(
-                    comp_word, comp_lang, {"_id": 0, "etymology_templates": 1}
-                )
-                if not doc:
+                hops = comp_hops.get((comp_word, comp_lang))
+                if hops is None:
                     continue
-                comp_chain = self._build_ancestor_chain(
-                    doc, comp_word, comp_lang, comp_level
-                )
+                comp_chain = self._build_ancestor_chain(hops, comp_word, comp_lang, comp_level)
                 # Recursively expand compound edges on the component's ancestors
-                await self._expand_compound_edges(comp_chain, max_compound_depth - 1)
+                self._apply_compound_edges(
+                    comp_chain, max_compound_depth - 1, edges_by_target, comp_hops
+                )
 
     async def _expand_descendants_from_chain(self, chain: list[tuple]):
         """Find descendants from each node in the ancestor chain."""
-        for anc_word, anc_lang, anc_lc, anc_level in chain:
-            if node_id(anc_word, anc_lang) in self.skip_descendant_ids:
-                continue
+        roots = [
+            (anc_word, anc_lang, anc_lc, anc_level)
+            for anc_word, anc_lang, anc_lc, anc_level in chain
+            if not self._skips_descendants(self.graph.key(anc_word, anc_lang))
+        ]
+        if self.has_budget:
+            await self.find_descendants_best_first(roots)
+            return
+        if self.descendant_mode == "frontier":
+            await self.find_descendants_frontier(roots)
+            return
+        for anc_word, anc_lang, anc_lc, anc_level in roots:
             await self.find_descendants(anc_word, anc_lang, anc_lc, anc_level)
+            self._checkpoint("descendants")
 
-    async def find_descendants(
-        self, word: str, lang: str, lc: str, parent_level: int, depth: int = 0
-    ):
-        """Find words that inherited/borrowed/derived from this word."""
-        if depth >= self.max_descendant_depth:
-            return
+    def _parent_match_word(self, word: str) -> str:
+        """The form a parent word is matched in: edge docs store it normalized."""
+        return normalize_word(word) if self.descendant_source == "kaikki" else word
 
-        parent_id = node_id(word, lang)
+    def _descendant_collection(self) -> tuple[str, list[tuple[str, int]]]:
+        """(collection name, sort) of the current source's reverse lookups."""
+        if self.descendant_source == "kaikki":
+            return DESCENDANT_EDGES, _DESCENDANT_EDGE_SORT
+        return self.col.name, _DESCENDANT_SORT
 
-        cursor = (
-            self.col.find(
+    def _descendant_cursor(self, query: dict):
+        """Sorted reverse-lookup cursor over the current source's collection."""
+        name, sort = self._descendant_collection()
+        col = self.col.database[DESCENDANT_EDGES] if name == DESCENDANT_EDGES else self.col
+        return col.find(query, _DESCENDANT_PROJECTIONS[self.descendant_source]).sort(sort)
+
+    def _capped_children_pipeline(self, index: int, lc: str, match: str) -> list[dict]:
+        """One parent's sorted, capped reverse lookup as aggregation stages,
+        its docs tagged with the parent's position in the batch."""
+        _name, sort = self._descendant_collection()
+        return [
+            {"$match": self._descendant_query(lc, match)},
+            {"$sort": dict(sort)},
+            {"$limit": MAX_DESCENDANTS_PER_NODE},
+            {"$project": _DESCENDANT_PROJECTIONS[self.descendant_source]},
+            {"$addFields": {"_batch_parent": index}},
+        ]
+
+    def _descendant_query(self, lc_match, word_match) -> dict:
+        """Reverse-lookup filter for docs whose parent is (lc_match, word_match)."""
+        if self.descendant_source == "kaikki":
+            return {
+                "parent_lang_code": lc_match,
+                "parent_word": word_match,
+                "type": {"$in": sorted(self.allowed_types)},
+            }
+        if self.descendant_source == "primary_ancestor":
+            types = self._first_ancestor_types()
+            if types is None:
+                return {
+                    "primary_ancestor.lang_code": lc_match,
+                    "primary_ancestor.word": word_match,
+                    "primary_ancestor.type": {"$in": sorted(self.allowed_types)},
+                }
+            # A subset of the types: the doc's first link of a selected type
+            # may follow one of an unselected type, so match each type's first
+            # link; _immediate_parent keeps the lowest-ranked one.
+            branches = [
                 {
-                    "etymology_templates": {
-                        "$elemMatch": {
-                            "name": {"$in": list(expand_ancestry_types(self.allowed_types))},
-                            "args.2": lc,
-                            "args.3": word,
-                        }
-                    }
-                },
-                {"_id": 0, "word": 1, "lang": 1, "lang_code": 1, "etymology_templates": 1},
-            )
-            # Sort operates on the full doc pre-projection, so word/lang dedup order and
-            # which docs survive the cap are both deterministic across runs (content-based
-            # tie-break, never _id — that changes across data reloads). SPC-00021 R1.
-            .sort([("word", 1), ("lang", 1), ("pos", 1), ("etymology_number", 1)])
-            .limit(MAX_DESCENDANTS_PER_NODE)
-        )
+                    f"first_ancestors.{t}.lang_code": lc_match,
+                    f"first_ancestors.{t}.word": word_match,
+                }
+                for t in types
+            ]
+            return branches[0] if len(branches) == 1 else {"$or": branches}
+        return {
+            "etymology_templates": {
+                "$elemMatch": {
+                    "name": {"$in": list(expand_ancestry_types(self.allowed_types))},
+                    "args.2": lc_match,
+                    "args.3": word_match,
+                }
+            }
+        }
 
-        docs = await cursor.to_list(length=MAX_DESCENDANTS_PER_NODE)
+    def _immediate_parent(self, doc: dict) -> dict | None:
+        """Return the doc's immediate parent as {lang_code, word, type}, if any."""
+        if self.descendant_source == "kaikki":
+            return {
+                "lang_code": doc["parent_lang_code"],
+                "word": doc["parent_word"],
+                "type": doc["type"],
+            }
+        if self.descendant_source == "primary_ancestor":
+            types = self._first_ancestor_types()
+            if types is None:
+                return doc.get("primary_ancestor")
+            firsts = doc.get("first_ancestors") or {}
+            selected = [(firsts[t]["rank"], t) for t in types if t in firsts]
+            if not selected:
+                return None
+            _rank, first_type = min(selected)
+            return {**firsts[first_type], "type": first_type}
+        first_ancestry = extract_ancestry(doc, self.allowed_types)
+        return first_ancestry[0] if first_ancestry else None
+
+    def _first_ancestor_types(self) -> list[str] | None:
+        """Selected types to match on ``first_ancestors``; None when the
+        filter selects every ancestry type (or none), so ``primary_ancestor``,
+        the first link over all types, already is the immediate parent."""
+        types = sorted(self.allowed_types & ANCESTRY_TYPES)
+        if not types or len(types) == len(ANCESTRY_TYPES):
+            return None
+        return types
+
+    def _select_children(self, docs: list[dict], word: str, lc: str) -> list[tuple]:
+        """Reduce a parent's capped, sorted reverse-lookup docs to its immediate children.
 
+        Returns (word, lang, lang_code, edge_type) tuples, deduplicated by
+        (word, lang) in sort order.
+        """
+        children = []
         seen = set()
         for doc in docs:
             dw = doc["word"]
             dl = doc["lang"]
-            dlc = doc.get("lang_code", "")
 
             if (dw, dl) in seen:
                 continue
             seen.add((dw, dl))
 
             # Only include if this ancestor is the IMMEDIATE parent
-            first_ancestry = extract_ancestry(doc, self.allowed_types)
-            if (
-                not first_ancestry
-                or first_ancestry[0]["lang_code"] != lc
-                or first_ancestry[0]["word"] != word
-            ):
+            parent = self._immediate_parent(doc)
+            if not parent or parent["lang_code"] != lc or parent["word"] != word:
                 continue
 
-            edge_type = first_ancestry[0]["type"]
-            did = node_id(dw, dl)
+            children.append((dw, dl, doc.get("lang_code", ""), parent["type"]))
+        return children
+
+    async def find_descendants(
+        self, word: str, lang: str, lc: str, parent_level: int, depth: int = 0
+    ):
+        """Find words that inherited/borrowed/derived from this word."""
+        if depth >= self.max_descendant_depth:
+            return
+
+        parent = self.graph.key(word, lang)
+
+        for dw, dl, dlc, edge_type in await self._fetch_children(word, lc):
+            child = self.graph.key(dw, dl)
 
-            if not self.add_edge(parent_id, did, edge_type):
+            if not self.graph.add_edge(parent, child, edge_type):
                 continue
 
-            self.add_node(dw, dl, parent_level + 1)
-            if did not in self.skip_descendant_ids:
+            self.graph.add_node(child, parent_level + 1)
+            if not self._skips_descendants(child):
                 await self.find_descendants(dw, dl, dlc, parent_level + 1, depth + 1)
 
+    def _children_key(self, lc: str, word: str) -> descendant_cache.CacheKey:
+        return (self.descendant_source, tuple(sorted(self.allowed_types)), lc, word)
+
+    async def _fetch_children(self, word: str, lc: str) -> list[tuple]:
+        """Immediate children of one parent, through the process-wide descendant cache."""
+        await descendant_cache.sync_version(self.col)
+        key = self._children_key(lc, word)
+        children = descendant_cache.lookup(key)
+        if children is not MISSING:
+            return children
+        match = self._parent_match_word(word)
+        cursor = self._descendant_cursor(self._descendant_query(lc, match)).limit(
+            MAX_DESCENDANTS_PER_NODE
+        )
+        docs = await cursor.to_list(length=MAX_DESCENDANTS_PER_NODE)
+        children = self._select_children(docs, match, lc)
+        descendant_cache.store(key, children)
+        return children
+
+    async def find_descendants_frontier(self, roots: list[tuple]):
+        """Breadth-first find_descendants: one reverse lookup per level for the
+        whole frontier instead of one per node.
+
+        ``roots`` are (word, lang, lang_code, level) tuples expanded at depth 0.
+        Each parent keeps the recursive mode's semantics (50-doc cap over the
+        same sort, immediate-parent check); only the visiting order differs, so
+        node/edge insertion order is level-major rather than depth-first.
+        """
+        frontier = roots
+        for _depth in range(self.max_descendant_depth):
+            if not frontier:
+                return
+            children = await self._fetch_children_batch([(lc, w) for w, _l, lc, _lv in frontier])
+
+            next_frontier = []
+            for word, lang, lc, level in frontier:
+                parent = self.graph.key(word, lang)
+                for dw, dl, dlc, edge_type in children.get((lc, word), []):
+                    child = self.graph.key(dw, dl)
+                    if not self.graph.add_edge(parent, child, edge_type):
+                        continue
+                    self.graph.add_node(child, level + 1)
+                    if not self._skips_descendants(child):
+                        next_frontier.append((dw, dl, dlc, level + 1))
+            self._checkpoint("descendants")
+            frontier = next_frontier
+
+    async def find_descendants_best_first(self, roots: list[tuple]):
+        """Budgeted descendant expansion: most prolific parents first.
+
+        ``roots`` are (word, lang, lang_code, level) tuples expanded at depth 0.
+        Parents wait in a max-heap keyed by their number of immediate children
+        (ties by discovery order), so when a budget cuts expansion short the
+        largest subtrees are the ones already shown. Depth cap, 50-per-parent
+        cap and ``skip_descendant_ids`` apply as in the other modes; each
+        expansion step fetches the next children in one batched lookup.
+        """
+        heap: list[tuple] = []
+        order = itertools.count()
+
+        async def push(parents: list[tuple]) -> None:
+            children = await self._fetch_children_batch([(lc, w) for w, _l, lc, _lv, _d in parents])
+            for parent in parents:
+                kids = children.get((parent[2], parent[0]), [])
+                if kids:
+                    heapq.heappush(heap, (-len(kids), next(order), parent, kids))
+
+        await push([(word, lang, lc, level, 0) for word, lang, lc, level in roots])
+        while heap and not self.budget_exhausted():
+            _neg_count, _seq, (word, lang, _lc, level, depth), kids = heapq.heappop(heap)
+            parent = self.graph.key(word, lang)
+            expandable = []
+            for dw, dl, dlc, edge_type in kids:
+                if self.budget_exhausted():
+                    break
+                child = self.graph.key(dw, dl)
+                if not self.graph.add_edge(parent, child, edge_type):
+                    continue
+                self.graph.add_node(child, level + 1)
+                if not self._skips_descendants(child) and depth + 1 < self.max_descendant_depth:
+                    expandable.append((dw, dl, dlc, level + 1, depth + 1))
+            self._checkpoint("descendants")
+            if expandable and not self.budget_exhausted():
+                await push(expandable)
+
+    async def _fetch_children_batch(
+        self, parents: list[tuple[str, str]]
+    ) -> dict[tuple[str, str], list[tuple]]:
+        """Fetch the immediate children of many (lang_code, word) parents in one query.
+
+        Each parent's lookup is its own sorted, capped sub-pipeline (the first
+        one inline, the others through ``$unionWith``), so the database returns
+        exactly the docs the per-parent queries would: at most
+        ``MAX_DESCENDANTS_PER_NODE`` per parent, however many docs a hub parent
+        has. Parents beyond ``MAX_BATCH_PARENTS`` go into further aggregations.
+
+        Parents whose child list is in ``descendant_cache`` are answered from
+        it and left out of the query.
+        """
+        await descendant_cache.sync_version(self.col)
+        result: dict[tuple[str, str], list[tuple]] = {}
+        unique_parents = []
+        for lc, word in dict.fromkeys(parents):
+            children = descendant_cache.lookup(self._children_key(lc, word))
+            if children is MISSING:
+                unique_parents.append((lc, word))
+            else:
+                result[(lc, word)] = children
+
+        name, _sort = self._descendant_collection()
+        col = self.col.database[DESCENDANT_EDGES] if name == DESCENDANT_EDGES else self.col
+        for start in range(0, len(unique_parents), MAX_BATCH_PARENTS):
+            batch = unique_parents[start : start + MAX_BATCH_PARENTS]
+            matches = [self._parent_match_word(word) for _lc, word in batch]
+            first, *rest = (
+                self._capped_children_pipeline(i, lc, match)
+                for i, ((lc, _w), match) in enumerate(zip(batch, matches, strict=True))
+            )
+            pipeline = first + [{"$unionWith": {"coll": name, "pipeline": sub}} for sub in rest]
+            docs_by_parent: list[list[dict]] = [[] for _ in batch]
+            async for doc in col.aggregate(pipeline):
+                docs_by_parent[doc.pop("_batch_parent")].append(doc)
+
+            for (lc, word), match, docs in zip(batch, matches, docs_by_parent, strict=True):
+                children = self._select_children(docs, match, lc)
+                descendant_cache.store(self._children_key(lc, word), children)
+                result[(lc, word)] = children
+        return result
+
+    async def _cognates_of(self, keys: list[tuple[str, str]]) -> list[list[dict]]:
+        """The cognate mentions of many (word, lang) keys, in ``keys`` order
+        (empty for words without a doc)."""
+        docs = await self._find_word_docs(keys)
+        return [extract_cognates(doc) if doc else [] for doc in docs]
+
     async def expand_cognates(self, max_rounds: int = DEFAULT_MAX_COGNATE_ROUNDS):
         """Expand cognates from all current nodes, recursively up to max_rounds."""
-        processed_nids: set[str] = set()
+        if self.cognate_mode == "components":
+            await self._expand_cognate_components(max_rounds)
+            return
+        graph = self.graph
+        processed: set[int] = set()
         for _ in range(max_rounds):
+            if self.budget_exhausted():
+                return
             new_cognate_nodes = []
 
             # Snapshot: expand_word below adds new nodes
-            unprocessed = [
-                (nid, node) for nid, node in self.nodes.items() if nid not in processed_nids
-            ]
-            for nid, node in unprocessed:
-                processed_nids.add(nid)
-                doc = await self._find_word_doc(
-                    node["label"], node["language"], {"_id": 0, "etymology_templates": 1}
-                )
-                if not doc:
-                    continue
-                for cog in extract_cognates(doc):
-                    cid = node_id(cog["word"], cog["lang"])
-                    if not self.add_edge(nid, cid, "cog"):
+            unprocessed = [key for key in graph.node_keys() if key not in processed]
+            cognates = await self._cognates_of(
+                [(graph.word(key), graph.lang(key)) for key in unprocessed]
+            )
+            for key, node_cognates in zip(unprocessed, cognates, strict=True):
+                processed.add(key)
+                for cog in node_cognates:
+                    if self.budget_exhausted():
+                        break
+                    cognate = graph.key(cog["word"], cog["lang"])
+                    if not graph.add_edge(key, cognate, "cog"):
                         continue
-                    if cid not in self.nodes:
-                        self.add_node(cog["word"], cog["lang"], node["level"])
+                    if graph.add_node(cognate, graph.level(key)):
                         new_cognate_nodes.append((cog["word"], cog["lang"]))
+            self._checkpoint("cognates")
+
+            if not new_cognate_nodes:
+                break
+
+            for cog_word, cog_lang in new_cognate_nodes:
+                if self.budget_exhausted():
+                    return
+                cog_level = graph.level(graph.key(cog_word, cog_lang))
+                await self.expand_word(cog_word, cog_lang, cog_level)
+
+    async def _expand_cognate_components(self, max_rounds: int):
+        """``expand_cognates`` over precomputed cognate components.
+
+        Each round looks up the ``cognate_set`` of every new node (one batched
+        doc query), reads all links of the sets not read yet in one indexed
+        query, and adds the component members reachable from the graph, each
+        at the level of the member it was reached from. New members are then
+        expanded with ``expand_word`` as in rounds mode, and the next round
+        picks up the components of the nodes that added.
+        """
+        graph = self.graph
+        processed: set[int] = set()
+        loaded_sets: set[int] = set()
+        for _ in range(max_rounds):
+            if self.budget_exhausted():
+                return
+            unprocessed = [key for key in graph.node_keys() if key not in processed]
+            processed.update(unprocessed)
+            keys = [(graph.word(key), graph.lang(key)) for key in unprocessed]
+            await self._prefetch_word_docs(keys)
+            docs = await self._find_word_docs(keys)
+            set_ids = sorted(
+                {doc["cognate_set"] for doc in docs if doc and doc.get("cognate_set") is not None}
+                - loaded_sets
+            )
+            if not set_ids:
+                break
+            loaded_sets.update(set_ids)
+            cursor = (
+                self.col.database[COGNATE_LINKS]
+                .find({"cognate_set": {"$in": set_ids}}, _COGNATE_LINK_PROJECTION)
+                .sort(_COGNATE_LINK_SORT)
+                .limit(MAX_COGNATE_SET_LINKS)
+            )
+            new_cognate_nodes = self._apply_cognate_links(
+                await cursor.to_list(length=MAX_COGNATE_SET_LINKS)
+            )
+            self._checkpoint("cognates")
 
             if not new_cognate_nodes:
                 break
 
             for cog_word, cog_lang in new_cognate_nodes:
-                cog_level = self.nodes[node_id(cog_word, cog_lang)]["level"]
+                if self.budget_exhausted():
+                    return
+                cog_level = graph.level(graph.key(cog_word, cog_lang))
                 await self.expand_word(cog_word, cog_lang, cog_level)
+
+    def _apply_cognate_links(self, links: list[dict]) -> list[tuple[str, str]]:
+        """Walk cognate links breadth-first (either direction) from the members
+        already in the graph, adding each link as a ``cog`` edge in its stored
+        direction. Returns the (word, lang) of the members added as nodes.
+
+        Members are matched in ``normalize_word`` form, as
+        ``etl.precompute_cognate_sets`` union-finds them, so a ``*wīną`` node
+        picks up the links stored under ``wina``; edges attach to the node
+        already in the graph, else to the link's own spelling.
+        """
+        graph = self.graph
+
+        def member(word: str, lang: str) -> tuple[str, str]:
+            return normalize_word(word), lang
+
+        links_by_member: dict[tuple[str, str], list[dict]] = {}
+        for link in links:
+            for end in ((link["from_word"], link["from_lang"]), (link["to_word"], link["to_lang"])):
+                links_by_member.setdefault(member(*end), []).append(link)
+        node_of: dict[tuple[str, str], tuple[str, str]] = {}
+        for key in graph.node_keys():
+            node_of.setdefault(
+                member(graph.word(key), graph.lang(key)), (graph.word(key), graph.lang(key))
+            )
+        queue = deque(m for m in node_of if m in links_by_member)
+        new_cognate_nodes = []
+        while queue:
+            current = queue.popleft()
+            level = graph.level(graph.key(*node_of[current]))
+            for link in links_by_member.pop(current, []):
+                if self.budget_exhausted():
+                    return new_cognate_nodes
+                ends = [(link["from_word"], link["from_lang"]), (link["to_word"], link["to_lang"])]
+                source, target = (node_of.get(member(*end), end) for end in ends)
+                if source == target or not graph.add_edge(
+                    graph.key(*source), graph.key(*target), "cog"
+                ):
+                    continue
+                other = target if member(*source) == current else source
+                if graph.add_node(graph.key(*other), level):
+                    node_of[member(*other)] = other
+                    new_cognate_nodes.append(other)
+                    queue.append(member(*other))
+        return new_cognate_nodes
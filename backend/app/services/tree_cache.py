@@ -0,0 +1,86 @@
+"""Two-tier cache of built ``/tree`` graphs: a process LRU over a ``trees`` collection.
+
+``build_tree`` is deterministic for its request parameters and the loaded
+data, so a built graph is cached under a canonical request key (built with
+``layout_cache.cache_key``) and tagged with the data version it was built
+under. Reads try the in-process LRU first, then the ``trees`` collection
+(shared by every worker, and surviving restarts); a Mongo hit is promoted into
+the LRU. An entry from an older data version is a miss, and the LRU is emptied
+outright when the version moves, so a reload never serves a stale graph.
+
+The LRU stores the serialized JSON and every read decodes a fresh copy:
+callers (the layout router) decorate the returned nodes in place. As with the
+``layouts`` cache, writes are best-effort and never fail a request.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from datetime import UTC, datetime
+from typing import Any
+
+from app.config import settings
+from app.services import data_version
+from app.services.lru import MISSING, LRUCache
+
+logger = logging.getLogger(__name__)
+
+COLLECTION = "trees"
+
+_cache = LRUCache(settings.tree_cache_max_bytes, sizeof=len)
+_state: dict[str, Any] = {"version": None}
+
+
+async def get_cached(db: Any, key: str) -> dict | None:
+    """Return a fresh copy of the cached tree for ``key``, or ``None`` on a miss."""
+    version = await data_version.current(db)
+    if version != _state["version"]:
+        _cache.clear()
+        _state["version"] = version
+    payload = _cache.get(key)
+    if payload is not MISSING:
+        return json.loads(payload)
+    doc = await db[COLLECTION].find_one({"_id": key})
+    if doc is None or doc.get("data_version") != version:
+        return None
+    tree = doc["tree"]
+    _cache.put(key, _dumps(tree))
+    return tree
+
+
+async def put_cached(db: Any, key: str, tree: dict) -> None:
+    """Write-through ``tree`` to both tiers under the current data version."""
+    version = await data_version.current(db)
+    _cache.put(key, _dumps(tree))
+    doc = {
+        "_id": key,
+        "tree": tree,
+        "data_version": version,
+        "created_at": datetime.now(tz=UTC),
+    }
+    try:
+        await db[COLLECTION].replace_one({"_id": key}, doc, upsert=True)
+    except Exception:
+        # Cache write is best-effort: log once at WARN and swallow, never raise.
+        logger.warning(
+            "tree cache write failed for %s",
+            key,
+            exc_info=True,
+            extra={"event": "tree.cache.write_failed", "key": key},
+        )
+
+
+def _dumps(tree: dict) -> str:
+    return json.dumps(tree, ensure_ascii=False, separators=(",", ":"))
+
+
+def stats() -> dict:
+    """Return size and hit-ratio counters of the in-process tier."""
+    return {**_cache.stats(), "data_version": _state["version"]}
+
+
+def reset() -> None:
+    """Drop all in-process entries and counters (tests)."""
+    _cache.reset()
+    _state["version"] = None
@@ -0,0 +1,23 @@
+"""The ``TREE_ENGINE`` setting: which :class:`TreeBuilder` builds trees.
+
+- ``builder``: :class:`TreeBuilder`'s own per-parent / per-level lookups
+- ``graphlookup``: :class:`~app.services.graph_lookup.GraphLookupTreeBuilder`
+- ``csr``: :class:`~app.services.csr_graph.CsrTreeBuilder`
+"""
+
+from __future__ import annotations
+
+from app.services.csr_graph import CsrTreeBuilder
+from app.services.graph_lookup import GraphLookupTreeBuilder
+from app.services.tree_builder import TreeBuilder
+
+# Values of settings.tree_engine.
+TREE_ENGINES = ("builder", "graphlookup", "csr")
+
+
+def tree_builder_class(engine: str) -> type[TreeBuilder]:
+    """The builder class of a ``tree_engine`` setting value."""
+    if engine not in TREE_ENGINES:
+        msg = f"tree_engine must be one of {TREE_ENGINES}, got {engine!r}"
+        raise ValueError(msg)
+    return {"graphlookup": GraphLookupTreeBuilder, "csr": CsrTreeBuilder}.get(engine, TreeBuilder)
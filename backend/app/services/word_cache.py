@@ -0,0 +1,73 @@
+"""Process-wide LRU of word documents, shared by every request.
+
+Sits in front of the ``words`` collection for the hot read paths (TreeBuilder,
+``get_word``, ``get_etymology_chain``). Keys are ``(projection_class, word,
+lang, etym)``: each caller caches the *resolved* result of its own lookup
+(including the normalized-form fallback and a ``None`` for known-missing
+words) under its own projection class, so a narrow tree projection never
+answers a full-document detail request.
+
+The cache is bounded by ``settings.word_cache_max_bytes`` and is emptied when
+the ETL stamps a new data version (see ``data_version``). Cached documents
+are shared between requests and must be treated as read-only.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Any
+
+from app.config import settings
+from app.services import data_version
+from app.services.lru import MISSING, LRUCache
+
+if TYPE_CHECKING:
+    from motor.motor_asyncio import AsyncIOMotorCollection
+
+CacheKey = tuple[str, str, str, int | None]
+
+_cache = LRUCache(settings.word_cache_max_bytes)
+_state: dict[str, Any] = {"version": None}
+
+
+async def sync_version(col: AsyncIOMotorCollection) -> None:
+    """Empty the cache if the data version moved since it was filled."""
+    version = await data_version.current(col.database)
+    if version != _state["version"]:
+        _cache.clear()
+        _state["version"] = version
+
+
+async def get_or_load(
+    col: AsyncIOMotorCollection,
+    key: CacheKey,
+    loader: Callable[[], Awaitable[dict | None]],
+) -> dict | None:
+    """Return the cached result for ``key``, running ``loader`` on a miss."""
+    await sync_version(col)
+    doc = _cache.get(key)
+    if doc is MISSING:
+        doc = await loader()
+        _cache.put(key, doc)
+    return doc
+
+
+def lookup(key: CacheKey) -> Any:
+    """Return the cached result for ``key`` or ``lru.MISSING`` (call ``sync_version`` first)."""
+    return _cache.get(key)
+
+
+def store(key: CacheKey, doc: dict | None) -> None:
+    """Cache a resolved lookup result (``None`` records a known-missing word)."""
+    _cache.put(key, doc)
+
+
+def stats() -> dict:
+    """Return size and hit-ratio counters."""
+    return {**_cache.stats(), "data_version": _state["version"]}
+
+
+def reset() -> None:
+    """Drop all entries and counters (tests)."""
+    _cache.reset()
+    _state["version"] = None
@@ -0,0 +1,97 @@
+"""Single-round-trip word lookup through the precomputed ``word_links`` table.
+
+Template references are often not headwords as written (``*wīnom``,
+``vīnum``), so the plain lookup misses on the raw form and retries with
+``normalize_word`` — two round trips, and two misses when neither exists.
+``etl.precompute_links`` stores one ``{word, lang, target}`` doc for every
+referenced key whose raw form is not a headword, ``target`` being the
+normalized headword it resolves to or ``None`` when it resolves to nothing.
+
+:func:`find_word_doc` asks both questions in one aggregation on ``words``: the
+raw ``$match``, plus a ``$unionWith`` of the key's link joined (``$lookup``) to
+its target doc. Keys whose ``target`` is ``None`` are held in memory (loaded
+with one query per data version), so a known-missing key costs no read at
+all. Keys the table does not know (a word searched directly rather than
+reached through a template) report ``resolved=False``; the raw form has then
+already missed, and callers only retry the normalized form.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from app.services import data_version
+
+if TYPE_CHECKING:
+    from motor.motor_asyncio import AsyncIOMotorCollection
+
+COLLECTION = "word_links"
+
+_missing: set[tuple[str, str]] = set()
+_state: dict[str, Any] = {"version": None}
+
+
+async def _sync_missing(col: AsyncIOMotorCollection) -> None:
+    """Reload the known-missing keys if the data version moved since they were read."""
+    version = await data_version.current(col.database)
+    if version == _state["version"]:
+        return
+    cursor = col.database[COLLECTION].find({"target": None}, {"_id": 0, "word": 1, "lang": 1})
+    _missing.clear()
+    _missing.update([(doc["word"], doc["lang"]) async for doc in cursor])
+    _state["version"] = version
+
+
+def reset() -> None:
+    """Forget the known-missing keys (tests)."""
+    _missing.clear()
+    _state["version"] = None
+
+
+async def find_word_doc(
+    col: AsyncIOMotorCollection, word: str, lang: str, projection: dict
+) -> tuple[bool, dict | None]:
+    """Return ``(resolved, doc)`` for ``(word, lang)`` in at most one round trip.
+
+    ``resolved`` is False only when the raw form is not a headword and the
+    link table has no entry for it.
+    """
+    await _sync_missing(col)
+    if (word, lang) in _missing:
+        return True, None
+    pipeline = [
+        {"$match": {"word": word, "lang": lang}},
+        {"$limit": 1},
+        {"$project": projection},
+        {
+            "$unionWith": {
+                "coll": COLLECTION,
+                "pipeline": [
+                    {"$match": {"word": word, "lang": lang}},
+                    {"$limit": 1},
+                    {
+                        "$lookup": {
+                            "from": col.name,
+                            "localField": "target",
+                            "foreignField": "word",
+                            "let": {"lang": "$lang"},
+                            "pipeline": [
+                                {"$match": {"$expr": {"$eq": ["$lang", "$$lang"]}}},
+                                {"$limit": 1},
+                                {"$project": projection},
+                            ],
+                            "as": "target_docs",
+                        }
+                    },
+                    {"$project": {"_id": 0, "target_docs": 1}},
+                ],
+            }
+        },
+    ]
+    results = await col.aggregate(pipeline).to_list(length=2)
+    for doc in results:
+        if "target_docs" not in doc:
+            return True, doc
+    if results:
+        return True, next(iter(results[0]["target_docs"]), None)
+    return False, None
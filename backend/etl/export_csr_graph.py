@@ -0,0 +1,127 @@
+"""Export the etymology graph as memory-mapped CSR arrays for ``TREE_ENGINE=csr``.
+
+Standalone batch script using sync pymongo.
+Run outside Docker against localhost:27017.
+Requires ``primary_ancestor`` (``make precompute-ancestors``) and
+``etymology_edges`` (``make precompute-edges``); picks up ``subtree_size``
+when ``make precompute-subtree-sizes`` has run.
+
+Three passes feed ``csr_graph.CsrGraphExport``:
+
+1. every words entry in natural order: node, ancestor chain and cognates of
+   the first entry per (word, lang)
+2. entries with a ``primary_ancestor``, sorted by parent then
+   ``_DESCENDANT_SORT`` (the ``primary_ancestor_ranked`` index order): the
+   ``desc`` edges
+3. ``etymology_edges`` with ``from_exists``: the ``comp`` edges
+
+and the arrays are written into ``CSR_GRAPH_DIR`` (default
+``data/csr_graph`` under backend/). The whole graph is held in memory while
+exporting. The API maps the files at startup, so restart it afterwards.
+
+Usage:
+    pip install pymongo numpy
+    python -m etl.export_csr_graph
+    python -m etl.export_csr_graph --reprocess  # Overwrite an existing export
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+from app.services import data_version
+from app.services.csr_graph import CsrGraphExport
+from pymongo import MongoClient
+
+from etl.precompute_edges import load_lang_lookup
+
+MONGO_URI = os.environ.get("MONGO_URI", "mongodb://localhost:27017/etymology")
+CSR_GRAPH_DIR = Path(os.environ.get("CSR_GRAPH_DIR", "data/csr_graph"))
+PROGRESS_EVERY = 500_000
+
+_ENTRY_PROJECTION = {
+    "_id": 0,
+    "word": 1,
+    "lang": 1,
+    "lang_code": 1,
+    "etymology_number": 1,
+    "etymology_templates": 1,
+    "etymology_text": 1,
+}
+_CHILD_SORT = [
+    ("primary_ancestor.lang_code", 1),
+    ("primary_ancestor.word", 1),
+    ("subtree_size", -1),
+    ("word", 1),
+    ("lang", 1),
+    ("pos", 1),
+    ("etymology_number", 1),
+]
+
+
+def _progress(label: str, count: int, start: float) -> None:
+    elapsed = time.time() - start
+    rate = count / elapsed if elapsed > 0 else 0
+    print(f"  {label}: {count:,} - {rate:.0f} docs/sec")
+
+
+def export(reprocess: bool = False) -> None:
+    """Read words and edges, write the CSR graph directory."""
+    if (CSR_GRAPH_DIR / "meta.json").exists() and not reprocess:
+        print(f"{CSR_GRAPH_DIR} already exported. Use --reprocess to rebuild.")
+        return
+
+    client = MongoClient(MONGO_URI)
+    db = client.etymology
+    col = db.words
+
+    print("Loading language lookup...")
+    graph = CsrGraphExport(load_lang_lookup(db))
+    start = time.time()
+
+    print("Pass 1/3: entries...")
+    entries = defaults = 0
+    for doc in col.find({}, _ENTRY_PROJECTION):
+        entries += 1
+        defaults += graph.add_entry(doc)
+        if entries % PROGRESS_EVERY == 0:
+            _progress("entries", entries, start)
+    print(f"  {entries:,} entries, {defaults:,} (word, lang) nodes with a doc")
+
+    print("Pass 2/3: primary_ancestor children...")
+    children = 0
+    cursor = (
+        col.find(
+            {"primary_ancestor": {"$ne": None}},
+            {"_id": 0, "word": 1, "lang": 1, "lang_code": 1, "primary_ancestor": 1},
+        )
+        .sort(_CHILD_SORT)
+        .allow_disk_use(True)
+    )
+    for doc in cursor:
+        graph.add_child(doc)
+        children += 1
+        if children % PROGRESS_EVERY == 0:
+            _progress("children", children, start)
+    print(f"  {children:,} descendant edges")
+
+    print("Pass 3/3: compound edges...")
+    components = 0
+    for edge_doc in db.etymology_edges.find({"from_exists": True}, {"_id": 0}):
+        graph.add_component(edge_doc)
+        components += 1
+    print(f"  {components:,} component edges")
+
+    print(f"Writing {CSR_GRAPH_DIR}...")
+    meta = graph.write(CSR_GRAPH_DIR)
+
+    data_version.stamp(db)
+
+    elapsed = time.time() - start
+    print(f"\nDone in {elapsed:.1f}s. Nodes: {meta['nodes']:,}, Edges: {meta['edges']}")
+
+
+if __name__ == "__main__":
+    reprocess = "--reprocess" in sys.argv
+    export(reprocess=reprocess)
@@ -0,0 +1,66 @@
+"""Export the ``/search`` prefix index for ``SEARCH_SOURCE=index``.
+
+Standalone batch script using sync pymongo.
+Run outside Docker against localhost:27017.
+
+Reads every words entry's ``word``, ``lang``, ``pos`` and
+``etymology_number`` in natural order and writes them, sorted by word, with
+``search_index.write_search_index`` into ``SEARCH_INDEX_DIR`` (default
+``data/search_index`` under backend/). All rows are held in memory while
+exporting. The API maps the files at startup, so restart it afterwards.
+
+Usage:
+    pip install pymongo numpy
+    python -m etl.export_search_index
+    python -m etl.export_search_index --reprocess  # Overwrite an existing export
+"""
+
+import os
+import sys
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+from app.services import data_version
+from app.services.search_index import write_search_index
+from pymongo import MongoClient
+
+MONGO_URI = os.environ.get("MONGO_URI", "mongodb://localhost:27017/etymology")
+SEARCH_INDEX_DIR = Path(os.environ.get("SEARCH_INDEX_DIR", "data/search_index"))
+PROGRESS_EVERY = 500_000
+
+_PROJECTION = {"_id": 0, "word": 1, "lang": 1, "pos": 1, "etymology_number": 1}
+
+
+def _entries(col, start: float) -> Iterator[dict]:
+    for count, doc in enumerate(col.find({}, _PROJECTION), start=1):
+        if count % PROGRESS_EVERY == 0:
+            elapsed = time.time() - start
+            rate = count / elapsed if elapsed > 0 else 0
+            print(f"  entries: {count:,} - {rate:.0f} docs/sec")
+        yield doc
+
+
+def export(reprocess: bool = False) -> None:
+    """Read every words entry, write the search index directory."""
+    if (SEARCH_INDEX_DIR / "rows.word.npy").exists() and not reprocess:
+        print(f"{SEARCH_INDEX_DIR} already exported. Use --reprocess to rebuild.")
+        return
+
+    client = MongoClient(MONGO_URI)
+    db = client.etymology
+    col = db.words
+
+    print("Reading entries...")
+    start = time.time()
+    rows = write_search_index(SEARCH_INDEX_DIR, _entries(col, start))
+
+    data_version.stamp(db)
+
+    elapsed = time.time() - start
+    print(f"\nDone in {elapsed:.1f}s. Rows: {rows:,} in {SEARCH_INDEX_DIR}")
+
+
+if __name__ == "__main__":
+    reprocess = "--reprocess" in sys.argv
+    export(reprocess=reprocess)
@@ -4,6 +4,7 @@ import json
 import sys
 from pathlib import Path
 
+from app.services import data_version
 from pymongo import TEXT, IndexModel, MongoClient
 from pymongo.collation import Collation
 from pymongo.collection import Collection
@@ -113,6 +114,7 @@ def main() -> None:
     load_documents(col, data_path)
     create_indexes(col)
     build_language_table(db)
+    data_version.stamp(db)
 
     print("Done.")
 
@@ -0,0 +1,136 @@
+"""Precompute each entry's primary (immediate) ancestor as an indexed field.
+
+Standalone batch script using sync pymongo.
+Run outside Docker against localhost:27017.
+
+Stores ``primary_ancestor`` = {type, lang_code, word, word_normalized} — the
+first inh/bor/der template of the entry, see
+``template_parser.primary_ancestor`` — so that ``find_descendants`` (with
+``DESCENDANT_SOURCE=primary_ancestor``) is an indexed equality lookup returning
+tiny documents instead of an ``$elemMatch`` scan over ``etymology_templates``.
+Also stores ``first_ancestors`` = {type: {lang_code, word, word_normalized,
+rank}}, the first template of each type (``template_parser.first_ancestors``),
+which the lookup matches on when the tree's type filter selects only some of
+inh/bor/der.
+
+Usage:
+    pip install pymongo
+    python -m etl.precompute_ancestors
+    python -m etl.precompute_ancestors --reprocess  # Recompute every entry
+"""
+
+import os
+import sys
+import time
+
+from app.services import data_version
+from app.services.template_parser import (
+    ANCESTRY_TYPES,
+    expand_ancestry_types,
+    first_ancestors,
+    primary_ancestor,
+)
+from pymongo import MongoClient, UpdateOne
+
+MONGO_URI = os.environ.get("MONGO_URI", "mongodb://localhost:27017/etymology")
+BATCH_SIZE = 5000
+
+
+def create_indexes(col) -> None:
+    """Index the parent key, then the descendant sort, so the capped lookup is
+    an index range scan that is already in ``_DESCENDANT_SORT`` order. Each
+    type's ``first_ancestors`` record gets the same index.
+
+    ``etl.precompute_subtree_sizes`` swaps each of these indexes for a
+    ``_ranked`` one (``primary_ancestor_ranked``, ``first_ancestor_inh_ranked``,
+    ...), which also covers the leading ``subtree_size`` key; once that exists
+    it is kept.
+    """
+    existing = col.index_information()
+    for ancestor_type in sorted(ANCESTRY_TYPES):
+        if f"first_ancestor_{ancestor_type}_ranked" in existing:
+            continue
+        field = f"first_ancestors.{ancestor_type}"
+        col.create_index(
+            [
+                (f"{field}.lang_code", 1),
+                (f"{field}.word", 1),
+                ("word", 1),
+                ("lang", 1),
+                ("pos", 1),
+                ("etymology_number", 1),
+            ],
+            name=f"first_ancestor_{ancestor_type}_lookup",
+        )
+    if "primary_ancestor_ranked" in existing:
+        return
+    col.create_index(
+        [
+            ("primary_ancestor.lang_code", 1),
+            ("primary_ancestor.word", 1),
+            ("word", 1),
+            ("lang", 1),
+            ("pos", 1),
+            ("etymology_number", 1),
+        ],
+        name="primary_ancestor_lookup",
+    )
+
+
+def precompute(reprocess: bool = False) -> None:
+    """Set ``primary_ancestor`` and ``first_ancestors`` on every entry carrying
+    an ancestry template."""
+    client = MongoClient(MONGO_URI)
+    col = client.etymology.words
+
+    print("Creating primary_ancestor and first_ancestors indexes...")
+    create_indexes(col)
+
+    query: dict = {"etymology_templates.name": {"$in": list(expand_ancestry_types(ANCESTRY_TYPES))}}
+    if not reprocess:
+        query["first_ancestors"] = {"$exists": False}
+    total = col.count_documents(query)
+    print(f"Processing {total:,} entries...")
+
+    if total == 0:
+        print("Nothing to process.")
+        return
+
+    cursor = col.find(query, {"_id": 1, "etymology_templates": 1})
+    bulk_ops: list = []
+    processed = 0
+    with_ancestor = 0
+    start = time.time()
+
+    for doc in cursor:
+        # None still marks the entry as processed (its ancestry templates all
+        # lacked a word or language argument).
+        ancestor = primary_ancestor(doc)
+        if ancestor is not None:
+            with_ancestor += 1
+        fields = {"primary_ancestor": ancestor, "first_ancestors": first_ancestors(doc)}
+        bulk_ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": fields}))
+
+        if len(bulk_ops) >= BATCH_SIZE:
+            col.bulk_write(bulk_ops, ordered=False)
+            processed += len(bulk_ops)
+            elapsed = time.time() - start
+            rate = processed / elapsed if elapsed > 0 else 0
+            print(
+                f"  {processed:,}/{total:,} ({processed / total * 100:.1f}%) - {rate:.0f} docs/sec"
+            )
+            bulk_ops = []
+
+    if bulk_ops:
+        col.bulk_write(bulk_ops, ordered=False)
+        processed += len(bulk_ops)
+
+    data_version.stamp(client.etymology)
+
+    elapsed = time.time() - start
+    print(f"\nDone in {elapsed:.1f}s. Processed: {processed:,}, With ancestor: {with_ancestor:,}")
+
+
+if __name__ == "__main__":
+    reprocess = "--reprocess" in sys.argv
+    precompute(reprocess=reprocess)
@@ -0,0 +1,128 @@
+"""Precompute every entry's resolved ancestor chain into the ``chains`` collection.
+
+Standalone batch script using sync pymongo.
+Run outside Docker against localhost:27017.
+
+Stores ``chains.chain_record`` (ancestry with language names resolved, plus
+the uncertainty classification) per entry, so ``/etymology/{word}/chain`` and
+the ancestor half of ``TreeBuilder.expand_word`` (``CHAIN_SOURCE=chains``)
+are one indexed read instead of a doc fetch, template parse and code lookup.
+
+Entries with an ``etymology_number`` get a doc keyed by it, and each
+(word, lang) also gets one ``default: true`` doc. Both hold the first entry
+in natural order, which is the one a plain ``find_one`` on ``words`` returns.
+Writes are ordered so that first-wins ``$setOnInsert`` holds.
+
+Usage:
+    pip install pymongo
+    python -m etl.precompute_chains
+    python -m etl.precompute_chains --reprocess  # Drop and rebuild from scratch
+"""
+
+import os
+import sys
+import time
+
+from app.services import data_version
+from app.services.chains import COLLECTION, chain_record
+from pymongo import MongoClient, UpdateOne
+
+from etl.precompute_edges import load_lang_lookup
+
+MONGO_URI = os.environ.get("MONGO_URI", "mongodb://localhost:27017/etymology")
+BATCH_SIZE = 5000
+
+
+def create_indexes(chains_col) -> None:
+    """One key per (word, lang, default, etymology_number): the find_chain lookup."""
+    chains_col.create_index(
+        [("word", 1), ("lang", 1), ("default", 1), ("etymology_number", 1)],
+        unique=True,
+        name="chain_lookup",
+    )
+
+
+def chain_updates(record: dict) -> list[tuple[dict, dict]]:
+    """(filter, update) upserts of one entry's chain docs: its (word, lang)
+    default and, with an ``etymology_number``, the per-etymology doc. Both are
+    ``$setOnInsert``, so the first entry in natural order wins, as the plain
+    ``find_one`` on ``words`` returns it."""
+    updates = [
+        (
+            {"word": record["word"], "lang": record["lang"], "default": True},
+            {"$setOnInsert": record},
+        )
+    ]
+    if record["etymology_number"] is not None:
+        key = {
+            "word": record["word"],
+            "lang": record["lang"],
+            "default": False,
+            "etymology_number": record["etymology_number"],
+        }
+        updates.append((key, {"$setOnInsert": record}))
+    return updates
+
+
+def precompute(reprocess: bool = False) -> None:
+    """Write the default and per-etymology chain docs of every entry."""
+    client = MongoClient(MONGO_URI)
+    db = client.etymology
+    col = db.words
+    chains_col = db[COLLECTION]
+
+    if reprocess:
+        print(f"Dropping existing {COLLECTION} collection...")
+        chains_col.drop()
+    elif chains_col.estimated_document_count() > 0:
+        print(f"{COLLECTION} already populated. Use --reprocess to rebuild.")
+        return
+
+    print("Loading language lookup...")
+    lang_lookup = load_lang_lookup(db)
+    print(f"  {len(lang_lookup)} language codes loaded.")
+
+    print(f"Creating {COLLECTION} index...")
+    create_indexes(chains_col)
+
+    total = col.estimated_document_count()
+    print(f"Processing ~{total:,} entries...")
+
+    projection = {
+        "_id": 0,
+        "word": 1,
+        "lang": 1,
+        "etymology_number": 1,
+        "etymology_templates": 1,
+        "etymology_text": 1,
+    }
+    bulk_ops: list = []
+    start = time.time()
+
+    for processed, doc in enumerate(col.find({}, projection), 1):
+        if not doc.get("word") or not doc.get("lang"):
+            continue
+        record = chain_record(doc, lang_lookup)
+        bulk_ops.extend(
+            UpdateOne(filt, update, upsert=True) for filt, update in chain_updates(record)
+        )
+
+        if len(bulk_ops) >= BATCH_SIZE:
+            chains_col.bulk_write(bulk_ops, ordered=True)
+            bulk_ops = []
+            elapsed = time.time() - start
+            rate = processed / elapsed if elapsed > 0 else 0
+            print(f"  {processed:,}/~{total:,} - {rate:.0f} docs/sec")
+
+    if bulk_ops:
+        chains_col.bulk_write(bulk_ops, ordered=True)
+
+    data_version.stamp(db)
+
+    elapsed = time.time() - start
+    print(f"\nDone in {elapsed:.1f}s. Chain docs: {chains_col.estimated_document_count():,}")
+
+
+if __name__ == "__main__":
+    reprocess = "--reprocess" in sys.argv
+    precompute(reprocess=reprocess)
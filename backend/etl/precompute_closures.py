@@ -0,0 +1,117 @@
+"""Precompute every entry's transitive ancestor list for common-ancestor lookups.
+
+Standalone batch script using sync pymongo.
+Run outside Docker against localhost:27017.
+
+Sets ``ancestor_closure`` (``ancestor_closure.closure``) on every entry: its
+own ancestor chain, then the chain of the deepest ancestor reached (the
+default entry of that (word, lang), as a plain lookup returns it), and so on,
+with each ancestor's depth. Entries without ancestry get ``[]``, so a missing
+field means "not computed yet".
+
+Two passes: the default entries' chains are loaded into memory first, then
+every entry's closure is written. The ``ancestor_closure_lookup`` multikey
+index answers "which words descend from X" queries.
+
+Usage:
+    pip install pymongo
+    python -m etl.precompute_closures
+    python -m etl.precompute_closures --reprocess  # Recompute every entry
+"""
+
+import os
+import sys
+import time
+
+from app.services import data_version
+from app.services.ancestor_closure import FIELD, closure
+from app.services.template_parser import extract_ancestry
+from pymongo import MongoClient, UpdateOne
+
+from etl.precompute_edges import load_lang_lookup
+
+MONGO_URI = os.environ.get("MONGO_URI", "mongodb://localhost:27017/etymology")
+BATCH_SIZE = 5000
+
+_PROJECTION = {"_id": 1, "word": 1, "lang": 1, "etymology_templates": 1}
+
+
+def create_indexes(col) -> None:
+    col.create_index(
+        [(f"{FIELD}.lang_code", 1), (f"{FIELD}.word", 1)], name="ancestor_closure_lookup"
+    )
+
+
+def ancestor_hops(doc: dict, lang_lookup: dict[str, str]) -> list[dict]:
+    """The entry's ancestor chain with language names resolved."""
+    return [
+        {**anc, "lang": lang_lookup.get(anc["lang_code"], anc["lang_code"])}
+        for anc in extract_ancestry(doc)
+    ]
+
+
+def load_default_hops(col, lang_lookup: dict[str, str]) -> dict[tuple[str, str], list[dict]]:
+    """Ancestor chain of the first entry (natural order) of every (word, lang)."""
+    default_hops: dict[tuple[str, str], list[dict]] = {}
+    seen: set[tuple[str, str]] = set()
+    for doc in col.find({}, _PROJECTION):
+        key = (doc["word"], doc["lang"])
+        if key in seen:
+            continue
+        seen.add(key)
+        hops = ancestor_hops(doc, lang_lookup)
+        if hops:
+            default_hops[key] = hops
+    return default_hops
+
+
+def precompute(reprocess: bool = False) -> None:
+    """Set ``ancestor_closure`` on every entry."""
+    client = MongoClient(MONGO_URI)
+    db = client.etymology
+    col = db.words
+
+    print("Creating ancestor_closure_lookup index...")
+    create_indexes(col)
+
+    print("Loading default ancestor chains...")
+    start = time.time()
+    lang_lookup = load_lang_lookup(db)
+    default_hops = load_default_hops(col, lang_lookup)
+    print(f"  {len(default_hops):,} words with ancestry in {time.time() - start:.1f}s.")
+
+    query: dict = {} if reprocess else {FIELD: {"$exists": False}}
+    total = col.count_documents(query)
+    print(f"Processing {total:,} entries...")
+
+    bulk_ops: list = []
+    processed = 0
+    deepest = 0
+    for doc in col.find(query, _PROJECTION):
+        ancestors = closure(doc["word"], doc["lang"], ancestor_hops(doc, lang_lookup), default_hops)
+        deepest = max(deepest, len(ancestors))
+        bulk_ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": {FIELD: ancestors}}))
+
+        if len(bulk_ops) >= BATCH_SIZE:
+            col.bulk_write(bulk_ops, ordered=False)
+            processed += len(bulk_ops)
+            elapsed = time.time() - start
+            rate = processed / elapsed if elapsed > 0 else 0
+            print(
+                f"  {processed:,}/{total:,} ({processed / total * 100:.1f}%) - {rate:.0f} docs/sec"
+            )
+            bulk_ops = []
+
+    if bulk_ops:
+        col.bulk_write(bulk_ops, ordered=False)
+        processed += len(bulk_ops)
+
+    data_version.stamp(db)
+
+    elapsed = time.time() - start
+    print(f"\nDone in {elapsed:.1f}s. Processed: {processed:,}, Deepest closure: {deepest}")
+
+
+if __name__ == "__main__":
+    reprocess = "--reprocess" in sys.argv
+    precompute(reprocess=reprocess)
@@ -0,0 +1,202 @@
+"""Union-find every ``cog`` template link into cognate components.
+
+Standalone batch script using sync pymongo.
+Run outside Docker against localhost:27017.
+
+``expand_cognates`` rediscovers cognate sets at request time: a doc lookup
+per node per round, each followed by an ``expand_word``. This script joins
+every (word, lang) to the cognates its entries cite, union-finds the links
+into connected components and writes:
+
+- ``cognate_set`` (int) on every words entry whose (word, lang) is in a
+  component. Members are keyed by ``normalize_word`` form, so a ``cog``
+  mention of ``*wīną`` and the ``wina`` headword are one member, and both the
+  forms the links spell and the normalized headword are tagged
+- one ``cognate_links`` doc per distinct link::
+
+    {cognate_set, seq, from_word, from_lang, to_word, to_lang, to_lang_code}
+
+  where ``seq`` numbers a component's links in discovery order
+
+so ``COGNATE_MODE=components`` reads a word's whole component with one query
+on the ``(cognate_set, seq)`` index.
+
+Usage:
+    pip install pymongo
+    python -m etl.precompute_cognate_sets
+    python -m etl.precompute_cognate_sets --reprocess  # Drop and rebuild from scratch
+"""
+
+import os
+import sys
+import time
+
+from app.services import data_version
+from app.services.template_parser import COGNATE_TYPE, extract_cognates, normalize_word
+from app.services.tree_builder import COGNATE_LINKS
+from pymongo import InsertOne, MongoClient, UpdateMany
+
+from etl.precompute_edges import load_lang_lookup
+
+MONGO_URI = os.environ.get("MONGO_URI", "mongodb://localhost:27017/etymology")
+BATCH_SIZE = 5000
+
+Key = tuple[str, str]
+
+
+def create_indexes(links_col) -> None:
+    links_col.create_index([("cognate_set", 1), ("seq", 1)], name="cognate_set_links")
+
+
+def member(key: Key) -> Key:
+    """The union-find key of a (word, lang): the word in headword form."""
+    return normalize_word(key[0]), key[1]
+
+
+def load_links(col, lang_lookup: dict[str, str]) -> dict[tuple[Key, Key], str]:
+    """Distinct (source, target) cognate links, as the templates spell them, in
+    discovery order, mapped to the target's language code. Links between two
+    forms of one member are dropped."""
+    links: dict[tuple[Key, Key], str] = {}
+    cursor = col.find(
+        {"etymology_templates.name": COGNATE_TYPE},
+        {"_id": 0, "word": 1, "lang": 1, "etymology_templates": 1},
+    )
+    for doc in cursor:
+        source = (doc["word"], doc["lang"])
+        for cog in extract_cognates(doc):
+            target = (cog["word"], lang_lookup.get(cog["lang_code"], cog["lang_code"]))
+            if member(target) != member(source):
+                links.setdefault((source, target), cog["lang_code"])
+    return links
+
+
+def components(links) -> dict[Key, int]:
+    """Union-find (path halving, union by size) over the members of ``links``;
+    returns each member's dense component id, numbered in discovery order."""
+    index: dict[Key, int] = {}
+    parent: list[int] = []
+    size: list[int] = []
+
+    def node(key: Key) -> int:
+        i = index.get(key)
+        if i is None:
+            i = index[key] = len(parent)
+            parent.append(i)
+            size.append(1)
+        return i
+
+    def root(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for source, target in links:
+        a, b = root(node(member(source))), root(node(member(target)))
+        if a == b:
+            continue
+        if size[a] < size[b]:
+            a, b = b, a
+        parent[b] = a
+        size[a] += size[b]
+
+    set_ids: dict[int, int] = {}
+    return {key: set_ids.setdefault(root(i), len(set_ids)) for key, i in index.items()}
+
+
+def member_forms(links) -> dict[Key, list[str]]:
+    """Every word form that names each member: the forms ``links`` spell plus
+    the normalized headword."""
+    forms: dict[Key, dict[str, None]] = {}
+    for link in links:
+        for key in link:
+            forms.setdefault(member(key), {})[key[0]] = None
+    for (word, _lang), spelled in forms.items():
+        spelled[word] = None
+    return {key: list(spelled) for key, spelled in forms.items()}
+
+
+def precompute(reprocess: bool = False) -> None:
+    """Write ``cognate_links`` and the ``cognate_set`` id of every linked entry."""
+    client = MongoClient(MONGO_URI)
+    db = client.etymology
+    col = db.words
+    links_col = db[COGNATE_LINKS]
+
+    if reprocess:
+        print(f"Dropping existing {COGNATE_LINKS} collection and cognate_set ids...")
+        links_col.drop()
+        col.update_many({"cognate_set": {"$exists": True}}, {"$unset": {"cognate_set": ""}})
+    elif links_col.estimated_document_count() > 0:
+        print(f"{COGNATE_LINKS} already populated. Use --reprocess to rebuild.")
+        return
+
+    print(f"Creating {COGNATE_LINKS} indexes...")
+    create_indexes(links_col)
+
+    start = time.time()
+    print("Loading cognate links...")
+    links = load_links(col, load_lang_lookup(db))
+    set_of = components(links)
+    total_sets = len(set(set_of.values()))
+    print(f"  {len(links):,} links, {len(set_of):,} words in {total_sets:,} components.")
+
+    bulk_ops: list = []
+    seq: dict[int, int] = {}
+    for (source, target), to_lang_code in links.items():
+        set_id = set_of[member(source)]
+        seq[set_id] = seq.get(set_id, -1) + 1
+        bulk_ops.append(
+            InsertOne(
+                {
+                    "cognate_set": set_id,
+                    "seq": seq[set_id],
+                    "from_word": source[0],
+                    "from_lang": source[1],
+                    "to_word": target[0],
+                    "to_lang": target[1],
+                    "to_lang_code": to_lang_code,
+                }
+            )
+        )
+        if len(bulk_ops) >= BATCH_SIZE:
+            links_col.bulk_write(bulk_ops, ordered=False)
+            bulk_ops = []
+    if bulk_ops:
+        links_col.bulk_write(bulk_ops, ordered=False)
+        bulk_ops = []
+
+    print("Setting cognate_set on words...")
+    processed = 0
+    total = len(set_of)
+    forms = member_forms(links)
+    for key, set_id in set_of.items():
+        bulk_ops.append(
+            UpdateMany(
+                {"word": {"$in": forms[key]}, "lang": key[1]}, {"$set": {"cognate_set": set_id}}
+            )
+        )
+        if len(bulk_ops) >= BATCH_SIZE:
+            col.bulk_write(bulk_ops, ordered=False)
+            processed += len(bulk_ops)
+            elapsed = time.time() - start
+            rate = processed / elapsed if elapsed > 0 else 0
+            print(
+                f"  {processed:,}/{total:,} ({processed / total * 100:.1f}%) - {rate:.0f} words/sec"
+            )
+            bulk_ops = []
+
+    if bulk_ops:
+        col.bulk_write(bulk_ops, ordered=False)
+        processed += len(bulk_ops)
+
+    data_version.stamp(db)
+
+    elapsed = time.time() - start
+    print(f"\nDone in {elapsed:.1f}s. Words: {processed:,}, Components: {total_sets:,}")
+
+
+if __name__ == "__main__":
+    reprocess = "--reprocess" in sys.argv
+    precompute(reprocess=reprocess)
@@ -0,0 +1,115 @@
+"""Flatten Kaikki's curated ``descendants`` trees into a parent -> child edge collection.
+
+Standalone batch script using sync pymongo.
+Run outside Docker against localhost:27017.
+
+Wiktionary pages of older forms carry a hand-curated Descendants section,
+which Kaikki ships as a depth-annotated ``descendants`` list. This script
+flattens each list (``template_parser.descendant_edges``) into one doc per
+edge in the ``descendant_edges`` collection::
+
+    {parent_lang_code, parent_word, word, lang, lang_code, type}
+
+indexed on ``(parent_lang_code, parent_word, word, lang)``, so that
+``find_descendants`` with ``DESCENDANT_SOURCE=kaikki`` is one indexed range
+per parent (or per frontier) already in sort order, instead of a reverse
+``$elemMatch`` over every entry's ``etymology_templates``.
+
+Usage:
+    pip install pymongo
+    python -m etl.precompute_descendants
+    python -m etl.precompute_descendants --reprocess  # Drop and rebuild from scratch
+"""
+
+import os
+import sys
+import time
+
+from app.services import data_version
+from app.services.template_parser import descendant_edges
+from app.services.tree_builder import DESCENDANT_EDGES
+from pymongo import MongoClient, UpdateOne
+
+from etl.precompute_edges import load_lang_lookup
+
+MONGO_URI = os.environ.get("MONGO_URI", "mongodb://localhost:27017/etymology")
+BATCH_SIZE = 5000
+
+
+def create_indexes(edges_col) -> None:
+    """Unique parent -> child key; its (word, lang) suffix is the lookup sort."""
+    edges_col.create_index(
+        [("parent_lang_code", 1), ("parent_word", 1), ("word", 1), ("lang", 1)],
+        unique=True,
+        name="parent_child_unique",
+    )
+
+
+def precompute(reprocess: bool = False) -> None:
+    """Write one ``descendant_edges`` doc per edge of every ``descendants`` tree."""
+    client = MongoClient(MONGO_URI)
+    db = client.etymology
+    col = db.words
+    edges_col = db[DESCENDANT_EDGES]
+
+    if reprocess:
+        print(f"Dropping existing {DESCENDANT_EDGES} collection...")
+        edges_col.drop()
+    elif edges_col.estimated_document_count() > 0:
+        print(f"{DESCENDANT_EDGES} already populated. Use --reprocess to rebuild.")
+        return
+
+    print("Loading language lookup...")
+    lang_lookup = load_lang_lookup(db)
+    print(f"  {len(lang_lookup)} language codes loaded.")
+
+    print(f"Creating {DESCENDANT_EDGES} index...")
+    create_indexes(edges_col)
+
+    query = {"descendants.0": {"$exists": True}}
+    total = col.count_documents(query)
+    print(f"Processing {total:,} entries with descendants...")
+
+    bulk_ops: list = []
+    edge_count = 0
+    start = time.time()
+
+    for processed, doc in enumerate(
+        col.find(query, {"_id": 0, "word": 1, "lang_code": 1, "descendants": 1}), 1
+    ):
+        for edge in descendant_edges(doc):
+            edge["lang"] = lang_lookup.get(edge["lang_code"], edge["lang_code"])
+            key = {
+                "parent_lang_code": edge["parent_lang_code"],
+                "parent_word": edge["parent_word"],
+                "word": edge["word"],
+                "lang": edge["lang"],
+            }
+            # Homograph entries may list the same child: the first type wins.
+            bulk_ops.append(UpdateOne(key, {"$setOnInsert": edge}, upsert=True))
+
+        if len(bulk_ops) >= BATCH_SIZE:
+            edges_col.bulk_write(bulk_ops, ordered=False)
+            edge_count += len(bulk_ops)
+            bulk_ops = []
+            elapsed = time.time() - start
+            rate = processed / elapsed if elapsed > 0 else 0
+            print(
+                f"  {processed:,}/{total:,} ({processed / total * 100:.1f}%) - "
+                f"{edge_count:,} edges - {rate:.0f} docs/sec"
+            )
+
+    if bulk_ops:
+        edges_col.bulk_write(bulk_ops, ordered=False)
+        edge_count += len(bulk_ops)
+
+    data_version.stamp(db)
+
+    elapsed = time.time() - start
+    stored = edges_col.estimated_document_count()
+    print(f"\nDone in {elapsed:.1f}s. Edges written: {edge_count:,}, Unique edges: {stored:,}")
+
+
+if __name__ == "__main__":
+    reprocess = "--reprocess" in sys.argv
+    precompute(reprocess=reprocess)
@@ -18,6 +18,7 @@ import sys
 import time
 from functools import lru_cache
 
+from app.services import data_version
 from app.services.etymology_classifier import AFFIX_TEMPLATES
 from app.services.template_parser import normalize_word
 from pymongo import MongoClient
@@ -187,6 +188,7 @@ def precompute(reprocess: bool = False) -> None:
     print("\nCreating indexes...")
     edges_col.create_index([("to_word", 1), ("to_lang", 1)])
     edges_col.create_index([("from_word", 1), ("from_lang", 1)])
+    data_version.stamp(db)
 
     print(
         f"\nDone in {elapsed:.1f}s. "
@@ -0,0 +1,78 @@
+"""Precompute the case- and diacritic-insensitive search key of every entry.
+
+Standalone batch script using sync pymongo.
+Run outside Docker against localhost:27017.
+
+Sets ``word_folded`` (``template_parser.fold_word``: casefold, then NFKD with
+combining marks stripped) on every entry, and creates the
+``word_folded_prefix`` index that ``/search?mode=folded`` range-scans, so
+"rome" finds "Rome" and "vinum" finds "vīnum" without a case-insensitive or
+unanchored regex.
+
+Usage:
+    pip install pymongo
+    python -m etl.precompute_folded_words
+    python -m etl.precompute_folded_words --reprocess  # Recompute every entry
+"""
+
+import os
+import sys
+import time
+
+from app.services import data_version
+from app.services.template_parser import fold_word
+from pymongo import MongoClient, UpdateOne
+
+MONGO_URI = os.environ.get("MONGO_URI", "mongodb://localhost:27017/etymology")
+BATCH_SIZE = 5000
+
+
+def create_indexes(col) -> None:
+    col.create_index([("word_folded", 1)], name="word_folded_prefix")
+
+
+def precompute(reprocess: bool = False) -> None:
+    """Set ``word_folded`` on every entry."""
+    client = MongoClient(MONGO_URI)
+    db = client.etymology
+    col = db.words
+
+    print("Creating word_folded_prefix index...")
+    create_indexes(col)
+
+    query: dict = {} if reprocess else {"word_folded": {"$exists": False}}
+    total = col.count_documents(query)
+    print(f"Processing {total:,} entries...")
+
+    start = time.time()
+    bulk_ops: list = []
+    processed = 0
+    changed = 0
+    for doc in col.find(query, {"_id": 1, "word": 1}):
+        folded = fold_word(doc["word"])
+        changed += folded != doc["word"]
+        bulk_ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"word_folded": folded}}))
+
+        if len(bulk_ops) >= BATCH_SIZE:
+            col.bulk_write(bulk_ops, ordered=False)
+            processed += len(bulk_ops)
+            elapsed = time.time() - start
+            rate = processed / elapsed if elapsed > 0 else 0
+            print(
+                f"  {processed:,}/{total:,} ({processed / total * 100:.1f}%) - {rate:.0f} docs/sec"
+            )
+            bulk_ops = []
+
+    if bulk_ops:
+        col.bulk_write(bulk_ops, ordered=False)
+        processed += len(bulk_ops)
+
+    data_version.stamp(db)
+
+    elapsed = time.time() - start
+    print(f"\nDone in {elapsed:.1f}s. Processed: {processed:,}, Folded differently: {changed:,}")
+
+
+if __name__ == "__main__":
+    reprocess = "--reprocess" in sys.argv
+    precompute(reprocess=reprocess)
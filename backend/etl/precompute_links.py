@@ -0,0 +1,168 @@
+"""Precompute how every template-referenced word resolves to a headword.
+
+Standalone batch script using sync pymongo.
+Run outside Docker against localhost:27017.
+
+Templates reference words in their source spelling: reconstructions keep the
+leading ``*``, Latin keeps its macrons. Those forms are usually not headwords,
+so every lookup of one costs a miss on the raw form and then a second read of
+``normalize_word(form)``. This script resolves each referenced
+``(word, lang)`` once and stores, in the ``word_links`` collection, the ones
+whose raw form is *not* a headword::
+
+    {word, lang, target}   # target: the normalized headword, or None (missing)
+
+Raw forms that are headwords need no entry — the words lookup itself hits —
+so the collection stays small. ``app.services.word_links`` reads a word and
+its link in one round trip (``LINK_RESOLUTION=true``).
+
+Usage:
+    pip install pymongo
+    python -m etl.precompute_links
+    python -m etl.precompute_links --reprocess  # Drop and rebuild from scratch
+"""
+
+import os
+import sys
+import time
+
+from app.services import data_version
+from app.services.etymology_classifier import AFFIX_TEMPLATES, MENTION_TEMPLATES
+from app.services.template_parser import (
+    ANCESTRY_TYPES,
+    COGNATE_TYPE,
+    expand_ancestry_types,
+    normalize_word,
+)
+from app.services.word_links import COLLECTION
+from pymongo import MongoClient, UpdateOne
+
+from etl.precompute_edges import load_lang_lookup
+
+MONGO_URI = os.environ.get("MONGO_URI", "mongodb://localhost:27017/etymology")
+BATCH_SIZE = 5000
+
+_ANCESTRY_NAMES = expand_ancestry_types(ANCESTRY_TYPES)
+
+
+def template_references(doc: dict, lang_lookup: dict[str, str]) -> set[tuple[str, str]]:
+    """Return the (word, lang name) keys a document's templates make the API look up:
+    ancestry (args 2/3), cognate and mention (args 1/2) and affix components
+    (arg 1, args 2-5)."""
+    refs = set()
+    for tmpl in doc.get("etymology_templates", []):
+        name = tmpl.get("name", "")
+        args = tmpl.get("args", {})
+        if name in _ANCESTRY_NAMES:
+            pairs = [(args.get("2", ""), args.get("3", ""))]
+        elif name == COGNATE_TYPE or name in MENTION_TEMPLATES:
+            pairs = [(args.get("1", ""), args.get("2", ""))]
+        elif name in AFFIX_TEMPLATES:
+            pairs = [(args.get("1", ""), args.get(key, "")) for key in ("2", "3", "4", "5")]
+        else:
+            continue
+        for lang_code, word in pairs:
+            if word and lang_code:
+                refs.add((word, lang_lookup.get(lang_code, lang_code)))
+    return refs
+
+
+def resolve_batch(col, keys: list[tuple[str, str]]) -> list[dict]:
+    """Return link docs for the keys of ``keys`` whose raw form is not a headword."""
+    forms = {}
+    for word, lang in keys:
+        forms[(word, lang)] = None
+        forms[(normalize_word(word), lang)] = None
+    found = {
+        (doc["word"], doc["lang"])
+        for doc in col.find(
+            {"$or": [{"word": word, "lang": lang} for word, lang in forms]},
+            {"_id": 0, "word": 1, "lang": 1},
+        )
+    }
+    links = []
+    for word, lang in keys:
+        if (word, lang) in found:
+            continue
+        normalized = normalize_word(word)
+        target = normalized if normalized != word and (normalized, lang) in found else None
+        links.append({"word": word, "lang": lang, "target": target})
+    return links
+
+
+def precompute(reprocess: bool = False) -> None:
+    """Resolve every template-referenced (word, lang) into ``word_links``."""
+    client = MongoClient(MONGO_URI)
+    db = client.etymology
+    col = db.words
+    links_col = db[COLLECTION]
+
+    if reprocess:
+        print(f"Dropping existing {COLLECTION} collection...")
+        links_col.drop()
+    elif links_col.estimated_document_count() > 0:
+        print(f"{COLLECTION} already populated. Use --reprocess to rebuild.")
+        return
+
+    print("Loading language lookup...")
+    lang_lookup = load_lang_lookup(db)
+    print(f"  {len(lang_lookup)} language codes loaded.")
+
+    links_col.create_index([("word", 1), ("lang", 1)], unique=True, name="word_lang_unique")
+
+    query = {"etymology_templates": {"$exists": True, "$ne": []}}
+    total = col.count_documents(query)
+    print(f"Scanning {total:,} entries with templates...")
+
+    seen: set[tuple[str, str]] = set()
+    pending: list[tuple[str, str]] = []
+    stored = 0
+    missing = 0
+    start = time.time()
+
+    def flush() -> None:
+        nonlocal stored, missing
+        links = resolve_batch(col, pending)
+        if links:
+            links_col.bulk_write(
+                [
+                    UpdateOne(
+                        {"word": link["word"], "lang": link["lang"]}, {"$set": link}, upsert=True
+                    )
+                    for link in links
+                ],
+                ordered=False,
+            )
+        stored += len(links)
+        missing += sum(1 for link in links if link["target"] is None)
+        pending.clear()
+
+    for scanned, doc in enumerate(col.find(query, {"_id": 0, "etymology_templates": 1}), 1):
+        for key in template_references(doc, lang_lookup):
+            if key not in seen:
+                seen.add(key)
+                pending.append(key)
+        if len(pending) >= BATCH_SIZE:
+            flush()
+            elapsed = time.time() - start
+            rate = scanned / elapsed if elapsed > 0 else 0
+            print(
+                f"  {scanned:,}/{total:,} ({scanned / total * 100:.1f}%) - "
+                f"{len(seen):,} refs, {stored:,} links - {rate:.0f} docs/sec"
+            )
+
+    if pending:
+        flush()
+
+    data_version.stamp(db)
+
+    elapsed = time.time() - start
+    print(
+        f"\nDone in {elapsed:.1f}s. References: {len(seen):,}, "
+        f"Links: {stored:,} ({stored - missing:,} normalized, {missing:,} missing)"
+    )
+
+
+if __name__ == "__main__":
+    reprocess = "--reprocess" in sys.argv
+    precompute(reprocess=reprocess)
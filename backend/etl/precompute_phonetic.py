@@ -12,6 +12,7 @@ import re
 import sys
 import time
 
+from app.services import data_version
 from lingpy import ipa2tokens, tokens2class
 from pymongo import MongoClient, UpdateOne
 
@@ -142,6 +143,7 @@ def precompute(reprocess: bool = False) -> None:
     if bulk_ops:
         col.bulk_write(bulk_ops)
         processed += len(bulk_ops)
+    data_version.stamp(client.etymology)
 
     elapsed = time.time() - start
     print(
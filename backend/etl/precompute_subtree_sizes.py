@@ -0,0 +1,163 @@
+"""Precompute each entry's descendant count and subtree size for ranked descendant caps.
+
+Standalone batch script using sync pymongo.
+Run outside Docker against localhost:27017.
+Requires ``primary_ancestor`` (``make precompute-ancestors``).
+
+``find_descendants`` keeps at most 50 children per parent. Ranking them by
+how prolific they are at request time would need a lookup per candidate, so
+this script computes it offline over the ``primary_ancestor`` links, keyed by
+(lang_code, normalized word) as in ``primary_ancestor.word_normalized``:
+
+- ``descendant_count``: number of distinct immediate children
+- ``subtree_size``: number of descendants below the entry, summed over its
+  children (a key reachable through two parents counts under both; a cycle
+  is cut where it closes)
+
+Both are set on every entry (0 for leaves). The descendant lookup sorts by
+``subtree_size`` descending ahead of its alphabetical tie-break, and the
+``primary_ancestor_ranked`` and ``first_ancestor_<type>_ranked`` indexes serve
+that sort straight from the index.
+
+Usage:
+    pip install pymongo
+    python -m etl.precompute_subtree_sizes
+    python -m etl.precompute_subtree_sizes --reprocess  # Recompute every entry
+"""
+
+import os
+import sys
+import time
+from collections import defaultdict
+
+from app.services import data_version
+from app.services.template_parser import ANCESTRY_TYPES, normalize_word
+from pymongo import MongoClient, UpdateOne
+
+MONGO_URI = os.environ.get("MONGO_URI", "mongodb://localhost:27017/etymology")
+BATCH_SIZE = 5000
+
+Key = tuple[str, str]
+
+
+def create_indexes(col) -> None:
+    """Parent key, then the full descendant sort, so the capped lookup is an
+    index range scan already in ``_DESCENDANT_SORT`` order: one index on
+    ``primary_ancestor`` and one on each type's ``first_ancestors`` record
+    (the lookup under a type filter). Supersedes the unranked ``_lookup``
+    indexes of ``etl.precompute_ancestors``."""
+    parents = [("primary_ancestor", "primary_ancestor")] + [
+        (f"first_ancestors.{t}", f"first_ancestor_{t}") for t in sorted(ANCESTRY_TYPES)
+    ]
+    existing = col.index_information()
+    for field, name in parents:
+        col.create_index(
+            [
+                (f"{field}.lang_code", 1),
+                (f"{field}.word", 1),
+                ("subtree_size", -1),
+                ("word", 1),
+                ("lang", 1),
+                ("pos", 1),
+                ("etymology_number", 1),
+            ],
+            name=f"{name}_ranked",
+        )
+        if f"{name}_lookup" in existing:
+            col.drop_index(f"{name}_lookup")
+
+
+def load_children(col) -> dict[Key, set[Key]]:
+    """Map each parent key to the keys of the entries whose primary ancestor it is."""
+    children: dict[Key, set[Key]] = defaultdict(set)
+    cursor = col.find(
+        {"primary_ancestor": {"$ne": None}},
+        {"_id": 0, "word": 1, "lang_code": 1, "primary_ancestor": 1},
+    )
+    for doc in cursor:
+        parent = doc["primary_ancestor"]
+        child = (doc.get("lang_code", ""), normalize_word(doc.get("word", "")))
+        children[(parent["lang_code"], parent["word_normalized"])].add(child)
+    return children
+
+
+def subtree_sizes(children: dict[Key, set[Key]]) -> dict[Key, int]:
+    """Post-order subtree sizes of every parent key (iterative, cycle-safe)."""
+    sizes: dict[Key, int] = {}
+    for root in children:
+        if root in sizes:
+            continue
+        stack = [(root, iter(children[root]))]
+        on_path = {root}
+        while stack:
+            node, pending = stack[-1]
+            child = next(pending, None)
+            if child is None:
+                stack.pop()
+                on_path.discard(node)
+                sizes[node] = sum(1 + sizes.get(c, 0) for c in children[node])
+                continue
+            if child in sizes or child in on_path or child not in children:
+                continue
+            on_path.add(child)
+            stack.append((child, iter(children[child])))
+    return sizes
+
+
+def precompute(reprocess: bool = False) -> None:
+    """Set ``descendant_count`` / ``subtree_size`` on every entry."""
+    client = MongoClient(MONGO_URI)
+    col = client.etymology.words
+
+    print("Creating ranked descendant indexes...")
+    create_indexes(col)
+
+    print("Loading primary_ancestor links...")
+    start = time.time()
+    children = load_children(col)
+    print(f"  {len(children):,} parents with children.")
+    sizes = subtree_sizes(children)
+    print(f"  Subtree sizes computed in {time.time() - start:.1f}s.")
+
+    query: dict = {} if reprocess else {"subtree_size": {"$exists": False}}
+    total = col.count_documents(query)
+    print(f"Processing {total:,} entries...")
+
+    bulk_ops: list = []
+    processed = 0
+    ranked = 0
+    for doc in col.find(query, {"_id": 1, "word": 1, "lang_code": 1}):
+        key = (doc.get("lang_code", ""), normalize_word(doc.get("word", "")))
+        size = sizes.get(key, 0)
+        if size:
+            ranked += 1
+        bulk_ops.append(
+            UpdateOne(
+                {"_id": doc["_id"]},
+                {"$set": {"descendant_count": len(children.get(key, ())), "subtree_size": size}},
+            )
+        )
+
+        if len(bulk_ops) >= BATCH_SIZE:
+            col.bulk_write(bulk_ops, ordered=False)
+            processed += len(bulk_ops)
+            elapsed = time.time() - start
+            rate = processed / elapsed if elapsed > 0 else 0
+            print(
+                f"  {processed:,}/{total:,} ({processed / total * 100:.1f}%) - {rate:.0f} docs/sec"
+            )
+            bulk_ops = []
+
+    if bulk_ops:
+        col.bulk_write(bulk_ops, ordered=False)
+        processed += len(bulk_ops)
+
+    data_version.stamp(client.etymology)
+
+    elapsed = time.time() - start
+    print(f"\nDone in {elapsed:.1f}s. Processed: {processed:,}, With descendants: {ranked:,}")
+
+
+if __name__ == "__main__":
+    reprocess = "--reprocess" in sys.argv
+    precompute(reprocess=reprocess)
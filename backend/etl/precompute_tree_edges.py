@@ -0,0 +1,122 @@
+"""Precompute the parent -> child edge collection walked by the ``$graphLookup`` engine.
+
+Standalone batch script using sync pymongo.
+Run outside Docker against localhost:27017.
+Requires ``primary_ancestor`` (``make precompute-ancestors``); picks up
+``subtree_size`` when ``make precompute-subtree-sizes`` has run.
+
+Writes one ``tree_edges`` doc per (parent, child word, child lang)::
+
+    {parent: "lang_code:word", child: "lang_code:word", word, lang, lang_code,
+     type, subtree_size}
+
+The edges are the ``primary_ancestor`` links: ``parent`` is the raw template
+key, as ``find_descendants`` matches it, and ``child`` is the entry's own key.
+Entries are read in ``_DESCENDANT_SORT`` order, so when homographs differ the
+first one's edge type wins. The ``(parent, type)`` index serves the
+``connectToField`` lookups and the ``restrictSearchWithMatch`` filter that
+``GraphLookupTreeBuilder`` issues.
+
+Usage:
+    pip install pymongo
+    python -m etl.precompute_tree_edges
+    python -m etl.precompute_tree_edges --reprocess  # Drop and rebuild from scratch
+"""
+
+import os
+import sys
+import time
+
+from app.services import data_version
+from app.services.graph_lookup import COLLECTION, edge_key
+from pymongo import MongoClient, UpdateOne
+
+MONGO_URI = os.environ.get("MONGO_URI", "mongodb://localhost:27017/etymology")
+BATCH_SIZE = 5000
+
+
+def create_indexes(edges_col) -> None:
+    edges_col.create_index(
+        [("parent", 1), ("word", 1), ("lang", 1)], unique=True, name="edge_unique"
+    )
+    edges_col.create_index([("parent", 1), ("type", 1)], name="parent_type")
+
+
+def precompute(reprocess: bool = False) -> None:
+    """Write one ``tree_edges`` doc per distinct primary_ancestor link."""
+    client = MongoClient(MONGO_URI)
+    db = client.etymology
+    col = db.words
+    edges_col = db[COLLECTION]
+
+    if reprocess:
+        print(f"Dropping existing {COLLECTION} collection...")
+        edges_col.drop()
+    elif edges_col.estimated_document_count() > 0:
+        print(f"{COLLECTION} already populated. Use --reprocess to rebuild.")
+        return
+
+    print(f"Creating {COLLECTION} indexes...")
+    create_indexes(edges_col)
+
+    query = {"primary_ancestor": {"$ne": None}}
+    total = col.count_documents(query)
+    print(f"Processing {total:,} entries with a primary ancestor...")
+
+    cursor = (
+        col.find(
+            query,
+            {
+                "_id": 0,
+                "word": 1,
+                "lang": 1,
+                "lang_code": 1,
+                "primary_ancestor": 1,
+                "subtree_size": 1,
+            },
+        )
+        .sort([("word", 1), ("lang", 1), ("pos", 1), ("etymology_number", 1)])
+        .allow_disk_use(True)
+    )
+    bulk_ops: list = []
+    processed = 0
+    start = time.time()
+
+    for doc in cursor:
+        parent = doc["primary_ancestor"]
+        edge = {
+            "parent": edge_key(parent["lang_code"], parent["word"]),
+            "child": edge_key(doc.get("lang_code", ""), doc["word"]),
+            "word": doc["word"],
+            "lang": doc["lang"],
+            "lang_code": doc.get("lang_code", ""),
+            "type": parent["type"],
+            "subtree_size": doc.get("subtree_size", 0),
+        }
+        key = {"parent": edge["parent"], "word": edge["word"], "lang": edge["lang"]}
+        bulk_ops.append(UpdateOne(key, {"$setOnInsert": edge}, upsert=True))
+
+        if len(bulk_ops) >= BATCH_SIZE:
+            edges_col.bulk_write(bulk_ops, ordered=True)
+            processed += len(bulk_ops)
+            elapsed = time.time() - start
+            rate = processed / elapsed if elapsed > 0 else 0
+            print(
+                f"  {processed:,}/{total:,} ({processed / total * 100:.1f}%) - {rate:.0f} docs/sec"
+            )
+            bulk_ops = []
+
+    if bulk_ops:
+        edges_col.bulk_write(bulk_ops, ordered=True)
+        processed += len(bulk_ops)
+
+    data_version.stamp(db)
+
+    elapsed = time.time() - start
+    stored = edges_col.estimated_document_count()
+    print(f"\nDone in {elapsed:.1f}s. Processed: {processed:,}, Edges: {stored:,}")
+
+
+if __name__ == "__main__":
+    reprocess = "--reprocess" in sys.argv
+    precompute(reprocess=reprocess)
@@ -2,22 +2,70 @@
 
 from typing import Any
 
+import httpx
 import pytest
-from app.services import concept_resolver, lang_cache
+from app.database import get_words_collection
+from app.main import app
+from app.services import (
+    concept_resolver,
+    csr_graph,
+    data_version,
+    descendant_cache,
+    lang_cache,
+    search_cache,
+    search_index,
+    tree_cache,
+    word_cache,
+    word_links,
+)
 
 
 @pytest.fixture(autouse=True)
 def _reset_module_caches():
-    """lang_cache and concept_resolver._concept_cache are module-global caches by
-    explicit design (SPC-00020); reset both around every test so no test depends
-    on load order or a prior test's state."""
-    lang_cache._code_to_name.clear()
-    lang_cache._name_to_code.clear()
-    concept_resolver._concept_cache.clear()
+    """lang_cache, concept_resolver._concept_cache and the word/tree/descendant
+    caches are module-global caches by explicit design (SPC-00020); reset them
+    (and the remembered data version) around every test so no test depends on
+    load order or a prior test's state."""
+    _clear_module_caches()
     yield
+    _clear_module_caches()
+
+
+def _clear_module_caches() -> None:
     lang_cache._code_to_name.clear()
     lang_cache._name_to_code.clear()
     concept_resolver._concept_cache.clear()
+    word_cache.reset()
+    tree_cache.reset()
+    descendant_cache.reset()
+    data_version.reset()
+    csr_graph.reset()
+    search_index.reset()
+    search_cache.reset()
+    word_links.reset()
+
+
+@pytest.fixture
+async def make_client():
+    """Factory: hand it a fake, get an in-process AsyncClient bound to it. One
+    override is active at a time (drive one client's requests to completion
+    before making another); overrides are cleared and clients closed on teardown.
+    """
+    clients: list[httpx.AsyncClient] = []
+
+    async def _make(fake: Any) -> httpx.AsyncClient:
+        app.dependency_overrides[get_words_collection] = lambda: fake
+        transport = httpx.ASGITransport(app=app)
+        client = httpx.AsyncClient(transport=transport, base_url="http://test")
+        clients.append(client)
+        return client
+
+    try:
+        yield _make
+    finally:
+        for client in clients:
+            await client.aclose()
+        app.dependency_overrides.clear()
 
 
 @pytest.fixture
@@ -2,6 +2,7 @@
 
 Implements only the surface TreeBuilder and its collaborators actually use:
 `find_one`, `find` (-> a cursor with `.sort()`/`.limit()`/`.to_list()`/`async for`),
+`aggregate` (the stages in `_STAGES`),
 the `$elemMatch` positional-arg matcher `find_descendants` relies on, and the
 `col.database[...]` / `.get_collection(...)` sideways hops used by
 `_expand_compound_edges` (etymology_edges) and `lang_cache` (languages).
@@ -13,6 +14,7 @@ against real Mongo (not yet added in this pass).
 
 from __future__ import annotations
 
+import copy
 import re
 from typing import Any
 
@@ -41,6 +43,8 @@ def _op_elem_match(value: Any, operand: Any, _condition: dict) -> bool:
 _OPERATORS = {
     "$in": lambda value, operand, _cond: value in operand,
     "$ne": lambda value, operand, _cond: value != operand,
+    "$gte": lambda value, operand, _cond: isinstance(value, str) and value >= operand,
+    "$lt": lambda value, operand, _cond: isinstance(value, str) and value < operand,
     "$exists": lambda value, operand, _cond: (value is not None) == operand,
     "$regex": _op_regex,
     "$elemMatch": _op_elem_match,
@@ -49,7 +53,8 @@ _OPERATORS = {
 
 def _matches_field(value: Any, condition: Any) -> bool:
     """Match one field value against a condition: scalar equality, or an
-    operator dict ($in/$ne/$exists/$regex/$elemMatch).
+    operator dict ($in/$ne/$gte/$lt/$exists/$regex/$elemMatch; the range
+    operators compare strings only).
 
     Unknown operators fall back to whole-dict equality, so a query using an
     operator the fake doesn't model fails loudly in a test rather than silently
@@ -94,39 +99,205 @@ def _project(doc: dict, projection: dict | None) -> dict:
     return {k: doc[k] for k in included if k in doc}
 
 
-def _sort_key_for(spec: list[tuple[str, int]]):
-    """Build a sort key matching Mongo's ascending-sort semantics: missing/null
-    fields sort before present ones, never raising on cross-doc type mismatches."""
+def _sort_docs(docs: list[dict], spec: list[tuple[str, int]]) -> list[dict]:
+    """Sort with Mongo's semantics: missing/null fields are the lowest values
+    (first ascending, last descending), never raising on cross-doc type
+    mismatches. One stable pass per field, least significant first."""
+    for field, direction in reversed(spec):
 
-    def key(doc: dict) -> tuple:
-        parts = []
-        for field, _direction in spec:
+        def key(doc: dict, field: str = field) -> tuple:
             value = _get_path(doc, field)
-            parts.append((value is not None, value if value is not None else ""))
-        return tuple(parts)
+            return (value is not None, value if value is not None else "")
+
+        docs = sorted(docs, key=key, reverse=direction == -1)
+    return docs
+
+
+def _expr_operand(operand: Any, doc: dict, variables: dict) -> Any:
+    if isinstance(operand, str) and operand.startswith("$$"):
+        return variables.get(operand[2:])
+    if isinstance(operand, str) and operand.startswith("$"):
+        return _get_path(doc, operand[1:])
+    return operand
+
+
+def _eval_expr(expr: dict, doc: dict, variables: dict) -> bool:
+    """Evaluate the ``$expr`` subset the services issue: ``$eq`` and ``$and``."""
+    ((op, args),) = expr.items()
+    if op == "$and":
+        return all(_eval_expr(sub, doc, variables) for sub in args)
+    if op == "$eq":
+        left, right = (_expr_operand(arg, doc, variables) for arg in args)
+        return left == right
+    msg = f"fake $expr does not model {op}"
+    raise NotImplementedError(msg)
+
+
+def _stage_match(docs: list[dict], spec: dict, _db: Any, variables: dict) -> list[dict]:
+    spec = dict(spec)
+    expr = spec.pop("$expr", None)
+    return [
+        doc
+        for doc in docs
+        if _matches_filter(doc, spec) and (expr is None or _eval_expr(expr, doc, variables))
+    ]
+
+
+def _stage_lookup(docs: list[dict], spec: dict, db: Any, _variables: dict) -> list[dict]:
+    """``$lookup`` with ``localField``/``foreignField`` and an optional
+    ``let`` + ``pipeline`` run over the equality-matched foreign docs."""
+    foreign = db[spec["from"]]._docs
+    out = []
+    for doc in docs:
+        matched = [
+            f
+            for f in foreign
+            if _get_path(f, spec["foreignField"]) == _get_path(doc, spec["localField"])
+        ]
+        variables = {
+            name: _expr_operand(value, doc, {}) for name, value in spec.get("let", {}).items()
+        }
+        matched = _run_pipeline(matched, spec.get("pipeline", []), db, variables)
+        out.append({**doc, spec["as"]: matched})
+    return out
+
+
+def _stage_union_with(docs: list[dict], spec: dict, db: Any, _variables: dict) -> list[dict]:
+    other = db[spec["coll"]]
+    return docs + _run_pipeline(list(other._docs), spec.get("pipeline", []), db, {})
+
+
+def _stage_graph_lookup(docs: list[dict], spec: dict, db: Any, _variables: dict) -> list[dict]:
+    """Breadth-first ``$graphLookup``: each foreign doc is collected once, at
+    the first depth it is reached, up to ``maxDepth``."""
+    foreign = [
+        f
+        for f in db[spec["from"]]._docs
+        if _matches_filter(f, spec.get("restrictSearchWithMatch", {}))
+    ]
+    out = []
+    for doc in docs:
+        start = _expr_operand(spec["startWith"], doc, {})
+        values = set(start if isinstance(start, list) else [start])
+        found: list[dict] = []
+        collected: set[int] = set()
+        depth = 0
+        while values and depth <= spec.get("maxDepth", float("inf")):
+            level = [
+                f
+                for f in foreign
+                if id(f) not in collected and _get_path(f, spec["connectToField"]) in values
+            ]
+            collected.update(id(f) for f in level)
+            found.extend(level)
+            values = {_get_path(f, spec["connectFromField"]) for f in level}
+            depth += 1
+        out.append({**doc, spec["as"]: found})
+    return out
+
+
+def _path_values(value: Any, parts: list[str]) -> Any:
+    """A field path as aggregation expressions resolve it: through arrays,
+    collecting each element's value."""
+    for i, part in enumerate(parts):
+        if isinstance(value, list):
+            return [v for v in (_path_values(elem, parts[i:]) for elem in value) if v is not None]
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
 
-    return key
+
+def _value_expr(expr: Any, doc: dict) -> Any:
+    """Evaluate the value expressions ``$group`` is given: ``"$field.path"``,
+    ``$arrayElemAt`` and documents of those (compound ``_id``)."""
+    if isinstance(expr, str) and expr.startswith("$"):
+        return _path_values(doc, expr[1:].split("."))
+    if isinstance(expr, dict) and "$arrayElemAt" in expr:
+        array, idx = (_value_expr(arg, doc) for arg in expr["$arrayElemAt"])
+        return array[idx] if isinstance(array, list) and -len(array) <= idx < len(array) else None
+    if isinstance(expr, dict):
+        return {key: _value_expr(sub, doc) for key, sub in expr.items()}
+    return expr
+
+
+def _stage_group(docs: list[dict], spec: dict, _db: Any, _variables: dict) -> list[dict]:
+    """``$group`` with ``$first``, ``$push`` and ``$addToSet`` accumulators;
+    groups come out in first-seen order."""
+    spec = dict(spec)
+    id_expr = spec.pop("_id")
+    groups: dict[str, dict] = {}
+    for doc in docs:
+        group_id = _value_expr(id_expr, doc)
+        group = groups.setdefault(repr(group_id), {"_id": group_id})
+        for field, accumulator in spec.items():
+            ((op, expr),) = accumulator.items()
+            value = _value_expr(expr, doc)
+            if op == "$first":
+                group.setdefault(field, value)
+            elif op == "$push":
+                group.setdefault(field, []).append(value)
+            elif op == "$addToSet":
+                values = group.setdefault(field, [])
+                if value is not None and value not in values:
+                    values.append(value)
+            else:
+                msg = f"fake $group does not model {op}"
+                raise NotImplementedError(msg)
+    return list(groups.values())
+
+
+# Aggregation stages the services issue; each maps (docs, spec, db, let-vars) -> docs.
+_STAGES = {
+    "$match": _stage_match,
+    "$limit": lambda docs, n, _db, _vars: docs[:n],
+    "$sort": lambda docs, spec, _db, _vars: _sort_docs(docs, list(spec.items())),
+    "$addFields": lambda docs, fields, _db, _vars: [{**d, **fields} for d in docs],
+    "$group": _stage_group,
+    "$project": lambda docs, projection, _db, _vars: [_project(d, projection) for d in docs],
+    "$lookup": _stage_lookup,
+    "$unionWith": _stage_union_with,
+    "$graphLookup": _stage_graph_lookup,
+}
+
+
+def _run_pipeline(docs: list[dict], pipeline: list[dict], db: Any, variables: dict) -> list[dict]:
+    for stage in pipeline:
+        ((name, spec),) = stage.items()
+        docs = _STAGES[name](docs, spec, db, variables)
+    return docs
 
 
 class FakeCursor:
     """Mimics the subset of an AsyncIOMotorCursor that tree_builder.py uses."""
 
-    def __init__(self, docs: list[dict]):
+    def __init__(self, docs: list[dict], projection: dict | None = None):
+        # Docs are held unprojected: as in Mongo, sort sees fields the
+        # projection drops.
         self._docs = docs
+        self._projection = projection
 
     def sort(self, spec: list[tuple[str, int]]) -> FakeCursor:
-        self._docs = sorted(self._docs, key=_sort_key_for(spec))
+        self._docs = _sort_docs(self._docs, spec)
         return self
 
     def limit(self, n: int) -> FakeCursor:
         self._docs = self._docs[:n]
         return self
 
+    def hint(self, _index: list[tuple[str, int]]) -> FakeCursor:
+        # Reads scan natural order: the tie order of the hinted `word` index.
+        return self
+
+    def _results(self) -> list[dict]:
+        return [_project(doc, self._projection) for doc in self._docs]
+
     async def to_list(self, length: int | None = None) -> list[dict]:
-        return self._docs[:length] if length is not None else list(self._docs)
+        results = self._results()
+        return results[:length] if length is not None else results
 
     def __aiter__(self) -> FakeCursor:
-        self._iter = iter(self._docs)
+        self._iter = iter(self._results())
         return self
 
     async def __anext__(self) -> dict:
@@ -137,35 +308,53 @@ class FakeCursor:
 
 
 class FakeCollection:
-    """A single fake collection: matches filters, returns cursors, no indexes."""
+    """A single fake collection: matches filters, returns cursors, no indexes.
+
+    Every read is appended to ``queries`` as ``(method, filter)`` so tests can
+    assert round-trip counts, the property the batching work is about.
+    """
 
-    def __init__(self, docs: list[dict] | None = None, database: FakeDatabase | None = None):
+    def __init__(
+        self,
+        docs: list[dict] | None = None,
+        database: FakeDatabase | None = None,
+        name: str = "",
+    ):
         self._docs = docs or []
         self.database = database if database is not None else FakeDatabase()
+        self.name = name
+        self.queries: list[tuple[str, dict]] = []
 
     async def find_one(self, filt: dict, projection: dict | None = None) -> dict | None:
+        self.queries.append(("find_one", filt))
         for doc in self._docs:
             if _matches_filter(doc, filt):
                 return _project(doc, projection)
         return None
 
     def find(self, filt: dict, projection: dict | None = None) -> FakeCursor:
-        matched = [_project(doc, projection) for doc in self._docs if _matches_filter(doc, filt)]
-        return FakeCursor(matched)
+        self.queries.append(("find", filt))
+        matched = [doc for doc in self._docs if _matches_filter(doc, filt)]
+        return FakeCursor(matched, projection)
+
+    def aggregate(self, pipeline: list[dict]) -> FakeCursor:
+        """Run the modeled stages (see ``_STAGES``) over this collection's docs."""
+        self.queries.append(("aggregate", pipeline))
+        return FakeCursor(_run_pipeline(list(self._docs), pipeline, self.database, {}))
 
     async def replace_one(self, filt: dict, replacement: dict, upsert: bool = False) -> None:
         """Replace the first matching doc, or insert on upsert.
 
         Enough of Motor's replace_one for the SPC-00021 layouts write-through
         cache (keyed by ``{"_id": ...}``); return value is unused by callers so
-        it is omitted.
+        it is omitted. The stored doc is a deep copy, as BSON encoding would make.
         """
         for idx, doc in enumerate(self._docs):
             if _matches_filter(doc, filt):
-                self._docs[idx] = dict(replacement)
+                self._docs[idx] = copy.deepcopy(replacement)
                 return
         if upsert:
-            self._docs.append(dict(replacement))
+            self._docs.append(copy.deepcopy(replacement))
 
 
 class FakeDatabase:
@@ -176,26 +365,33 @@ class FakeDatabase:
         self._collections = collections or {}
 
     def __getitem__(self, name: str) -> FakeCollection:
-        return self._collections.setdefault(name, FakeCollection())
+        if name not in self._collections:
+            self._collections[name] = FakeCollection(database=self, name=name)
+        return self._collections[name]
 
     def get_collection(self, name: str) -> FakeCollection:
         return self[name]
 
 
 class FakeWordsCollection(FakeCollection):
-    """The `words` collection fake, with `etymology_edges`/`languages` siblings
-    wired through `.database` exactly as the real Motor collection exposes them."""
+    """The `words` collection fake, with `etymology_edges`/`languages`/`word_links`/
+    `descendant_edges` siblings wired through `.database` exactly as the real Motor collection exposes them."""
 
     def __init__(
         self,
         docs: list[dict],
         etymology_edges: list[dict] | None = None,
         languages: list[dict] | None = None,
+        word_links: list[dict] | None = None,
+        descendant_edges: list[dict] | None = None,
     ):
         database = FakeDatabase(
             {
                 "etymology_edges": FakeCollection(etymology_edges or []),
                 "languages": FakeCollection(languages or []),
+                "word_links": FakeCollection(word_links or []),
+                "descendant_edges": FakeCollection(descendant_edges or []),
             }
         )
-        super().__init__(docs, database=database)
+        super().__init__(docs, database=database, name="words")
+        database._collections["words"] = self
@@ -0,0 +1,97 @@
+"""Tier 0 (closure, lowest_common_ancestor) + Tier 2 (/etymology/common-ancestor)
+tests for precomputed ancestor closures."""
+
+import pytest
+from app.routers.etymology import get_common_ancestor
+from app.services.ancestor_closure import FIELD, closure, lowest_common_ancestor
+from fastapi import HTTPException
+
+from .fakes import FakeWordsCollection
+
+
+def _hop(word: str, lang: str, hop_type: str = "inh") -> dict:
+    return {"word": word, "lang": lang, "lang_code": lang[:2].lower(), "type": hop_type}
+
+
+# wine < wīn < vīnum (its own chain: vīnum < *wīnom); vinegar < vinaigre < vīnum
+DEFAULT_HOPS = {
+    ("wine", "English"): [_hop("wīn", "Old English"), _hop("vīnum", "Latin", "bor")],
+    ("vīnum", "Latin"): [_hop("*wīnom", "Proto-Italic")],
+    ("vinegar", "English"): [_hop("vinaigre", "Old French", "bor"), _hop("vīnum", "Latin", "der")],
+    ("water", "English"): [_hop("wæter", "Old English")],
+}
+
+
+def _doc(word: str) -> dict:
+    return {
+        "word": word,
+        "lang": "English",
+        FIELD: closure(word, "English", DEFAULT_HOPS[(word, "English")], DEFAULT_HOPS),
+    }
+
+
+@pytest.mark.tier0
+def test_closure_follows_the_deepest_ancestors_chain():
+    ancestors = closure("wine", "English", DEFAULT_HOPS[("wine", "English")], DEFAULT_HOPS)
+
+    assert [(a["word"], a["type"], a["depth"]) for a in ancestors] == [
+        ("wīn", "inh", 1),
+        ("vīnum", "bor", 2),
+        ("*wīnom", "inh", 3),
+    ]
+    assert len(closure("wine", "English", DEFAULT_HOPS[("wine", "English")], {}, 1)) == 1
+
+
+@pytest.mark.tier0
+def test_closure_stops_at_a_cycle():
+    cyclic = {("b", "Latin"): [_hop("a", "Latin")], ("a", "Latin"): [_hop("b", "Latin")]}
+
+    assert [a["word"] for a in closure("a", "Latin", cyclic[("a", "Latin")], cyclic)] == ["b"]
+
+
+@pytest.mark.tier0
+def test_lowest_common_ancestor_minimizes_the_depth_sum():
+    def lineage(*words: str) -> list[dict]:
+        return [{"word": word, "lang": "x"} for word in words]
+
+    assert lowest_common_ancestor(lineage("a", "p", "r"), lineage("b", "q", "p", "r")) == (1, 2)
+    assert lowest_common_ancestor(lineage("a", "b", "r"), lineage("b", "r")) == (1, 0)
+    assert lowest_common_ancestor(lineage("a"), lineage("b")) is None
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_common_ancestor_returns_both_paths_from_two_reads():
+    col = FakeWordsCollection([_doc("wine"), _doc("vinegar"), _doc("water")])
+
+    result = await get_common_ancestor("wine", "vinegar", col=col)
+
+    assert result["common_ancestor"] == {
+        "id": "vīnum:Latin",
+        "label": "vīnum",
+        "language": "Latin",
+        "level": -2,
+    }
+    assert result["depths"] == [2, 2]
+    assert [(e["from"], e["to"], e["label"]) for e in result["edges"]] == [
+        ("wīn:Old English", "wine:English", "inh"),
+        ("vīnum:Latin", "wīn:Old English", "bor"),
+        ("vinaigre:Old French", "vinegar:English", "bor"),
+        ("vīnum:Latin", "vinaigre:Old French", "der"),
+    ]
+    assert len(col.queries) == 2
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_common_ancestor_of_unrelated_and_missing_words():
+    col = FakeWordsCollection([_doc("wine"), _doc("water")])
+
+    result = await get_common_ancestor("wine", "water", col=col)
+    assert result["common_ancestor"] is None
+    assert [node["id"] for node in result["nodes"]] == ["wine:English", "water:English"]
+    assert result["edges"] == []
+
+    with pytest.raises(HTTPException) as exc:
+        await get_common_ancestor("wine", "vinegar", col=col)
+    assert exc.value.status_code == 404
@@ -0,0 +1,176 @@
+"""Tier 0 (chain_record) + Tier 2 (find_chain, CHAIN_SOURCE=chains) tests for
+precomputed ancestor chains."""
+
+import pytest
+from app.config import settings
+from app.routers.etymology import get_etymology_chain
+from app.services import chains, lang_cache
+from app.services.tree_builder import TreeBuilder
+from etl.precompute_chains import chain_updates
+
+from .fakes import FakeWordsCollection
+
+LANG_LOOKUP = {"en": "English", "enm": "Middle English", "ang": "Old English", "la": "Latin"}
+
+DOCS = [
+    {
+        "word": "wine",
+        "lang": "English",
+        "lang_code": "en",
+        "etymology_templates": [
+            {"name": "inh", "args": {"1": "en", "2": "enm", "3": "wyn"}},
+            {"name": "inh", "args": {"1": "en", "2": "ang", "3": "wīn"}},
+            {"name": "bor", "args": {"1": "en", "2": "la", "3": "vīnum"}},
+        ],
+        "etymology_text": "From Middle English wyn.",
+    },
+    {
+        "word": "win",
+        "lang": "Old English",
+        "lang_code": "ang",
+        "etymology_number": 1,
+        "etymology_templates": [{"name": "bor", "args": {"1": "ang", "2": "la", "3": "vīnum"}}],
+    },
+    {
+        "word": "win",
+        "lang": "Old English",
+        "lang_code": "ang",
+        "etymology_number": 2,
+        "etymology_templates": [{"name": "unk", "args": {"1": "ang"}}],
+    },
+]
+
+
+def _chain_docs(docs: list[dict]) -> list[dict]:
+    """The chains collection as `make precompute-chains` writes it: its upserts
+    applied in natural order (all of them ``$setOnInsert``)."""
+    out: dict[tuple, dict] = {}
+    for doc in docs:
+        for filt, update in chain_updates(chains.chain_record(doc, LANG_LOOKUP)):
+            (op, record), *_ = update.items()
+            assert op == "$setOnInsert"
+            out.setdefault(tuple(filt.values()), {**record, **filt})
+    return list(out.values())
+
+
+def _collection() -> FakeWordsCollection:
+    col = FakeWordsCollection(DOCS)
+    col.database[chains.COLLECTION]._docs.extend(_chain_docs(DOCS))
+    return col
+
+
+def _seed_lang_codes():
+    for code, name in LANG_LOOKUP.items():
+        lang_cache._code_to_name[code] = name
+        lang_cache._name_to_code[name] = code
+
+
+@pytest.mark.tier0
+def test_chain_record_resolves_languages_and_uncertainty():
+    record = chains.chain_record(DOCS[2], LANG_LOOKUP)
+    assert record["ancestry"] == []
+    assert record["uncertainty"]["is_uncertain"] is True
+
+    record = chains.chain_record(DOCS[0], LANG_LOOKUP)
+    assert [(a["word"], a["lang"], a["type"]) for a in record["ancestry"]] == [
+        ("wyn", "Middle English", "inh"),
+        ("wīn", "Old English", "inh"),
+        ("vīnum", "Latin", "bor"),
+    ]
+    assert record["uncertainty"] is None
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_find_chain_retries_normalized_form_in_the_same_read():
+    col = _collection()
+    record = await chains.find_chain(col, "wīn", "Old English")
+    assert (record["word"], record["ancestry"][0]["word"]) == ("win", "vīnum")
+    assert len(col.database[chains.COLLECTION].queries) == 1
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_find_chain_etym_fallback_accepts_the_default_entry():
+    col = _collection()
+    assert (await chains.find_chain(col, "win", "Old English", 2))["uncertainty"] is not None
+    assert await chains.find_chain(col, "wine", "English", 3) is None
+    fallback = await chains.find_chain(col, "wine", "English", 3, etym_fallback=True)
+    assert fallback["word"] == "wine"
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_chain_source_tree_matches_templates_without_reading_words():
+    _seed_lang_codes()
+    by_templates = TreeBuilder(FakeWordsCollection(DOCS), {"inh", "bor"}, 10, 0)
+    await by_templates.expand_word("wine", "English", base_level=0)
+
+    col = _collection()
+    by_chains = TreeBuilder(col, {"inh", "bor"}, 10, 0, chain_source="chains")
+    await by_chains.expand_word("wine", "English", base_level=0)
+
+    assert by_chains.result() == by_templates.result()
+    assert col.queries == []
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_chain_source_tree_matches_templates_for_cognates_only():
+    """types=cog leaves no ancestry type allowed; both sources then walk all of them."""
+    _seed_lang_codes()
+    by_templates = TreeBuilder(FakeWordsCollection(DOCS), set(), 10, 0)
+    await by_templates.expand_word("wine", "English", base_level=0)
+
+    by_chains = TreeBuilder(_collection(), set(), 10, 0, chain_source="chains")
+    await by_chains.expand_word("wine", "English", base_level=0)
+
+    assert len(by_templates.result()["edges"]) == 3
+    assert by_chains.result() == by_templates.result()
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_chain_endpoint_reads_precomputed_chain(monkeypatch):
+    _seed_lang_codes()
+    expected = await get_etymology_chain("wine", lang="English", etym=None, col=_collection())
+
+    monkeypatch.setattr(settings, "chain_source", "chains")
+    col = _collection()
+    chain = await get_etymology_chain("wine", lang="English", etym=None, col=col)
+
+    assert chain == expected
+    assert col.queries == []
+    assert len(col.database[chains.COLLECTION].queries) == 1
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_chain_endpoint_keeps_the_first_entry_of_a_shared_etymology(monkeypatch):
+    """Two POS entries under one etymology_number: the precomputed chain is the
+    first one's, as the plain find_one returns it."""
+    _seed_lang_codes()
+    docs = [
+        *DOCS,
+        {
+            "word": "win",
+            "lang": "Old English",
+            "lang_code": "ang",
+            "etymology_number": 1,
+            "etymology_templates": [{"name": "inh", "args": {"1": "ang", "2": "la", "3": "vīnum"}}],
+        },
+    ]
+    col = FakeWordsCollection(docs)
+    expected = await get_etymology_chain("win", lang="Old English", etym=1, col=col)
+
+    monkeypatch.setattr(settings, "chain_source", "chains")
+    col.database[chains.COLLECTION]._docs.extend(_chain_docs(docs))
+    chain = await get_etymology_chain("win", lang="Old English", etym=1, col=col)
+
+    assert chain == expected
+    assert [edge["label"] for edge in chain["edges"]] == ["bor"]
+
+
+def test_unknown_chain_source_is_rejected():
+    with pytest.raises(ValueError, match="chain_source"):
+        TreeBuilder(None, {"inh"}, 10, 3, chain_source="guesswork")
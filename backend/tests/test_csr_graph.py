@@ -0,0 +1,222 @@
+"""Tier 2 tests for the exported CSR graph and the in-process tree engine."""
+
+import pytest
+from app.services import lang_cache
+from app.services.csr_graph import CsrGraph, CsrGraphExport, CsrTreeBuilder
+from app.services.string_table import MappedStringTable, write_string_table
+from app.services.template_parser import first_ancestors, primary_ancestor
+from app.services.tree_builder import TreeBuilder
+
+from .fakes import FakeWordsCollection
+
+LANGS = {"en": "English", "fr": "French", "la": "Latin"}
+
+
+def _doc(word: str, lc: str, templates: list[dict], **extra) -> dict:
+    doc = {"word": word, "lang": LANGS[lc], "lang_code": lc, "etymology_templates": templates}
+    return {
+        **doc,
+        **extra,
+        "primary_ancestor": primary_ancestor(doc),
+        "first_ancestors": first_ancestors(doc),
+    }
+
+
+def _der(lc: str, parent: str) -> dict:
+    return {"name": "der", "args": {"1": "en", "2": lc, "3": parent}}
+
+
+def _inh(parent: str) -> dict:
+    return {"name": "inh", "args": {"1": "en", "2": "en", "3": parent}}
+
+
+# root -> {a, b}; a -> {a1, a2}; a1 -> {a1x}; vin < vinum; a1 ~ vin (cog);
+# a = x + ...; x < xx
+DOCS = [
+    _doc("b", "en", [_der("en", "root")]),
+    _doc("a", "en", [_der("en", "root")]),
+    _doc("a2", "en", [_der("en", "a")]),
+    _doc("a1", "en", [_der("en", "a"), {"name": "cog", "args": {"1": "fr", "2": "vin"}}]),
+    _doc("a1x", "en", [_der("en", "a1")]),
+    _doc("vin", "fr", [{"name": "inh", "args": {"1": "fr", "2": "la", "3": "vinum"}}]),
+    _doc("x", "en", [_der("en", "xx")]),
+    _doc("murky", "en", [_der("en", "root")], etymology_text="Of uncertain origin."),
+]
+EDGES = [
+    {
+        "from_word": "x",
+        "from_lang": "English",
+        "from_lang_code": "en",
+        "to_word": "a",
+        "to_lang": "English",
+        "to_lang_code": "en",
+        "edge_type": "component",
+        "from_exists": True,
+    }
+]
+
+
+@pytest.fixture(autouse=True)
+def _lang_codes():
+    for code, name in LANGS.items():
+        lang_cache._code_to_name[code] = name
+        lang_cache._name_to_code[name] = code
+
+
+@pytest.fixture
+def graph(tmp_path) -> CsrGraph:
+    export = CsrGraphExport(LANGS)
+    for doc in DOCS:
+        export.add_entry(doc)
+    for doc in sorted((d for d in DOCS if d["primary_ancestor"]), key=lambda d: d["word"]):
+        export.add_child(doc)
+    for edge_doc in EDGES:
+        export.add_component(edge_doc)
+    export.write(tmp_path)
+    return CsrGraph(tmp_path)
+
+
+def test_string_table_ids_are_sorted_ranks(tmp_path):
+    ids = write_string_table(tmp_path, "t", ["wine", "vīnum", "Wein", "wine"])
+    table = MappedStringTable.open(tmp_path, "t")
+
+    assert list(table) == ["Wein", "vīnum", "wine"]
+    assert ids == {"Wein": 0, "vīnum": 1, "wine": 2}
+    assert table.find("vīnum") == 1
+    assert table.find("win") is None
+
+
+def test_graph_holds_relations_per_node(graph):
+    a1 = graph.node("a1", "English")
+    vin = graph.node("vin", "French")
+
+    assert graph.node("a1", "French") is None
+    assert [graph.record(n, t) for n, t in graph.neighbors("anc", a1)] == [
+        {"word": "a", "lang": "English", "lang_code": "en", "type": "der"}
+    ]
+    assert graph.neighbors("cog", a1) == [(vin, "cog")]
+    assert [graph.word(n) for n, _t in graph.neighbors("desc", graph.node("a", "English"))] == [
+        "a1",
+        "a2",
+    ]
+    assert not graph.has_doc(graph.node("vinum", "Latin"))
+    assert graph.uncertain(graph.node("murky", "English"))
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["recursive", "frontier"])
+async def test_csr_engine_matches_builder_without_mongo(graph, mode):
+    expected = TreeBuilder(
+        FakeWordsCollection(DOCS, etymology_edges=EDGES),
+        {"der", "inh", "bor"},
+        10,
+        3,
+        descendant_mode=mode,
+        descendant_source="primary_ancestor",
+    )
+    await expected.expand_word("a1", "English", base_level=0)
+    await expected.expand_cognates()
+
+    col = FakeWordsCollection(DOCS, etymology_edges=EDGES)
+    builder = CsrTreeBuilder(col, {"der", "inh", "bor"}, 10, 3, descendant_mode=mode, graph=graph)
+    await builder.expand_word("a1", "English", base_level=0)
+    await builder.expand_cognates()
+
+    assert builder.result() == expected.result()
+    assert "vin:French" in builder.nodes
+    assert col.queries == []
+    assert col.database["etymology_edges"].queries == []
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["recursive", "frontier"])
+async def test_csr_engine_reads_descendants_from_mongo_under_a_type_subset(tmp_path, mode):
+    """a3's first link is der, so the export files it under a only; with inh
+    alone selected it is root's child, as first_ancestors says."""
+    docs = [*DOCS, _doc("a3", "en", [_der("en", "a"), _inh("root")])]
+    export = CsrGraphExport(LANGS)
+    for doc in docs:
+        export.add_entry(doc)
+    for doc in sorted((d for d in docs if d["primary_ancestor"]), key=lambda d: d["word"]):
+        export.add_child(doc)
+    export.write(tmp_path)
+
+    expected = TreeBuilder(
+        FakeWordsCollection(docs),
+        {"inh"},
+        10,
+        1,
+        descendant_mode=mode,
+        descendant_source="primary_ancestor",
+    )
+    await expected.find_descendants("root", "English", "en", parent_level=0)
+    builder = CsrTreeBuilder(
+        FakeWordsCollection(docs),
+        {"inh"},
+        10,
+        1,
+        descendant_mode=mode,
+        descendant_source="primary_ancestor",
+        graph=CsrGraph(tmp_path),
+    )
+    await builder.find_descendants("root", "English", "en", parent_level=0)
+
+    assert builder.result() == expected.result()
+    assert "a3:English" in builder.nodes
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_csr_engine_reads_uncertain_and_etymology_chains_from_mongo(graph):
+    col = FakeWordsCollection(DOCS)
+    builder = CsrTreeBuilder(col, {"der"}, 10, 0, graph=graph)
+
+    found, hops, uncertainty = await builder._parse_chain("murky", "English", None)
+    assert found
+    assert [hop["word"] for hop in hops] == ["root"]
+    assert uncertainty["is_uncertain"]
+
+    await builder._parse_chain("a", "English", 1)
+    assert [method for method, _filt in col.queries] == ["find_one", "find_one", "find_one"]
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_csr_engine_answers_known_words_without_doc_from_the_graph(graph):
+    col = FakeWordsCollection(DOCS)
+    builder = CsrTreeBuilder(col, {"der"}, 10, 0, graph=graph)
+
+    assert await builder._parse_chain("vinum", "Latin", None) == (False, [], None)
+    assert col.queries == []
+
+
+def _component_edge(component: str, target: str) -> dict:
+    return {**EDGES[0], "from_word": component, "to_word": target}
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_csr_engine_reads_words_missing_from_the_export_from_mongo(graph):
+    """Entries added after the export still get their cognates, compound edges
+    and component chains, as from the base class."""
+    added = [
+        _doc("fresh", "en", [{"name": "cog", "args": {"1": "fr", "2": "vin"}}]),
+        _doc("yy", "en", [_der("en", "zz")]),
+    ]
+    col = FakeWordsCollection(
+        DOCS + added,
+        etymology_edges=[_component_edge("x", "fresh"), _component_edge("yy", "fresh")],
+    )
+    builder = CsrTreeBuilder(col, {"der"}, 10, 0, graph=graph)
+
+    cognates = await builder._cognates_of([("a1", "English"), ("fresh", "English")])
+    assert [[(c["word"], c["lang"]) for c in cogs] for cogs in cognates] == [
+        [("vin", "French")]
+    ] * 2
+
+    edges, comp_hops = await builder._prefetch_compound_edges([("fresh", "English", "en", 0)], 1)
+    assert [e["from_word"] for e in edges[("fresh", "English")]] == ["x", "yy"]
+    assert [hop["word"] for hop in comp_hops[("x", "English")]] == ["xx"]
+    assert [hop["word"] for hop in comp_hops[("yy", "English")]] == ["zz"]
@@ -0,0 +1,161 @@
+"""Tier 0 tests for the interned graph core, plus a memory benchmark against
+the dict-per-node representation TreeBuilder used before it."""
+
+import tracemalloc
+
+import pytest
+from app.services.graph_core import GraphCore, StringTable
+from app.services.tree_builder import TreeBuilder
+
+
+@pytest.mark.tier0
+def test_string_table_interns_each_string_once():
+    table = StringTable()
+    assert table.intern("English") == table.intern("English") == 0
+    assert table.intern("Latin") == 1
+    assert table[1] == "Latin"
+    assert table.get("Greek") is None
+    assert len(table) == 2
+
+
+@pytest.mark.tier0
+def test_keys_are_shared_by_word_and_lang():
+    graph = GraphCore()
+    key = graph.key("vinum", "Latin")
+    assert graph.key("vinum", "Latin") == key
+    assert graph.key("vinum", "English") != key
+    assert graph.find_key("vinum", "Latin") == key
+    assert graph.find_key("vino", "Latin") is None
+    assert graph.node_id(key) == "vinum:Latin"
+
+
+@pytest.mark.tier0
+def test_edges_may_precede_their_nodes_and_dedup_by_endpoints():
+    graph = GraphCore()
+    src, dst = graph.key("a", "English"), graph.key("b", "English")
+
+    assert graph.add_edge(src, dst, "inh") is True
+    assert graph.add_edge(src, dst, "bor") is False
+    assert graph.add_edge(dst, src, "inh") is True
+    assert graph.node_count == 0
+    assert graph.edge_dicts() == [
+        {"from": "a:English", "to": "b:English", "label": "inh"},
+        {"from": "b:English", "to": "a:English", "label": "inh"},
+    ]
+
+
+@pytest.mark.tier0
+def test_nodes_materialize_in_insertion_order():
+    graph = GraphCore()
+    late = graph.key("late", "English")  # key created first, node added second
+    early = graph.key("early", "English")
+    graph.add_node(early, 0)
+    graph.add_node(late, -1, {"is_uncertain": True})
+
+    assert graph.add_node(early, 5) is False
+    assert [graph.node_dict(k) for k in graph.node_keys()] == [
+        {
+            "id": "early:English",
+            "label": "early",
+            "language": "English",
+            "level": 0,
+            "uncertainty": None,
+        },
+        {
+            "id": "late:English",
+            "label": "late",
+            "language": "English",
+            "level": -1,
+            "uncertainty": {"is_uncertain": True},
+        },
+    ]
+
+
+@pytest.mark.tier0
+def test_node_view_is_read_only_and_keyed_by_public_id():
+    builder = TreeBuilder(None, {"inh"}, 10, 3)
+    builder.add_node("ratio:x", "Latin", -1)  # ids split on the last ':'
+    builder.nodes["ratio:x:Latin"]["level"] = 99
+
+    assert "ratio:x:Latin" in builder.nodes
+    assert builder.nodes["ratio:x:Latin"]["level"] == -1
+    assert "ratio:Latin" not in builder.nodes
+    assert list(builder.nodes) == ["ratio:x:Latin"]
+
+
+# --- memory benchmark ---
+
+
+class _DictGraph:
+    """The pre-interning TreeBuilder storage, kept as the benchmark baseline."""
+
+    def __init__(self):
+        self.nodes: dict[str, dict] = {}
+        self.edges: list[dict] = []
+        self.visited_edges: set[tuple] = set()
+
+    def add_node(self, word: str, lang: str, level: int) -> str:
+        nid = f"{word}:{lang}"
+        if nid not in self.nodes:
+            self.nodes[nid] = {
+                "id": nid,
+                "label": word,
+                "language": lang,
+                "level": level,
+                "uncertainty": None,
+            }
+        return nid
+
+    def add_edge(self, from_id: str, to_id: str, label: str) -> None:
+        if (from_id, to_id) not in self.visited_edges:
+            self.visited_edges.add((from_id, to_id))
+            self.edges.append({"from": from_id, "to": to_id, "label": label})
+
+
+def _words(n: int) -> list[tuple[str, str]]:
+    # Distinct word objects per call, like strings decoded from Mongo docs.
+    langs = ["English", "Old English", "Latin", "Ancient Greek", "German", "French"]
+    return [(f"word{i:06d}", langs[i % len(langs)]) for i in range(n)]
+
+
+def _traced_bytes(build) -> int:
+    words = _words(20_000)
+    tracemalloc.start()
+    try:
+        graph = build(words)
+        current, _peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert graph is not None
+    return current
+
+
+def _build_dict(words):
+    graph = _DictGraph()
+    prev = graph.add_node(*words[0], 0)
+    for i, (word, lang) in enumerate(words[1:], start=1):
+        nid = graph.add_node(word, lang, i % 7)
+        graph.add_edge(prev, nid, "inh")
+        prev = nid
+    return graph
+
+
+def _build_core(words):
+    graph = GraphCore()
+    prev = graph.key(*words[0])
+    graph.add_node(prev, 0)
+    for i, (word, lang) in enumerate(words[1:], start=1):
+        key = graph.key(word, lang)
+        graph.add_node(key, i % 7)
+        graph.add_edge(prev, key, "inh")
+        prev = key
+    return graph
+
+
+@pytest.mark.slow
+def test_graph_core_uses_less_memory_than_dict_graph():
+    dict_bytes = _traced_bytes(_build_dict)
+    core_bytes = _traced_bytes(_build_core)
+    assert core_bytes < dict_bytes * 0.6, (
+        f"dict graph: {dict_bytes / 1e6:.1f} MB, graph core: {core_bytes / 1e6:.1f} MB"
+    )
@@ -0,0 +1,110 @@
+"""Tier 2 tests for the $graphLookup tree engine over the fake."""
+
+import pytest
+from app.services import graph_lookup, lang_cache
+from app.services.graph_lookup import GraphLookupTreeBuilder, edge_key
+from app.services.template_parser import first_ancestors, primary_ancestor
+from app.services.tree_builder import TreeBuilder
+
+from .fakes import FakeWordsCollection
+
+
+def _child(word: str, parent: str) -> dict:
+    doc = {
+        "word": word,
+        "lang": "English",
+        "lang_code": "en",
+        "etymology_templates": [{"name": "der", "args": {"1": "en", "2": "en", "3": parent}}],
+    }
+    return {
+        **doc,
+        "primary_ancestor": primary_ancestor(doc),
+        "first_ancestors": first_ancestors(doc),
+    }
+
+
+# root -> {a, b}; a -> {a1, a2}; b -> {b1}; a1 -> {a1x}
+DOCS = [
+    _child("b", "root"),
+    _child("a", "root"),
+    _child("a2", "a"),
+    _child("a1", "a"),
+    _child("b1", "b"),
+    _child("a1x", "a1"),
+]
+
+
+def _tree_edges(docs: list[dict]) -> list[dict]:
+    """The tree_edges collection as `make precompute-tree-edges` would write it."""
+    return [
+        {
+            "parent": edge_key(
+                doc["primary_ancestor"]["lang_code"], doc["primary_ancestor"]["word"]
+            ),
+            "child": edge_key(doc["lang_code"], doc["word"]),
+            "word": doc["word"],
+            "lang": doc["lang"],
+            "lang_code": doc["lang_code"],
+            "type": doc["primary_ancestor"]["type"],
+            "subtree_size": 0,
+        }
+        for doc in docs
+    ]
+
+
+def _collection() -> FakeWordsCollection:
+    col = FakeWordsCollection(DOCS)
+    col.database[graph_lookup.COLLECTION]._docs.extend(_tree_edges(DOCS))
+    return col
+
+
+@pytest.fixture(autouse=True)
+def _lang_codes():
+    lang_cache._code_to_name["en"] = "English"
+    lang_cache._name_to_code["English"] = "en"
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["recursive", "frontier"])
+async def test_graphlookup_engine_matches_builder_in_one_aggregation(mode):
+    expected = TreeBuilder(
+        FakeWordsCollection(DOCS), {"der"}, 10, 3, descendant_source="primary_ancestor"
+    )
+    await expected.find_descendants("root", "English", "en", parent_level=0)
+
+    col = _collection()
+    builder = GraphLookupTreeBuilder(col, {"der"}, 10, 3, descendant_mode=mode)
+    await builder._expand_descendants_from_chain([("root", "English", "en", 0)])
+
+    assert {n["id"]: n["level"] for n in builder.result()["nodes"]} == {
+        n["id"]: n["level"] for n in expected.result()["nodes"]
+    }
+    assert sorted(map(str, builder.edges)) == sorted(map(str, expected.edges))
+    assert col.queries == []
+    assert [m for m, _ in col.database[graph_lookup.COLLECTION].queries] == ["aggregate"]
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_graphlookup_walk_is_bounded_by_descendant_depth():
+    col = _collection()
+    builder = GraphLookupTreeBuilder(col, {"der"}, 10, 2)
+
+    await builder._expand_descendants_from_chain([("root", "English", "en", 0)])
+
+    assert set(builder.nodes) == {f"{w}:English" for w in ["a", "b", "a1", "a2", "b1"]}
+    ((_method, pipeline),) = col.database[graph_lookup.COLLECTION].queries
+    assert pipeline[1]["$graphLookup"]["maxDepth"] == 1
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_graphlookup_restricts_walk_to_allowed_types():
+    col = _collection()
+    builder = GraphLookupTreeBuilder(col, {"inh"}, 10, 3)
+
+    await builder._expand_descendants_from_chain([("root", "English", "en", 0)])
+
+    assert builder.nodes == {}
+    assert builder.meta()["graph_lookups"] == 1
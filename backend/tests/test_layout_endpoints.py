@@ -95,29 +95,6 @@ def _make_fake(docs=CHEESE_DOCS) -> FakeWordsCollection:
     return FakeWordsCollection(list(docs), languages=LANGUAGES)
 
 
-@pytest.fixture
-async def make_client():
-    """Factory: hand it a fake, get an in-process AsyncClient bound to it. One
-    override is active at a time (drive one client's requests to completion
-    before making another); overrides are cleared and clients closed on teardown.
-    """
-    clients: list[httpx.AsyncClient] = []
-
-    async def _make(fake: FakeWordsCollection) -> httpx.AsyncClient:
-        app.dependency_overrides[get_words_collection] = lambda: fake
-        transport = httpx.ASGITransport(app=app)
-        client = httpx.AsyncClient(transport=transport, base_url="http://test")
-        clients.append(client)
-        return client
-
-    try:
-        yield _make
-    finally:
-        for client in clients:
-            await client.aclose()
-        app.dependency_overrides.clear()
-
-
 async def _collect_sse(
     client: httpx.AsyncClient, url: str, *, timeout: float = 15.0
 ) -> list[tuple]:
@@ -0,0 +1,134 @@
+"""Tier 0 (shortest_path) + Tier 2 (/etymology/path) tests for the
+bidirectional path search over the CSR graph."""
+
+import time
+
+import pytest
+from app.config import settings
+from app.routers.etymology import get_etymology_path
+from app.services import csr_graph
+from app.services.csr_graph import CsrGraph, CsrGraphExport
+from app.services.path_search import PATH_TYPES, find_node, path_graph, shortest_path
+from app.services.template_parser import primary_ancestor
+from fastapi import HTTPException
+
+LANGS = {
+    "en": "English",
+    "ang": "Old English",
+    "gem-pro": "Proto-Germanic",
+    "la": "Latin",
+    "fro": "Old French",
+    "de": "German",
+}
+
+
+def _doc(word: str, lc: str, *templates: dict) -> dict:
+    doc = {"word": word, "lang": LANGS[lc], "lang_code": lc, "etymology_templates": list(templates)}
+    return {**doc, "primary_ancestor": primary_ancestor(doc)}
+
+
+def _tpl(name: str, lc: str, src: str, parent: str) -> dict:
+    return {"name": name, "args": {"1": lc, "2": src, "3": parent}}
+
+
+# wine < wīn < *wīną < vīnum > vinaigre > vinegar; wine ~ Wein; vīnum is also
+# a component of vinegar.
+DOCS = [
+    _doc(
+        "wine",
+        "en",
+        _tpl("inh", "en", "ang", "wīn"),
+        {"name": "cog", "args": {"1": "de", "2": "Wein"}},
+    ),
+    _doc("wīn", "ang", _tpl("inh", "ang", "gem-pro", "*wīną")),
+    _doc("*wīną", "gem-pro", _tpl("bor", "gem-pro", "la", "vīnum")),
+    _doc("vinegar", "en", _tpl("bor", "en", "fro", "vinaigre")),
+    _doc("vinaigre", "fro", _tpl("der", "fro", "la", "vīnum")),
+    _doc("vīnum", "la"),
+]
+COMPONENT = {
+    "from_word": "vīnum",
+    "from_lang": "Latin",
+    "from_lang_code": "la",
+    "to_word": "vinegar",
+    "to_lang": "English",
+    "to_lang_code": "en",
+    "edge_type": "component",
+}
+
+
+@pytest.fixture
+def graph(tmp_path) -> CsrGraph:
+    export = CsrGraphExport(LANGS)
+    for doc in DOCS:
+        export.add_entry(doc)
+    for doc in DOCS:
+        if doc["primary_ancestor"]:
+            export.add_child(doc)
+    export.add_component(COMPONENT)
+    export.write(tmp_path)
+    return CsrGraph(tmp_path)
+
+
+def _words(graph: CsrGraph, nodes: list[int]) -> list[str]:
+    return [graph.word(node) for node in nodes]
+
+
+@pytest.mark.tier0
+def test_shortest_path_goes_up_and_back_down(graph):
+    wine, vinegar = graph.node("wine", "English"), graph.node("vinegar", "English")
+    types = set(PATH_TYPES) - {"component"}
+
+    result = shortest_path(graph, wine, vinegar, types)
+
+    assert _words(graph, result.nodes) == ["wine", "wīn", "*wīną", "vīnum", "vinaigre", "vinegar"]
+    assert [edge[2] for edge in result.edges] == ["inh", "inh", "bor", "der", "bor"]
+    drawn = path_graph(graph, result)
+    assert [node["level"] for node in drawn["nodes"]] == [0, -1, -2, -3, -2, -1]
+    assert drawn["edges"][0] == {"from": "wīn:Old English", "to": "wine:English", "label": "inh"}
+
+
+@pytest.mark.tier0
+def test_shortest_path_takes_the_shorter_route_and_cognates(graph):
+    wine, vinegar = graph.node("wine", "English"), graph.node("vinegar", "English")
+
+    result = shortest_path(graph, wine, vinegar, set(PATH_TYPES))
+    assert _words(graph, result.nodes) == ["wine", "wīn", "*wīną", "vīnum", "vinegar"]
+
+    wein = find_node(graph, "Wein", "German")
+    result = shortest_path(graph, wein, vinegar, set(PATH_TYPES))
+    assert _words(graph, result.nodes)[:2] == ["Wein", "wine"]
+    assert path_graph(graph, result)["nodes"][1]["level"] == 0
+
+
+@pytest.mark.tier0
+def test_shortest_path_stops_at_the_hop_limit_and_deadline(graph):
+    wine, vinegar = graph.node("wine", "English"), graph.node("vinegar", "English")
+
+    result = shortest_path(graph, wine, vinegar, set(PATH_TYPES), max_hops=3)
+    assert result.nodes is None
+    assert result.truncated_reason is None
+
+    result = shortest_path(graph, wine, vinegar, set(PATH_TYPES), deadline=time.monotonic())
+    assert result.nodes is None
+    assert result.truncated_reason == "time_budget"
+
+
+@pytest.mark.tier2
+@pytest.mark.usefixtures("graph")
+def test_path_endpoint_reads_the_loaded_graph(tmp_path, monkeypatch):
+    kwargs = {"types": ",".join(PATH_TYPES), "max_hops": 6, "time_limit_ms": 500}
+    monkeypatch.setattr(settings, "csr_graph_dir", str(tmp_path / "missing"))
+    with pytest.raises(HTTPException) as exc:
+        get_etymology_path("wine", "vinegar", **kwargs)
+    assert exc.value.status_code == 503
+
+    csr_graph.load(tmp_path)
+    result = get_etymology_path("wine", "vinegar", **kwargs)
+    assert result["found"] is True
+    assert result["hops"] == 4
+    assert [node["id"] for node in result["nodes"]][-1] == "vinegar:English"
+
+    with pytest.raises(HTTPException) as exc:
+        get_etymology_path("wine", "beer", **kwargs)
+    assert exc.value.status_code == 404
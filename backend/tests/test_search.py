@@ -0,0 +1,119 @@
+"""Tier 2 tests for /search against the fake words collection."""
+
+import pytest
+from app.routers.search import search_words
+from app.services import search_cache
+from app.services.template_parser import fold_word
+
+from .fakes import FakeWordsCollection
+
+
+def _entry(word: str, lang: str = "English") -> dict:
+    return {"word": word, "lang": lang, "pos": "noun", "word_folded": fold_word(word)}
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_folded_search_ranks_exact_case_hits_first():
+    col = FakeWordsCollection(
+        [_entry("romance"), _entry("Rome"), _entry("rome", "Latin"), _entry("Romeo")]
+    )
+
+    result = await search_words("rome", limit=10, mode="folded", col=col)
+
+    assert [(r["word"], r["lang"]) for r in result["results"]] == [
+        ("rome", "Latin"),
+        ("Rome", "English"),
+        ("Romeo", "English"),
+    ]
+    assert all("$regex" not in str(query) for _method, query in col.queries)
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_folded_search_ignores_diacritics():
+    col = FakeWordsCollection([_entry("vīnum", "Latin"), _entry("vinegar")])
+
+    result = await search_words("vinum", limit=10, mode="folded", col=col)
+
+    assert [r["word"] for r in result["results"]] == ["vīnum"]
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_polysemous_exact_matches_expand_in_one_aggregation():
+    def sense(word: str, lang: str, etym: int, pos: str, gloss: str) -> dict:
+        return {
+            **_entry(word, lang),
+            "pos": pos,
+            "etymology_number": etym,
+            "senses": [{"glosses": [gloss]}],
+        }
+
+    col = FakeWordsCollection(
+        [
+            sense("bank", "English", 2, "noun", "a slope"),
+            sense("bank", "English", 1, "noun", "an institution"),
+            sense("bank", "English", 1, "verb", "to deposit"),
+            sense("bank", "Dutch", 1, "noun", "a couch"),
+            sense("bank", "German", 1, "noun", "a bench"),
+            sense("bank", "German", 2, "noun", "a bank"),
+            _entry("banker"),
+        ]
+    )
+
+    result = await search_words("bank", limit=10, mode="prefix", col=col)
+
+    assert [
+        (r["lang"], r.get("etymology_number"), r["pos"], r.get("first_gloss"))
+        for r in result["results"]
+    ] == [
+        ("English", 1, "noun, verb", "an institution"),
+        ("English", 2, "noun", "a slope"),
+        ("Dutch", None, "noun", None),
+        ("German", 1, "noun", "a bench"),
+        ("German", 2, "noun", "a bank"),
+        ("English", None, "noun", None),
+    ]
+    assert [method for method, _query in col.queries] == ["find", "find", "aggregate"]
+
+
+# In word order, as the `word` index returns prefix matches.
+TYPED = [_entry(w) for w in ("w", "wax", "win", "wind", "window", "wine", "wine", "winter")]
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_longer_prefixes_narrow_from_a_complete_shorter_one():
+    col = FakeWordsCollection(TYPED)
+    await search_words("w", limit=5, mode="prefix", col=col)
+    fresh = []
+    for q in ("wi", "win", "wine"):
+        search_cache.reset()
+        fresh.append(await search_words(q, limit=5, mode="prefix", col=col))
+
+    search_cache.reset()
+    await search_words("w", limit=5, mode="prefix", col=col)
+    col.queries.clear()
+    typed = [await search_words(q, limit=5, mode="prefix", col=col) for q in ("wi", "win", "wine")]
+
+    assert typed == fresh
+    assert all(method == "aggregate" for method, _query in col.queries)
+    assert search_cache.stats()["narrowed"] == 3
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_repeated_searches_hit_and_capped_prefixes_do_not_narrow():
+    col = FakeWordsCollection(TYPED)
+
+    first = await search_words("w", limit=2, mode="prefix", col=col)
+    queries = len(col.queries)
+    assert await search_words("w", limit=2, mode="prefix", col=col) is first
+    assert len(col.queries) == queries
+    assert search_cache.stats()["hits"] == 1
+
+    # "w" with limit 2 fetched only 6 of its 8 prefix rows, so "wi" asks Mongo.
+    await search_words("wi", limit=2, mode="prefix", col=col)
+    assert search_cache.stats()["narrowed"] == 0
+    assert len(col.queries) > queries
@@ -0,0 +1,101 @@
+"""Tier 0 (SearchIndex) + Tier 2 (/search with SEARCH_SOURCE=index) tests for
+the in-process prefix index."""
+
+import re
+
+import pytest
+from app.config import settings
+from app.routers.search import search_words
+from app.services import search_cache, search_index
+from app.services.search_index import SearchIndex, write_search_index
+
+from .fakes import FakeWordsCollection
+
+
+def _entry(word: str, lang: str, pos: str | None = "noun", etym: int | None = None) -> dict:
+    entry = {"word": word, "lang": lang}
+    if pos is not None:
+        entry["pos"] = pos
+    if etym is not None:
+        entry["etymology_number"] = etym
+    return entry
+
+
+# In word order, as the `word` index returns them: one word's entries stay in
+# natural order, not language order (the fake scans natural order).
+ENTRIES = [
+    _entry("Wein", "German"),
+    _entry("wind", "English", etym=1),
+    _entry("wind", "Dutch", None),
+    _entry("wind", "English", "verb", etym=2),
+    _entry("windmill", "English"),
+    _entry("windy", "English", "adj"),
+    _entry("wine", "English"),
+    _entry("wine", "English", "verb"),
+    _entry("winter", "English"),
+    _entry("wīn", "Old English"),
+]
+PROJECTION = {"_id": 0, "word": 1, "lang": 1, "pos": 1}
+
+
+@pytest.fixture
+def index(tmp_path) -> SearchIndex:
+    assert write_search_index(tmp_path, ENTRIES) == len(ENTRIES)
+    return SearchIndex(tmp_path)
+
+
+@pytest.mark.tier0
+@pytest.mark.parametrize("q", ["wind", "win", "wine", "w", "wīn", "Wei", "x"])
+@pytest.mark.asyncio
+async def test_index_rows_match_the_mongo_queries(index, q):
+    col = FakeWordsCollection(ENTRIES)
+    exact = await col.find({"word": q}, PROJECTION).limit(3).to_list(length=3)
+    prefix = await col.find({"word": {"$regex": f"^{re.escape(q)}"}}, PROJECTION).to_list()
+
+    assert index.exact(q, 3) == exact
+    assert index.prefix(q, 100) == prefix
+
+
+@pytest.mark.tier0
+def test_index_knows_which_words_have_several_etymologies(index):
+    assert index.has_etymologies("wind", "English")
+    assert not index.has_etymologies("wind", "Dutch")
+    assert not index.has_etymologies("wine", "English")
+    assert not index.has_etymologies("wined", "English")
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("index")
+async def test_search_reads_the_index_without_queries(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "search_source", "index")
+    search_index.load(tmp_path)
+    col = FakeWordsCollection(ENTRIES)
+
+    result = await search_words("win", limit=3, mode="prefix", col=col)
+    assert result["results"] == [
+        {"word": "wind", "lang": "English", "pos": "noun"},
+        {"word": "wind", "lang": "Dutch"},
+        {"word": "windmill", "lang": "English", "pos": "noun"},
+    ]
+
+    result = await search_words("wine", limit=3, mode="prefix", col=col)
+    assert result == {"results": [{"word": "wine", "lang": "English", "pos": "noun"}], "total": 1}
+    assert col.queries == []
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+@pytest.mark.parametrize("q", ["wind", "win", "w"])
+async def test_index_keeps_the_mongo_order_of_same_word_ties(tmp_path, monkeypatch, q):
+    write_search_index(tmp_path, ENTRIES)
+    from_mongo = await search_words(q, limit=5, mode="prefix", col=FakeWordsCollection(ENTRIES))
+
+    search_cache.reset()
+    monkeypatch.setattr(settings, "search_source", "index")
+    search_index.load(tmp_path)
+    from_index = await search_words(q, limit=5, mode="prefix", col=FakeWordsCollection(ENTRIES))
+
+    assert from_index == from_mongo
+    winds = [r["lang"] for r in from_mongo["results"] if r["word"] == "wind"]
+    assert list(dict.fromkeys(winds)) == ["English", "Dutch"]
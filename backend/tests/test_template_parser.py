@@ -4,8 +4,12 @@ import pytest
 from app.services.template_parser import (
     ANCESTRY_TYPE_ALIASES,
     ANCESTRY_TYPES,
+    descendant_edges,
     expand_ancestry_types,
     extract_ancestry,
+    first_ancestors,
+    fold_word,
+    primary_ancestor,
 )
 
 
@@ -142,3 +146,96 @@ def test_ancestry_type_aliases_map_derived_to_der():
     assert ANCESTRY_TYPE_ALIASES == {"derived": "der"}
     assert "der" in ANCESTRY_TYPES
     assert "derived" not in ANCESTRY_TYPES
+
+
+@pytest.mark.tier0
+def test_primary_ancestor_is_first_ancestry_template_across_types():
+    doc = {
+        "etymology_templates": [
+            {"name": "m", "args": {"1": "en", "2": "other"}},
+            {"name": "derived", "args": {"1": "en", "2": "la", "3": "vīnum"}},
+            {"name": "inh", "args": {"1": "en", "2": "ine-pro", "3": "*wóyh₁nom"}},
+        ]
+    }
+    assert primary_ancestor(doc) == {
+        "type": "der",
+        "lang_code": "la",
+        "word": "vīnum",
+        "word_normalized": "vinum",
+    }
+
+
+@pytest.mark.tier0
+def test_first_ancestors_keeps_the_first_template_of_each_type_with_its_rank():
+    doc = {
+        "etymology_templates": [
+            {"name": "derived", "args": {"1": "en", "2": "la", "3": "vīnum"}},
+            {"name": "inh", "args": {"1": "en", "2": "enm", "3": "wyn"}},
+            {"name": "der", "args": {"1": "en", "2": "grc", "3": "οἶνος"}},
+        ]
+    }
+    assert first_ancestors(doc) == {
+        "der": {"lang_code": "la", "word": "vīnum", "word_normalized": "vinum", "rank": 0},
+        "inh": {"lang_code": "enm", "word": "wyn", "word_normalized": "wyn", "rank": 1},
+    }
+
+
+@pytest.mark.tier0
+def test_primary_ancestor_is_none_without_ancestry():
+    assert primary_ancestor({"etymology_templates": [{"name": "cog", "args": {"1": "de"}}]}) is None
+
+
+@pytest.mark.tier0
+def test_fold_word_ignores_case_and_diacritics():
+    assert fold_word("Rome") == fold_word("rome") == "rome"
+    assert fold_word("vīnum") == "vinum"
+    assert fold_word("Straße") == "strasse"
+    assert fold_word("İstanbul") == "istanbul"
+
+
+@pytest.mark.tier0
+def test_descendant_edges_follow_depth_nesting():
+    doc = {
+        "word": "vīnum",
+        "lang_code": "la",
+        "descendants": [
+            {"depth": 1, "templates": [{"name": "desc", "args": {"1": "fro", "2": "vin"}}]},
+            {"depth": 2, "templates": [{"name": "desc", "args": {"1": "fr", "2": "vin"}}]},
+            {
+                "depth": 2,
+                "templates": [{"name": "desc", "args": {"1": "en", "2": "vine", "bor": "1"}}],
+            },
+            {"depth": 1, "text": "Italo-Romance:"},
+            {"depth": 2, "templates": [{"name": "desctree", "args": {"1": "it", "2": "vino"}}]},
+            {
+                "depth": 1,
+                "templates": [{"name": "desc", "args": {"1": "ga", "2": "fíon", "clq": "1"}}],
+            },
+        ],
+    }
+    edges = [
+        (e["parent_lang_code"], e["parent_word"], e["lang_code"], e["word"], e["type"])
+        for e in descendant_edges(doc)
+    ]
+    assert edges == [
+        ("la", "vinum", "fro", "vin", "inh"),
+        ("fro", "vin", "fr", "vin", "inh"),
+        ("fro", "vin", "en", "vine", "bor"),
+        ("la", "vinum", "it", "vino", "inh"),  # the heading passes its parent through
+        ("la", "vinum", "ga", "fíon", "der"),
+    ]
+
+
+@pytest.mark.tier0
+def test_descendant_edges_skip_placeholders_and_duplicates():
+    doc = {
+        "word": "*wīnom",
+        "lang_code": "itc-pro",
+        "descendants": [
+            {"depth": 1, "templates": [{"name": "desc", "args": {"1": "la", "2": "-"}}]},
+            {"depth": 1, "templates": [{"name": "l", "args": {"1": "osc", "2": "vinu"}}]},
+            {"depth": 1, "templates": [{"name": "l", "args": {"1": "osc", "2": "vinu"}}]},
+        ],
+    }
+    assert [(e["parent_word"], e["word"]) for e in descendant_edges(doc)] == [("winom", "vinu")]
+    assert descendant_edges({"word": "x", "lang_code": "en"}) == []
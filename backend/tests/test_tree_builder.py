@@ -1,8 +1,15 @@
 """Tests for TreeBuilder service."""
 
+import asyncio
+
 import pytest
 from app.services import lang_cache
-from app.services.tree_builder import MAX_DESCENDANTS_PER_NODE, TreeBuilder
+from app.services.template_parser import first_ancestors, primary_ancestor
+from app.services.tree_builder import (
+    MAX_CONCURRENT_LOOKUPS,
+    MAX_DESCENDANTS_PER_NODE,
+    TreeBuilder,
+)
 
 from .fakes import FakeWordsCollection
 
@@ -103,6 +110,40 @@ async def test_expand_word_mention_fallback_when_no_ancestry():
     assert {"from": "chuck:English", "to": "chuckle:English", "label": "mention"} in result["edges"]
 
 
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_mention_existence_is_one_batched_query():
+    """N mentions cost one $or query (raw + normalized forms), not 2N find_ones;
+    only mentions that exist (directly or via normalization) become edges."""
+    _seed_lang_codes()
+    col = FakeWordsCollection(
+        [
+            {
+                "word": "chuckle",
+                "lang": "English",
+                "lang_code": "en",
+                "etymology_templates": [
+                    {"name": "m", "args": {"1": "en", "2": "chuck"}},
+                    {"name": "m", "args": {"1": "la", "2": "*cūcus"}},
+                    {"name": "m", "args": {"1": "en", "2": "absent"}},
+                ],
+                "etymology_text": "Perhaps from chuck.",
+            },
+            {"word": "chuck", "lang": "English", "lang_code": "en", "etymology_templates": []},
+            {"word": "cucus", "lang": "Latin", "lang_code": "la", "etymology_templates": []},
+        ]
+    )
+    builder = TreeBuilder(col, {"inh"}, max_ancestor_depth=10, max_descendant_depth=1)
+
+    await builder.expand_word("chuckle", "English", base_level=0)
+
+    mention_edges = {(e["from"], e["label"]) for e in builder.result()["edges"]}
+    assert mention_edges == {("chuck:English", "mention"), ("*cūcus:Latin", "mention")}
+    word_reads = [q for q in col.queries if "$or" in q[1] or "word" in q[1]]
+    # One lookup for "chuckle" itself, one batched lookup for all three mentions.
+    assert [method for method, _filt in word_reads] == ["find_one", "find"]
+
+
 @pytest.mark.tier2
 @pytest.mark.asyncio
 async def test_expand_word_unknown_word_yields_single_orphan_node():
@@ -126,6 +167,73 @@ async def test_expand_word_unknown_word_yields_single_orphan_node():
     assert result["edges"] == []
 
 
+# --- compound edges ---
+
+
+def _compound_fixture() -> FakeWordsCollection:
+    """W = A + B; A < A1 (inh), and A1 = C + ...; C < C1, and C = D + ...
+
+    Reaching D needs three edge levels and two component-doc levels."""
+
+    def edge(component: str, compound: str) -> dict:
+        return {
+            "from_word": component,
+            "from_lang": "English",
+            "to_word": compound,
+            "to_lang": "English",
+            "edge_type": "component",
+            "from_exists": True,
+        }
+
+    def inh_doc(word: str, parent: str | None) -> dict:
+        templates = [{"name": "inh", "args": {"1": "en", "2": "en", "3": parent}}] if parent else []
+        return {
+            "word": word,
+            "lang": "English",
+            "lang_code": "en",
+            "etymology_templates": templates,
+        }
+
+    return FakeWordsCollection(
+        [inh_doc("W", None), inh_doc("A", "A1"), inh_doc("B", None), inh_doc("C", "C1")],
+        etymology_edges=[edge("A", "W"), edge("B", "W"), edge("C", "A1"), edge("D", "C")],
+    )
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_compound_expansion_traces_components_depth_first():
+    _seed_lang_codes()
+    builder = TreeBuilder(_compound_fixture(), {"inh"}, 10, 1)
+
+    await builder._expand_compound_edges([("W", "English", "en", 0)])
+
+    assert [(e["from"], e["to"], e["label"]) for e in builder.result()["edges"]] == [
+        ("A:English", "W:English", "component"),
+        ("B:English", "W:English", "component"),
+        ("A1:English", "A:English", "inh"),
+        ("C:English", "A1:English", "component"),
+        ("C1:English", "C:English", "inh"),
+        ("D:English", "C:English", "component"),
+    ]
+    assert builder.nodes["D:English"]["level"] == -4
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_compound_expansion_batches_queries_per_level():
+    """One edges query per recursion level and one doc query per level of new
+    components, however many chain nodes and components there are."""
+    _seed_lang_codes()
+    col = _compound_fixture()
+    builder = TreeBuilder(col, {"inh"}, 10, 1)
+
+    await builder._expand_compound_edges([("W", "English", "en", 0)])
+
+    assert len(col.database["etymology_edges"].queries) == 3
+    assert [method for method, _filt in col.queries] == ["find", "find"]
+
+
 # --- find_descendants ---
 
 
@@ -298,6 +406,533 @@ async def test_find_descendants_caps_at_fifty_deterministically():
     assert {n["label"] for n in builder2.result()["nodes"]} == found
 
 
+@pytest.mark.tier2
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["recursive", "frontier"])
+async def test_descendant_cap_keeps_largest_subtrees_first(mode):
+    """With subtree_size precomputed, the cap keeps the most prolific children
+    even when they sort last alphabetically; ties stay alphabetical."""
+    docs = [
+        {
+            "word": f"d{i:03d}",
+            "lang": "English",
+            "lang_code": "en",
+            "etymology_templates": [{"name": "der", "args": {"1": "en", "2": "en", "3": "root"}}],
+            "subtree_size": {53: 40, 54: 7}.get(i, 0),
+        }
+        for i in range(MAX_DESCENDANTS_PER_NODE + 5)
+    ]
+    builder = TreeBuilder(FakeWordsCollection(docs), {"der"}, 10, 1, descendant_mode=mode)
+
+    if mode == "frontier":
+        await builder.find_descendants_frontier([("root", "English", "en", 0)])
+    else:
+        await builder.find_descendants("root", "English", "en", parent_level=0)
+
+    labels = [edge["to"].split(":")[0] for edge in builder.edges]
+    assert labels[:4] == ["d053", "d054", "d000", "d001"]
+    assert len(labels) == MAX_DESCENDANTS_PER_NODE
+    assert "d047" in labels
+    assert "d048" not in labels
+
+
+# --- find_descendants_frontier ---
+
+
+def _descendant_tree_docs() -> list[dict]:
+    """root -> {a, b}; a -> {a1, a2}; b -> {b1}: three levels, fan-out at two."""
+
+    def child(word: str, parent: str) -> dict:
+        return {
+            "word": word,
+            "lang": "English",
+            "lang_code": "en",
+            "etymology_templates": [{"name": "der", "args": {"1": "en", "2": "en", "3": parent}}],
+        }
+
+    return [
+        child("b", "root"),
+        child("a", "root"),
+        child("a2", "a"),
+        child("a1", "a"),
+        child("b1", "b"),
+    ]
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_frontier_mode_matches_recursive_graph():
+    """Frontier expansion yields the same nodes (with levels) and edges as the
+    depth-first recursion; only insertion order may differ."""
+    _seed_lang_codes()
+    recursive = TreeBuilder(
+        FakeWordsCollection(_descendant_tree_docs()),
+        {"der"},
+        max_ancestor_depth=10,
+        max_descendant_depth=3,
+    )
+    await recursive.find_descendants("root", "English", "en", parent_level=0)
+
+    frontier = TreeBuilder(
+        FakeWordsCollection(_descendant_tree_docs()),
+        {"der"},
+        max_ancestor_depth=10,
+        max_descendant_depth=3,
+        descendant_mode="frontier",
+    )
+    await frontier.find_descendants_frontier([("root", "English", "en", 0)])
+
+    def as_sets(builder: TreeBuilder) -> tuple[set, set]:
+        result = builder.result()
+        nodes = {(n["id"], n["level"]) for n in result["nodes"]}
+        edges = {(e["from"], e["to"], e["label"]) for e in result["edges"]}
+        return nodes, edges
+
+    assert as_sets(frontier) == as_sets(recursive)
+    # Level-major, sorted within each parent: deterministic across runs.
+    assert [e["to"] for e in frontier.result()["edges"]] == [
+        "a:English",
+        "b:English",
+        "a1:English",
+        "a2:English",
+        "b1:English",
+    ]
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_frontier_mode_issues_one_query_per_level():
+    """Three BFS levels (the last one empty) cost three reverse lookups, not one
+    per expanded node."""
+    _seed_lang_codes()
+    col = FakeWordsCollection(_descendant_tree_docs())
+    builder = TreeBuilder(
+        col, {"der"}, max_ancestor_depth=10, max_descendant_depth=5, descendant_mode="frontier"
+    )
+
+    await builder.find_descendants_frontier([("root", "English", "en", 0)])
+
+    assert len(builder.nodes) == 5
+    assert len(col.queries) == 3
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_frontier_mode_caps_each_parent_independently():
+    """The 50-doc cap applies per parent, in the database, even when parents
+    share one query."""
+    docs = [
+        {
+            "word": f"{parent}{i:03d}",
+            "lang": "English",
+            "lang_code": "en",
+            "etymology_templates": [{"name": "der", "args": {"1": "en", "2": "en", "3": parent}}],
+        }
+        for parent in ("x", "y")
+        for i in reversed(range(MAX_DESCENDANTS_PER_NODE + 5))
+    ]
+    col = FakeWordsCollection(docs)
+    builder = TreeBuilder(
+        col,
+        {"der"},
+        max_ancestor_depth=10,
+        max_descendant_depth=1,
+        descendant_mode="frontier",
+    )
+
+    await builder.find_descendants_frontier([("x", "English", "en", 0), ("y", "English", "en", 0)])
+
+    found = {n["label"] for n in builder.result()["nodes"]}
+    expected = {f"{p}{i:03d}" for p in ("x", "y") for i in range(MAX_DESCENDANTS_PER_NODE)}
+    assert found == expected
+    ((method, pipeline),) = col.queries
+    assert method == "aggregate"
+    assert len(await col.aggregate(pipeline).to_list()) == 2 * MAX_DESCENDANTS_PER_NODE
+
+
+def test_unknown_descendant_mode_is_rejected():
+    with pytest.raises(ValueError, match="descendant_mode"):
+        TreeBuilder(None, {"inh"}, 10, 3, descendant_mode="sideways")
+
+
+def test_unknown_descendant_source_is_rejected():
+    with pytest.raises(ValueError, match="descendant_source"):
+        TreeBuilder(None, {"inh"}, 10, 3, descendant_source="guesswork")
+
+
+# --- descendant_source="primary_ancestor" ---
+
+
+def _with_primary_ancestor(docs: list[dict]) -> list[dict]:
+    """Apply the ETL stage's field to fixture docs, as `make precompute-ancestors` would."""
+    return [
+        {**doc, "primary_ancestor": primary_ancestor(doc), "first_ancestors": first_ancestors(doc)}
+        for doc in docs
+    ]
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_primary_ancestor_source_matches_templates_source():
+    _seed_lang_codes()
+    docs = _with_primary_ancestor(_descendant_tree_docs())
+    by_templates = TreeBuilder(FakeWordsCollection(docs), {"der"}, 10, 3)
+    await by_templates.find_descendants("root", "English", "en", parent_level=0)
+    by_field = TreeBuilder(
+        FakeWordsCollection(docs), {"der"}, 10, 3, descendant_source="primary_ancestor"
+    )
+    await by_field.find_descendants("root", "English", "en", parent_level=0)
+
+    assert by_field.result() == by_templates.result()
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_primary_ancestor_source_queries_the_field_not_templates():
+    """The lookup is an equality match on the precomputed field and never pulls
+    etymology_templates back."""
+    _seed_lang_codes()
+    col = FakeWordsCollection(_with_primary_ancestor(_descendant_tree_docs()))
+    builder = TreeBuilder(col, {"der"}, 10, 1, descendant_source="primary_ancestor")
+
+    await builder.find_descendants("root", "English", "en", parent_level=0)
+
+    (_method, filt), *_ = col.queries
+    assert filt["first_ancestors.der.lang_code"] == "en"
+    assert filt["first_ancestors.der.word"] == "root"
+    docs = await col.find(filt, {"_id": 0, "word": 1, "first_ancestors": 1}).to_list()
+    assert all("etymology_templates" not in d for d in docs)
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_primary_ancestor_source_excludes_non_immediate_children():
+    """Same guard as test_find_descendants_only_includes_immediate_parent,
+    enforced by the field rather than a Python re-check."""
+    _seed_lang_codes()
+    docs = _with_primary_ancestor(
+        [
+            {
+                "word": "notachild",
+                "lang": "English",
+                "lang_code": "en",
+                "etymology_templates": [
+                    {"name": "inh", "args": {"1": "en", "2": "ine", "3": "protoword"}},
+                    {"name": "der", "args": {"1": "en", "2": "en", "3": "stem"}},
+                ],
+            }
+        ]
+    )
+    builder = TreeBuilder(
+        FakeWordsCollection(docs), {"inh", "der"}, 10, 2, descendant_source="primary_ancestor"
+    )
+
+    await builder.find_descendants("stem", "English", "en", parent_level=0)
+
+    assert "notachild:English" not in builder.nodes
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+@pytest.mark.parametrize("types", [{"inh"}, {"inh", "bor"}, {"inh", "bor", "der"}])
+async def test_primary_ancestor_source_follows_first_link_of_selected_types(types):
+    """A doc whose first link is of an unselected type is still a child of its
+    first link of a selected type, as in templates mode."""
+    _seed_lang_codes()
+    docs = _with_primary_ancestor(
+        [
+            {
+                "word": "vinum",
+                "lang": "English",
+                "lang_code": "en",
+                "etymology_templates": [
+                    {"name": "der", "args": {"1": "en", "2": "la", "3": "X"}},
+                    {"name": "bor", "args": {"1": "en", "2": "fro", "3": "Y"}},
+                    {"name": "inh", "args": {"1": "en", "2": "fro", "3": "Y"}},
+                ],
+            }
+        ]
+    )
+    results = []
+    for source in ("templates", "primary_ancestor"):
+        builder = TreeBuilder(FakeWordsCollection(docs), types, 10, 2, descendant_source=source)
+        await builder.find_descendants("Y", "Old French", "fro", parent_level=0)
+        results.append(builder.result())
+
+    assert results[0] == results[1]
+    assert ("vinum:English" in {n["id"] for n in results[1]["nodes"]}) == ("der" not in types)
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_primary_ancestor_source_in_frontier_mode():
+    _seed_lang_codes()
+    docs = _with_primary_ancestor(_descendant_tree_docs())
+    builder = TreeBuilder(
+        FakeWordsCollection(docs),
+        {"der"},
+        10,
+        3,
+        descendant_mode="frontier",
+        descendant_source="primary_ancestor",
+    )
+
+    await builder.find_descendants_frontier([("root", "English", "en", 0)])
+
+    assert {n["label"] for n in builder.result()["nodes"]} == {"a", "b", "a1", "a2", "b1"}
+
+
+# --- descendant_source="kaikki" ---
+
+
+def _descendant_tree_edges() -> list[dict]:
+    """_descendant_tree_docs as `make precompute-descendants` would flatten the
+    root page's Descendants section."""
+    return [
+        {
+            "parent_lang_code": "en",
+            "parent_word": parent,
+            "word": word,
+            "lang": "English",
+            "lang_code": "en",
+            "type": "der",
+        }
+        for parent, word in [("root", "b"), ("root", "a"), ("a", "a2"), ("a", "a1"), ("b", "b1")]
+    ]
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_kaikki_source_matches_templates_source_in_both_modes():
+    _seed_lang_codes()
+    by_templates = TreeBuilder(FakeWordsCollection(_descendant_tree_docs()), {"der"}, 10, 3)
+    await by_templates.find_descendants("root", "English", "en", parent_level=0)
+    col = FakeWordsCollection([], descendant_edges=_descendant_tree_edges())
+    recursive = TreeBuilder(col, {"der"}, 10, 3, descendant_source="kaikki")
+    await recursive.find_descendants("root", "English", "en", parent_level=0)
+    frontier = TreeBuilder(
+        col, {"der"}, 10, 3, descendant_mode="frontier", descendant_source="kaikki"
+    )
+    await frontier.find_descendants_frontier([("root", "English", "en", 0)])
+
+    assert recursive.result() == by_templates.result()
+    assert {n["id"] for n in frontier.result()["nodes"]} == set(by_templates.nodes)
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_kaikki_source_reads_edge_collection_by_normalized_parent():
+    """Chain ancestors are in template form (*, macrons); edge docs store the
+    parent normalized, and the words collection is never scanned."""
+    _seed_lang_codes()
+    edges = [
+        {
+            "parent_lang_code": "la",
+            "parent_word": "vinum",
+            "word": word,
+            "lang": lang,
+            "lang_code": lc,
+            "type": edge_type,
+        }
+        for word, lang, lc, edge_type in [
+            ("vin", "French", "fr", "inh"),
+            ("Wein", "German", "de", "bor"),
+        ]
+    ]
+    col = FakeWordsCollection([], descendant_edges=edges)
+    builder = TreeBuilder(col, {"inh"}, 10, 1, descendant_source="kaikki")
+
+    await builder.find_descendants("vīnum", "Latin", "la", parent_level=0)
+
+    assert col.queries == []
+    (_method, filt), *_ = col.database["descendant_edges"].queries
+    assert filt["parent_word"] == "vinum"
+    assert [(e["from"], e["to"], e["label"]) for e in builder.edges] == [
+        ("vīnum:Latin", "vin:French", "inh")
+    ]
+
+
+# --- descendant cache ---
+
+
+def _descendant_builder(col: FakeWordsCollection, **kwargs) -> TreeBuilder:
+    return TreeBuilder(col, {"der"}, max_ancestor_depth=10, max_descendant_depth=3, **kwargs)
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_descendant_subtree_is_reused_across_builders():
+    """A second search reaching the same ancestor (at another level) expands its
+    subtree from the cache without any reverse lookups."""
+    _seed_lang_codes()
+    col = FakeWordsCollection(_descendant_tree_docs())
+    first = _descendant_builder(col)
+    await first.find_descendants("root", "English", "en", parent_level=0)
+    queries = len(col.queries)
+
+    second = _descendant_builder(col)
+    await second.find_descendants("root", "English", "en", parent_level=-2)
+
+    assert len(col.queries) == queries
+    assert second.edges == first.edges
+    assert {n["id"]: n["level"] - 2 for n in first.nodes.values()} == {
+        n["id"]: n["level"] for n in second.nodes.values()
+    }
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_descendant_cache_is_shared_between_modes():
+    _seed_lang_codes()
+    col = FakeWordsCollection(_descendant_tree_docs())
+    await _descendant_builder(col).find_descendants("root", "English", "en", parent_level=0)
+    queries = len(col.queries)
+
+    frontier = _descendant_builder(col, descendant_mode="frontier")
+    await frontier.find_descendants_frontier([("root", "English", "en", 0)])
+
+    assert len(col.queries) == queries
+    assert len(frontier.nodes) == 5
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_descendant_cache_respects_skip_descendant_ids():
+    """Skipped nodes are not expanded from a warm cache; a later builder that
+    does expand them fetches only the child lists it is missing."""
+    _seed_lang_codes()
+    col = FakeWordsCollection(_descendant_tree_docs())
+    skipping = _descendant_builder(col)
+    skipping.skip_descendant_ids.add("a:English")
+    await skipping.find_descendants("root", "English", "en", parent_level=0)
+    assert "a1:English" not in skipping.nodes
+    queries = len(col.queries)
+
+    full = _descendant_builder(col)
+    await full.find_descendants("root", "English", "en", parent_level=0)
+
+    # a, a1 and a2 were never expanded by the skipping builder.
+    assert len(col.queries) == queries + 3
+    assert len(full.nodes) == 5
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_descendant_cache_is_keyed_by_allowed_types():
+    _seed_lang_codes()
+    col = FakeWordsCollection(_descendant_tree_docs())
+    await _descendant_builder(col).find_descendants("root", "English", "en", parent_level=0)
+
+    inh_only = TreeBuilder(col, {"inh"}, max_ancestor_depth=10, max_descendant_depth=3)
+    await inh_only.find_descendants("root", "English", "en", parent_level=0)
+
+    assert inh_only.edges == []
+
+
+# --- budgets ---
+
+
+def _lopsided_tree_docs() -> list[dict]:
+    """root -> {a, b}; a -> {a1}; b -> {b1, b2, b3}: b is the prolific subtree."""
+
+    def child(word: str, parent: str) -> dict:
+        return {
+            "word": word,
+            "lang": "English",
+            "lang_code": "en",
+            "etymology_templates": [{"name": "der", "args": {"1": "en", "2": "en", "3": parent}}],
+        }
+
+    return [
+        child("a", "root"),
+        child("b", "root"),
+        child("a1", "a"),
+        *(child(f"b{i}", "b") for i in (1, 2, 3)),
+    ]
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_node_budget_expands_most_prolific_subtree_first():
+    _seed_lang_codes()
+    builder = TreeBuilder(
+        FakeWordsCollection(_lopsided_tree_docs()),
+        {"der"},
+        max_ancestor_depth=10,
+        max_descendant_depth=3,
+        max_nodes=6,
+    )
+    builder.add_node("root", "English", 0)
+
+    await builder._expand_descendants_from_chain([("root", "English", "en", 0)])
+
+    result = builder.result()
+    assert {n["label"] for n in result["nodes"]} == {"root", "a", "b", "b1", "b2", "b3"}
+    assert result["truncated"] is True
+    assert result["truncated_reason"] == "max_nodes"
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_generous_budget_builds_the_full_tree_untruncated():
+    _seed_lang_codes()
+    builder = TreeBuilder(
+        FakeWordsCollection(_lopsided_tree_docs()),
+        {"der"},
+        max_ancestor_depth=10,
+        max_descendant_depth=3,
+        max_nodes=100,
+        time_budget_ms=60_000,
+    )
+    builder.add_node("root", "English", 0)
+
+    await builder._expand_descendants_from_chain([("root", "English", "en", 0)])
+
+    result = builder.result()
+    assert len(result["nodes"]) == 7
+    assert result["truncated"] is False
+    assert result["truncated_reason"] is None
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_time_budget_keeps_the_ancestor_chain_and_stops_expansion():
+    _seed_lang_codes()
+    col = FakeWordsCollection(
+        [
+            {
+                "word": "cheese",
+                "lang": "English",
+                "lang_code": "en",
+                "etymology_templates": [
+                    {"name": "inh", "args": {"1": "en", "2": "enm", "3": "chese"}},
+                    {"name": "cog", "args": {"1": "de", "2": "Käse"}},
+                ],
+            },
+            {
+                "word": "cheesy",
+                "lang": "English",
+                "lang_code": "en",
+                "etymology_templates": [
+                    {"name": "inh", "args": {"1": "en", "2": "en", "3": "cheese"}}
+                ],
+            },
+        ]
+    )
+    builder = TreeBuilder(col, {"inh"}, 10, 3, time_budget_ms=0)
+
+    await builder.expand_word("cheese", "English", base_level=0)
+    await builder.expand_cognates()
+
+    result = builder.result()
+    assert [n["label"] for n in result["nodes"]] == ["cheese", "chese"]
+    assert result["truncated_reason"] == "time_budget"
+
+
+def test_unbudgeted_result_has_no_truncation_fields():
+    assert set(TreeBuilder(None, {"inh"}, 10, 3).result()) == {"nodes", "edges"}
+
+
 # --- expand_cognates ---
 
 
@@ -410,6 +1045,235 @@ async def test_expand_cognates_deduplicates_repeated_edges():
     assert cog_edges == [{"from": "fire:English", "to": "Feuer:German", "label": "cog"}]
 
 
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_cognate_components_read_the_whole_set_in_one_query():
+    """One round reaches cognates-of-cognates and members that only cite the
+    graph's words (links walked in either direction), from one links query."""
+    _seed_lang_codes()
+
+    def link(seq: int, source: tuple[str, str], target: tuple[str, str]) -> dict:
+        return {
+            "cognate_set": 7,
+            "seq": seq,
+            "from_word": source[0],
+            "from_lang": source[1],
+            "to_word": target[0],
+            "to_lang": target[1],
+        }
+
+    col = FakeWordsCollection(
+        [
+            {"word": "fire", "lang": "English", "lang_code": "en", "cognate_set": 7},
+            {"word": "Feuer", "lang": "German", "lang_code": "de", "cognate_set": 7},
+        ]
+    )
+    col.database["cognate_links"]._docs.extend(
+        [
+            link(0, ("Feuer", "German"), ("ignis", "Latin")),
+            link(1, ("fire", "English"), ("Feuer", "German")),
+            link(2, ("vuur", "Dutch"), ("fire", "English")),
+            {**link(0, ("water", "English"), ("Wasser", "German")), "cognate_set": 8},
+        ]
+    )
+    builder = TreeBuilder(col, {"inh"}, 10, 1, cognate_mode="components")
+    builder.add_node("fire", "English", 2)
+
+    await builder.expand_cognates(max_rounds=1)
+
+    assert [(e["from"], e["to"]) for e in builder.result()["edges"] if e["label"] == "cog"] == [
+        ("fire:English", "Feuer:German"),
+        ("vuur:Dutch", "fire:English"),
+        ("Feuer:German", "ignis:Latin"),
+    ]
+    assert {nid: node["level"] for nid, node in builder.nodes.items()} == {
+        "fire:English": 2,
+        "Feuer:German": 2,
+        "vuur:Dutch": 2,
+        "ignis:Latin": 2,
+    }
+    assert len(col.database["cognate_links"].queries) == 1
+
+    with pytest.raises(ValueError, match="cognate_mode"):
+        TreeBuilder(col, {"inh"}, 10, 1, cognate_mode="clusters")
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_cognate_components_match_members_in_normalized_form():
+    """A reconstructed node picks up the links stored under its headword
+    spelling, as rounds mode reaches the headword's doc."""
+    _seed_lang_codes()
+    col = FakeWordsCollection(
+        [
+            {
+                "word": "wina",
+                "lang": "Proto-Germanic",
+                "lang_code": "gem-pro",
+                "cognate_set": 3,
+                "etymology_templates": [{"name": "cog", "args": {"1": "la", "2": "vinum"}}],
+            }
+        ]
+    )
+    col.database["cognate_links"]._docs.append(
+        {
+            "cognate_set": 3,
+            "seq": 0,
+            "from_word": "wina",
+            "from_lang": "Proto-Germanic",
+            "to_word": "vinum",
+            "to_lang": "Latin",
+        }
+    )
+    cog_edges = []
+    for mode in ("rounds", "components"):
+        builder = TreeBuilder(col, {"inh"}, 10, 1, cognate_mode=mode)
+        builder.add_node("*wīną", "Proto-Germanic", 0)
+        await builder.expand_cognates(max_rounds=1)
+        cog_edges.append(
+            [(e["from"], e["to"]) for e in builder.result()["edges"] if e["label"] == "cog"]
+        )
+
+    assert cog_edges[1] == cog_edges[0] == [("*wīną:Proto-Germanic", "vinum:Latin")]
+
+
+# --- doc memo ---
+
+
+def _word_reads(col: FakeWordsCollection, word: str) -> int:
+    return sum(1 for method, filt in col.queries if method == "find_one" and filt["word"] == word)
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_doc_memo_fetches_each_word_once_across_phases():
+    """expand_word and both cognate rounds all want Feuer's doc; only the
+    first lookup reaches Mongo, including a miss that tried the normalized form."""
+    _seed_lang_codes()
+    col = FakeWordsCollection(
+        [
+            {
+                "word": "fire",
+                "lang": "English",
+                "lang_code": "en",
+                "etymology_templates": [
+                    {"name": "cog", "args": {"1": "de", "2": "Feuer"}},
+                    {"name": "cog", "args": {"1": "la", "2": "*īgnis"}},
+                ],
+            },
+            {
+                "word": "Feuer",
+                "lang": "German",
+                "lang_code": "de",
+                "etymology_templates": [{"name": "cog", "args": {"1": "en", "2": "fire"}}],
+            },
+        ]
+    )
+    builder = TreeBuilder(col, {"inh"}, 10, 1)
+
+    await builder.expand_word("fire", "English", base_level=0)
+    await builder.expand_cognates(max_rounds=2)
+
+    assert _word_reads(col, "fire") == 1
+    assert _word_reads(col, "Feuer") == 1
+    # The absent Latin cognate: raw + normalized once, then memoized as a miss.
+    assert _word_reads(col, "*īgnis") == 1
+    assert _word_reads(col, "ignis") == 1
+    meta = builder.meta()["doc_memo"]
+    assert meta["misses"] == 3
+    assert meta["hits"] >= 3
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_doc_memo_shares_one_fetch_between_concurrent_lookups():
+    col = FakeWordsCollection([{"word": "a", "lang": "English", "etymology_templates": []}])
+    builder = TreeBuilder(col, {"inh"}, 10, 1)
+
+    docs = await builder._find_word_docs([("a", "English")] * 5)
+
+    assert all(doc is not None and doc["word"] == "a" for doc in docs)
+    assert len(col.queries) == 1
+    assert builder.meta() == {"doc_memo": {"hits": 4, "misses": 1}}
+
+
+# --- concurrent lookups ---
+
+
+class _InFlightTrackingCollection(FakeWordsCollection):
+    """Yields to the loop inside every find_one and records peak concurrency."""
+
+    def __init__(self, docs: list[dict]):
+        super().__init__(docs)
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def find_one(self, filt: dict, projection: dict | None = None) -> dict | None:
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0)
+            return await super().find_one(filt, projection)
+        finally:
+            self.in_flight -= 1
+
+
+def _wide_cognate_docs(width: int) -> list[dict]:
+    cognates = [f"c{i:02d}" for i in range(width)]
+    return [
+        {
+            "word": "root",
+            "lang": "English",
+            "lang_code": "en",
+            "etymology_templates": [{"name": "cog", "args": {"1": "de", "2": c}} for c in cognates],
+        },
+        *(
+            {
+                "word": c,
+                "lang": "German",
+                "lang_code": "de",
+                "etymology_templates": [{"name": "cog", "args": {"1": "la", "2": f"{c}-la"}}],
+            }
+            for c in cognates
+        ),
+    ]
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_cognate_lookups_overlap_within_the_concurrency_bound():
+    _seed_lang_codes()
+    width = 3 * MAX_CONCURRENT_LOOKUPS
+    col = _InFlightTrackingCollection(_wide_cognate_docs(width))
+    builder = TreeBuilder(col, {"inh"}, 10, 1)
+    # Seed the graph wide so the first round's doc lookups are all cold.
+    for i in range(width):
+        builder.add_node(f"c{i:02d}", "German", 0)
+
+    await builder.expand_cognates(max_rounds=1)
+
+    assert 1 < col.peak_in_flight <= MAX_CONCURRENT_LOOKUPS
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_concurrent_cognate_expansion_keeps_sequential_order():
+    """Edge order is the template order, node by node, exactly as the sequential
+    loop produced it — the layout cache and snapshots depend on it."""
+    _seed_lang_codes()
+    width = 2 * MAX_CONCURRENT_LOOKUPS
+    col = _InFlightTrackingCollection(_wide_cognate_docs(width))
+    builder = TreeBuilder(col, {"inh"}, 10, 1)
+    builder.add_node("root", "English", 0)
+
+    await builder.expand_cognates(max_rounds=2)
+
+    edges = [(e["from"], e["to"]) for e in builder.result()["edges"]]
+    first_round = [("root:English", f"c{i:02d}:German") for i in range(width)]
+    second_round = [(f"c{i:02d}:German", f"c{i:02d}-la:Latin") for i in range(width)]
+    assert edges == first_round + second_round
+
+
 def test_add_node():
     """Test node addition with deduplication."""
     # This test doesn't require database access
@@ -458,3 +1322,21 @@ def test_result():
     assert "edges" in result
     assert len(result["nodes"]) == 2
     assert len(result["edges"]) == 1
+
+
+def test_drain_returns_only_new_and_updated_graph_state():
+    builder = TreeBuilder(None, {"inh"}, 10, 3)
+    builder.add_node("word1", "English", 0)
+    builder.add_node("word2", "Old English", -1)
+    builder.add_edge("word2:Old English", "word1:English", "inh")
+    first = builder.drain()
+
+    builder.add_node("word1", "English", 0, {"is_uncertain": True})
+    builder.add_node("word3", "Latin", -2)
+    second = builder.drain()
+
+    assert [n["id"] for n in first["nodes"]] == ["word1:English", "word2:Old English"]
+    assert len(first["edges"]) == 1
+    assert [n["id"] for n in second["nodes"]] == ["word1:English", "word3:Latin"]
+    assert second["edges"] == []
+    assert builder.drain() == {"nodes": [], "edges": []}
@@ -0,0 +1,151 @@
+"""Tier 2 tests for the two-tier ``/tree`` result cache (LRU over ``trees``)."""
+
+import pytest
+from app.config import settings
+from app.routers.etymology import build_tree
+from app.services import data_version, tree_cache
+
+from .fakes import FakeWordsCollection
+
+DOCS = [
+    {
+        "word": "cheese",
+        "lang": "English",
+        "lang_code": "en",
+        "etymology_templates": [
+            {"name": "inh", "args": {"1": "en", "2": "enm", "3": "chese"}},
+            {"name": "inh", "args": {"1": "enm", "2": "ang", "3": "ciese"}},
+        ],
+    }
+]
+
+
+async def _build(col: FakeWordsCollection, **kwargs) -> dict:
+    return await build_tree(col, "cheese", "English", 10, 3, "inh", None, **kwargs)
+
+
+def _set_version(col: FakeWordsCollection, version: str):
+    data_version.reset()  # skip the recheck interval
+    return col.database[data_version.COLLECTION].replace_one(
+        {"_id": data_version.DOC_ID}, {"_id": data_version.DOC_ID, "version": version}, upsert=True
+    )
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_repeat_build_is_served_from_memory_without_word_queries():
+    col = FakeWordsCollection(DOCS)
+    first = await _build(col)
+    queries = len(col.queries)
+
+    second = await _build(col, include_meta=True)
+
+    assert len(col.queries) == queries
+    assert second.pop("meta") == {"tree_cache": "hit"}
+    assert second == first
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_miss_meta_carries_builder_stats():
+    result = await _build(FakeWordsCollection(DOCS), include_meta=True)
+    assert result["meta"]["tree_cache"] == "miss"
+    assert "doc_memo" in result["meta"]
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_mongo_tier_serves_a_process_with_a_cold_lru():
+    col = FakeWordsCollection(DOCS)
+    first = await _build(col)
+    tree_cache.reset()  # another worker, or a restart
+    queries = len(col.queries)
+
+    second = await _build(col)
+
+    assert len(col.queries) == queries
+    assert second == first
+    assert tree_cache.stats()["entries"] == 1
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_cached_trees_are_independent_copies():
+    col = FakeWordsCollection(DOCS)
+    await _build(col)
+    hit = await _build(col)
+    hit["nodes"][0]["family"] = "mutated by a caller"
+
+    again = await _build(col)
+
+    assert "family" not in again["nodes"][0]
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_data_version_change_rebuilds_the_tree():
+    col = FakeWordsCollection(DOCS)
+    await _build(col)
+    queries = len(col.queries)
+
+    await _set_version(col, "v2")
+    await _build(col)
+    rebuilt_queries = len(col.queries)
+    tree_cache.reset()
+    await _build(col)
+
+    assert rebuilt_queries > queries
+    # The rewrite carries the new version, so the Mongo tier serves it again.
+    assert len(col.queries) == rebuilt_queries
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_cache_key_distinguishes_request_parameters():
+    col = FakeWordsCollection(DOCS)
+    shallow = await build_tree(col, "cheese", "English", 1, 3, "inh", None)
+    deep = await build_tree(col, "cheese", "English", 10, 3, "inh", None)
+
+    assert len(shallow["nodes"]) == 2
+    assert len(deep["nodes"]) == 3
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("setting", "value"), [("chain_source", "chains"), ("link_resolution", True)]
+)
+async def test_cache_key_distinguishes_chain_settings(monkeypatch, setting, value):
+    col = FakeWordsCollection(DOCS)
+    await _build(col)
+
+    monkeypatch.setattr(settings, setting, value)
+    rebuilt = await _build(col, include_meta=True)
+
+    assert rebuilt["meta"]["tree_cache"] == "miss"
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_time_truncated_trees_are_not_cached():
+    col = FakeWordsCollection(DOCS)
+    truncated = await _build(col, time_budget_ms=0)
+
+    assert truncated["truncated_reason"] == "time_budget"
+    assert tree_cache.stats()["entries"] == 0
+    assert await col.database[tree_cache.COLLECTION].find_one({}) is None
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_node_truncated_trees_are_cached_under_their_budget():
+    col = FakeWordsCollection(DOCS)
+    first = await _build(col, max_nodes=2)
+    second = await _build(col, include_meta=True, max_nodes=2)
+    unbounded = await _build(col)
+
+    assert first["truncated_reason"] == "max_nodes"
+    assert second.pop("meta") == {"tree_cache": "hit"}
+    assert second == first
+    assert "truncated" not in unbounded
+    assert tree_cache.stats()["entries"] == 2
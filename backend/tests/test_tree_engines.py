@@ -0,0 +1,20 @@
+"""Tier 0 tests for the TREE_ENGINE registry."""
+
+import pytest
+from app.services.csr_graph import CsrTreeBuilder
+from app.services.graph_lookup import GraphLookupTreeBuilder
+from app.services.tree_builder import TreeBuilder
+from app.services.tree_engines import tree_builder_class
+
+
+@pytest.mark.tier0
+def test_tree_engines_map_to_builder_classes():
+    assert tree_builder_class("builder") is TreeBuilder
+    assert tree_builder_class("graphlookup") is GraphLookupTreeBuilder
+    assert tree_builder_class("csr") is CsrTreeBuilder
+
+
+@pytest.mark.tier0
+def test_unknown_tree_engine_is_rejected():
+    with pytest.raises(ValueError, match="tree_engine"):
+        tree_builder_class("warp")
@@ -0,0 +1,91 @@
+"""Acceptance (in-process ASGI) tests for the progressive ``/tree/stream`` endpoint.
+
+Reuses the SSE reader and fixtures of the layout endpoint suite; only the Mongo
+seam is faked.
+"""
+
+import pytest
+
+from .fakes import FakeWordsCollection
+from .test_layout_endpoints import CHEESE_DOCS, LANGUAGES, _collect_sse, _make_fake
+
+# cheese -> chese -> ciese, plus two English descendants of Middle English chese.
+DESCENDANT_DOCS = [
+    *(
+        {
+            "word": word,
+            "lang": "English",
+            "lang_code": "en",
+            "etymology_templates": [{"name": "inh", "args": {"1": "en", "2": "enm", "3": "chese"}}],
+        }
+        for word in ("cheesy", "chesil")
+    ),
+]
+
+
+def _merge(events: list[tuple]) -> tuple[dict, list]:
+    nodes: dict = {}
+    edges: list = []
+    for name, data in events:
+        if name == "batch":
+            nodes.update({n["id"]: n for n in data["nodes"]})
+            edges.extend(data["edges"])
+    return nodes, edges
+
+
+@pytest.mark.acceptance
+@pytest.mark.asyncio
+async def test_stream_batches_add_up_to_the_plain_tree(make_client):
+    client = await make_client(
+        FakeWordsCollection([*CHEESE_DOCS, *DESCENDANT_DOCS], languages=LANGUAGES)
+    )
+    events = await _collect_sse(client, "/api/etymology/cheese/tree/stream?types=inh")
+    plain = (await client.get("/api/etymology/cheese/tree?types=inh")).json()
+
+    names = [name for name, _data in events]
+    assert names[-1] == "final"
+    assert set(names[:-1]) == {"batch"}
+    nodes, edges = _merge(events)
+    assert list(nodes.values()) == plain["nodes"]
+    assert edges == plain["edges"]
+    assert events[-1][1] == {"node_count": len(nodes), "edge_count": len(edges)}
+
+
+@pytest.mark.acceptance
+@pytest.mark.asyncio
+async def test_stream_sends_the_chain_before_descendants(make_client):
+    client = await make_client(
+        FakeWordsCollection([*CHEESE_DOCS, *DESCENDANT_DOCS], languages=LANGUAGES)
+    )
+    events = await _collect_sse(client, "/api/etymology/cheese/tree/stream?types=inh")
+
+    first = events[0][1]
+    assert first["phase"] == "ancestors"
+    assert [n["label"] for n in first["nodes"]] == ["cheese", "chese", "ciese"]
+    phases = [data["phase"] for name, data in events if name == "batch"]
+    assert "descendants" in phases
+    assert phases.index("ancestors") < phases.index("descendants")
+
+
+@pytest.mark.acceptance
+@pytest.mark.asyncio
+async def test_stream_of_a_cached_tree_is_one_cache_batch(make_client):
+    client = await make_client(_make_fake())
+    plain = (await client.get("/api/etymology/cheese/tree?types=inh")).json()
+
+    events = await _collect_sse(client, "/api/etymology/cheese/tree/stream?types=inh")
+
+    assert [name for name, _data in events] == ["batch", "final"]
+    assert events[0][1] == {"phase": "cache", **plain}
+
+
+@pytest.mark.acceptance
+@pytest.mark.asyncio
+async def test_stream_of_unknown_word_is_single_orphan(make_client):
+    client = await make_client(_make_fake())
+    events = await _collect_sse(client, "/api/etymology/nonexistentword/tree/stream")
+
+    nodes, edges = _merge(events)
+    assert list(nodes) == ["nonexistentword:English"]
+    assert edges == []
+    assert events[-1] == ("final", {"node_count": 1, "edge_count": 0})
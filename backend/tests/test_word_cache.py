@@ -0,0 +1,146 @@
+"""Tier 0 (byte-bounded LRU) + Tier 2 (word_cache over the fake) tests for the
+process-wide word document cache."""
+
+import pytest
+from app.routers.etymology import get_etymology_chain
+from app.routers.words import get_word
+from app.services import data_version, word_cache
+from app.services.lru import MISSING, LRUCache
+from app.services.tree_builder import TreeBuilder
+
+from .fakes import FakeWordsCollection
+
+# --- Tier 0: LRUCache ---
+
+
+@pytest.mark.tier0
+def test_lru_evicts_least_recently_used_past_byte_budget():
+    cache = LRUCache(max_bytes=300, sizeof=lambda _value: 36)  # 100 bytes per entry
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.put("c", 3)
+    cache.get("a")  # b is now the least recently used
+    cache.put("d", 4)
+
+    assert "b" not in cache
+    assert [k for k in "acd" if k in cache] == ["a", "c", "d"]
+    assert cache.bytes == 300
+    assert cache.evictions == 1
+
+
+@pytest.mark.tier0
+def test_lru_caches_none_distinctly_from_a_miss():
+    cache = LRUCache(max_bytes=1000)
+    assert cache.get("absent") is MISSING
+    cache.put("known-missing", None)
+    assert cache.get("known-missing") is None
+    assert cache.stats()["hit_ratio"] == 0.5
+
+
+@pytest.mark.tier0
+def test_lru_skips_entries_larger_than_budget():
+    cache = LRUCache(max_bytes=100)
+    cache.put("big", "x" * 1000)
+    assert len(cache) == 0
+    assert cache.bytes == 0
+
+
+@pytest.mark.tier0
+def test_lru_replacing_a_key_keeps_byte_count_exact():
+    cache = LRUCache(max_bytes=10_000)
+    cache.put("k", "short")
+    cache.put("k", "a much longer value")
+    assert len(cache) == 1
+    assert cache.bytes == LRUCache(10_000)._sizeof("a much longer value") + 64
+
+
+# --- Tier 2: word_cache over the fake ---
+
+DOCS = [
+    {
+        "word": "cheese",
+        "lang": "English",
+        "lang_code": "en",
+        "pos": "noun",
+        "etymology_templates": [{"name": "inh", "args": {"1": "en", "2": "enm", "3": "chese"}}],
+        "senses": [{"glosses": ["a dairy product"]}],
+    }
+]
+
+
+def _word_reads(col: FakeWordsCollection) -> int:
+    return sum(1 for method, _filt in col.queries if method == "find_one")
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_tree_builders_share_cached_docs_across_requests():
+    col = FakeWordsCollection(DOCS)
+
+    await TreeBuilder(col, {"inh"}, 10, 0).expand_word("cheese", "English", base_level=0)
+    reads = _word_reads(col)
+    builder = TreeBuilder(col, {"inh"}, 10, 0)
+    await builder.expand_word("cheese", "English", base_level=0)
+
+    assert _word_reads(col) == reads
+    assert len(builder.nodes) == 2
+    assert word_cache.stats()["hits"] >= 1
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_prefetch_serves_known_missing_words_from_cache():
+    col = FakeWordsCollection(DOCS)
+
+    await TreeBuilder(col, {"inh"}, 10, 0)._prefetch_word_docs([("nowhere", "English")])
+    queries = len(col.queries)
+    builder = TreeBuilder(col, {"inh"}, 10, 0)
+    await builder._prefetch_word_docs([("nowhere", "English")])
+
+    assert len(col.queries) == queries
+    assert await builder._find_word_doc("nowhere", "English") is None
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_projection_classes_do_not_share_entries():
+    """The tree projection lacks senses; get_word must not be answered from it."""
+    col = FakeWordsCollection(DOCS)
+    await TreeBuilder(col, {"inh"}, 10, 0).expand_word("cheese", "English", base_level=0)
+
+    word = await get_word("cheese", lang="English", etym=None, col=col)
+    chain = await get_etymology_chain("cheese", lang="English", etym=None, col=col)
+
+    assert word["definitions"] == ["a dairy product"]
+    assert [n["label"] for n in chain["nodes"]] == ["cheese", "chese"]
+    assert word_cache.stats()["entries"] == 3
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_get_word_reads_mongo_once_per_key():
+    col = FakeWordsCollection(DOCS)
+
+    first = await get_word("cheese", lang="English", etym=None, col=col)
+    second = await get_word("cheese", lang="English", etym=None, col=col)
+
+    assert first == second
+    assert _word_reads(col) == 1
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_data_version_change_empties_the_cache():
+    col = FakeWordsCollection(DOCS)
+    await get_word("cheese", lang="English", etym=None, col=col)
+    assert word_cache.stats()["entries"] == 1
+
+    await col.database[data_version.COLLECTION].replace_one(
+        {"_id": data_version.DOC_ID}, {"_id": data_version.DOC_ID, "version": "v2"}, upsert=True
+    )
+    data_version.reset()  # skip the recheck interval
+    await get_word("cheese", lang="English", etym=None, col=col)
+
+    assert _word_reads(col) == 2
+    assert word_cache.stats()["data_version"] == "v2"
+    assert word_cache.stats()["entries"] == 1
@@ -0,0 +1,116 @@
+"""Tier 2 tests for word lookups through the precomputed ``word_links`` table."""
+
+import pytest
+from app.config import settings
+from app.routers.words import get_word
+from app.services import word_links
+from app.services.tree_builder import TreeBuilder
+
+from .fakes import FakeWordsCollection
+
+DOCS = [
+    {
+        "word": "vinum",
+        "lang": "Latin",
+        "lang_code": "la",
+        "etymology_templates": [
+            {"name": "inh", "args": {"1": "la", "2": "itc-pro", "3": "*wīnom"}}
+        ],
+        "senses": [{"glosses": ["wine"]}],
+    },
+]
+LINKS = [
+    {"word": "vīnum", "lang": "Latin", "target": "vinum"},
+    {"word": "*wīnom", "lang": "Proto-Italic", "target": None},
+]
+_PROJECTION = {"_id": 0, "word": 1, "lang": 1}
+
+
+def _methods(col: FakeWordsCollection) -> list[str]:
+    return [method for method, _filt in col.queries]
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_headword_resolves_in_one_aggregate():
+    col = FakeWordsCollection(DOCS, word_links=LINKS)
+    resolved, doc = await word_links.find_word_doc(col, "vinum", "Latin", _PROJECTION)
+    assert (resolved, doc) == (True, {"word": "vinum", "lang": "Latin"})
+    assert _methods(col) == ["aggregate"]
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_link_resolves_to_normalized_headword():
+    col = FakeWordsCollection(DOCS, word_links=LINKS)
+    resolved, doc = await word_links.find_word_doc(col, "vīnum", "Latin", _PROJECTION)
+    assert (resolved, doc) == (True, {"word": "vinum", "lang": "Latin"})
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_known_missing_link_resolves_to_none_without_a_read():
+    col = FakeWordsCollection(DOCS, word_links=LINKS)
+    assert await word_links.find_word_doc(col, "*wīnom", "Proto-Italic", _PROJECTION) == (
+        True,
+        None,
+    )
+    assert _methods(col) == []
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_unknown_key_is_unresolved():
+    col = FakeWordsCollection(DOCS, word_links=LINKS)
+    assert await word_links.find_word_doc(col, "vinum", "French", _PROJECTION) == (False, None)
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_known_missing_hop_costs_no_read():
+    col = FakeWordsCollection(DOCS, word_links=LINKS)
+
+    first = TreeBuilder(col, {"inh"}, 10, 0, link_resolution=True)
+    assert await first._find_word_doc("*wīnom", "Proto-Italic") is None
+    second = TreeBuilder(col, {"inh"}, 10, 0, link_resolution=True)
+    assert await second._find_word_doc("*wīnom", "Proto-Italic") is None
+
+    assert _methods(col) == []
+    # The known-missing keys are read once per data version.
+    assert len(col.database[word_links.COLLECTION].queries) == 1
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_tree_builder_falls_back_without_a_link():
+    col = FakeWordsCollection(DOCS)  # precompute_links never ran
+    builder = TreeBuilder(col, {"inh"}, 10, 0, link_resolution=True)
+
+    assert await builder._find_word_doc("vīnum", "Latin") is not None
+    assert _methods(col) == ["aggregate", "find_one"]  # the raw form is not re-read
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+async def test_get_word_uses_links_when_enabled(monkeypatch):
+    monkeypatch.setattr(settings, "link_resolution", True)
+    col = FakeWordsCollection(DOCS, word_links=LINKS)
+
+    word = await get_word("vīnum", lang="Latin", etym=None, col=col)
+
+    assert word["definitions"] == ["wine"]
+    assert _methods(col) == ["aggregate"]
+
+
+@pytest.mark.tier2
+@pytest.mark.asyncio
+@pytest.mark.parametrize("etym", [None, 1])
+async def test_get_word_unresolved_key_reads_the_normalized_form_once(monkeypatch, etym):
+    monkeypatch.setattr(settings, "link_resolution", True)
+    col = FakeWordsCollection([{**DOCS[0], "etymology_number": 1}])  # no links
+
+    word = await get_word("vīnum", lang="Latin", etym=etym, col=col)
+
+    assert word["definitions"] == ["wine"]
+    expected = ["aggregate", "find_one"] if etym is None else ["find_one", "find_one"]
+    assert _methods(col) == expected
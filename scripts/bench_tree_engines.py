@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Benchmark tree engines: TreeBuilder, $graphLookup and the CSR graph on one request set.
+
+Each request (word, types, descendant depth) is built once per engine with
+cold process caches, timed end to end (ancestors, compounds, descendants and
+cognates when ``cog`` is in the types). The script reports per engine the
+node count, the median and p95 build time, and whether the node set matches
+the first engine. All engines read the ``primary_ancestor`` links by
+default (``--source``). The $graphLookup engine needs
+``make precompute-tree-edges``; the CSR engine needs ``make export-csr-graph``
+and maps ``--csr-dir`` once before the first request.
+
+Usage:
+    cd backend && python ../scripts/bench_tree_engines.py
+    python scripts/bench_tree_engines.py --types inh,bor --depth 2 --repeat 5 wine water
+    python scripts/bench_tree_engines.py --engines builder,csr --csr-dir backend/data/csr_graph
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from app.services import csr_graph, descendant_cache, lang_cache, word_cache
+from app.services.template_parser import ANCESTRY_TYPES, COGNATE_TYPE
+from app.services.tree_engines import TREE_ENGINES, tree_builder_class
+from motor.motor_asyncio import AsyncIOMotorClient
+
+SAMPLE_WORDS = ["wine", "water", "mother", "fire", "house", "king", "horse", "salt", "wheel"]
+
+
+async def build(col, engine: str, word: str, args: argparse.Namespace):
+    """Build one tree with cold caches; return (node ids, elapsed ms)."""
+    descendant_cache.reset()
+    word_cache.reset()
+    types = set(args.types.split(","))
+    builder = tree_builder_class(engine)(
+        col, types & ANCESTRY_TYPES, 10, args.depth, descendant_source=args.source
+    )
+    start = time.perf_counter()
+    await builder.expand_word(word, "English", base_level=0)
+    if COGNATE_TYPE in types:
+        await builder.expand_cognates()
+    return set(builder.nodes), (time.perf_counter() - start) * 1000
+
+
+async def bench(args: argparse.Namespace, engines: list[str]) -> None:
+    client = AsyncIOMotorClient(os.environ.get("MONGO_URI", "mongodb://localhost:27017/etymology"))
+    col = client.etymology.words
+    await lang_cache.ensure_loaded(col)
+    if "csr" in engines:
+        csr_graph.load(args.csr_dir)
+
+    timings: dict[str, list[float]] = {engine: [] for engine in engines}
+    print(f"{'word':<12}" + "".join(f"{engine:>26}" for engine in engines))
+    for word in args.words:
+        row = f"{word:<12}"
+        baseline = None
+        for engine in engines:
+            runs = [await build(col, engine, word, args) for _ in range(args.repeat)]
+            nodes = runs[0][0]
+            baseline = nodes if baseline is None else baseline
+            elapsed = [ms for _nodes, ms in runs]
+            timings[engine].extend(elapsed)
+            same = "=" if nodes == baseline else "≠"
+            row += f"{len(nodes):>8} nodes {same} {statistics.median(elapsed):>8.1f}ms"
+        print(row)
+
+    print("\nAll requests:")
+    for engine, elapsed in timings.items():
+        p95 = statistics.quantiles(elapsed, n=20)[-1] if len(elapsed) > 1 else elapsed[0]
+        print(f"  {engine:<12} median {statistics.median(elapsed):>8.1f} ms  p95 {p95:>8.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("words", nargs="*", default=SAMPLE_WORDS)
+    parser.add_argument("--engines", default=",".join(TREE_ENGINES))
+    parser.add_argument("--types", default="inh,bor,der")
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--source", default="primary_ancestor")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--csr-dir", default="data/csr_graph")
+    args = parser.parse_args()
+    engines = args.engines.split(",")
+    unknown = [engine for engine in engines if engine not in TREE_ENGINES]
+    if unknown:
+        parser.error(f"unknown engines {unknown}; choose from {TREE_ENGINES}")
+    asyncio.run(bench(args, engines))
+
+
+if __name__ == "__main__":
+    main()
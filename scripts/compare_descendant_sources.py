@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Compare descendant sources: coverage and latency of TreeBuilder's reverse lookups.
+
+For each sample word, builds its tree (ancestor chain plus descendants, no
+cognates) once per requested ``DESCENDANT_SOURCE`` with cold process caches,
+reporting per source the node count, the build time and the overlap with the
+first source (the ``templates`` baseline by default). ``kaikki`` needs
+``make precompute-descendants``; ``primary_ancestor`` needs
+``make precompute-ancestors``.
+
+Usage:
+    cd backend && python ../scripts/compare_descendant_sources.py
+    python scripts/compare_descendant_sources.py --sources templates,kaikki --depth 2 wine water
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from app.services import descendant_cache, lang_cache, word_cache
+from app.services.tree_builder import DESCENDANT_SOURCES, TreeBuilder
+from motor.motor_asyncio import AsyncIOMotorClient
+
+SAMPLE_WORDS = ["wine", "water", "mother", "fire", "house", "king", "horse", "salt", "wheel"]
+TYPES = {"inh", "bor", "der"}
+
+
+async def descend(col, word: str, source: str, depth: int) -> tuple[set[str], float]:
+    """Return the node ids of ``word``'s tree and its build time in ms, cold caches."""
+    descendant_cache.reset()
+    word_cache.reset()
+    builder = TreeBuilder(col, TYPES, 10, depth, descendant_source=source)
+    start = time.perf_counter()
+    await builder.expand_word(word, "English", base_level=0)
+    return set(builder.nodes), (time.perf_counter() - start) * 1000
+
+
+async def compare(words: list[str], sources: list[str], depth: int) -> None:
+    client = AsyncIOMotorClient(os.environ.get("MONGO_URI", "mongodb://localhost:27017/etymology"))
+    col = client.etymology.words
+    await lang_cache.ensure_loaded(col)
+
+    totals = {source: [0, 0.0, 0] for source in sources}
+    print(f"{'word':<12}" + "".join(f"{source:>28}" for source in sources))
+    for word in words:
+        results = {source: await descend(col, word, source, depth) for source in sources}
+        baseline = results[sources[0]][0]
+        row = f"{word:<12}"
+        for source in sources:
+            ids, elapsed_ms = results[source]
+            shared = len(ids & baseline)
+            totals[source][0] += len(ids)
+            totals[source][1] += elapsed_ms
+            totals[source][2] += shared
+            row += f"{len(ids):>8} nodes {shared:>5} shared {elapsed_ms:>6.0f}ms"
+        print(row)
+
+    print(f"\nTotals (shared = also found by {sources[0]}):")
+    for source, (count, elapsed_ms, shared) in totals.items():
+        print(f"  {source:<18} {count:>7} nodes  {shared:>7} shared  {elapsed_ms:>8.0f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("words", nargs="*", default=SAMPLE_WORDS)
+    parser.add_argument("--sources", default="templates,kaikki")
+    parser.add_argument("--depth", type=int, default=3)
+    args = parser.parse_args()
+    sources = args.sources.split(",")
+    unknown = [source for source in sources if source not in DESCENDANT_SOURCES]
+    if unknown:
+        parser.error(f"unknown sources {unknown}; choose from {DESCENDANT_SOURCES}")
+    asyncio.run(compare(args.words, sources, args.depth))
+
+
+if __name__ == "__main__":
+    main()